@@ -0,0 +1,221 @@
+"""Throughput of the client and CLI hot paths against the local stub server.
+
+Usage:
+    python benchmarks/bench_hot_paths.py            # print results
+    python benchmarks/bench_hot_paths.py --check    # compare with hot_paths_baseline.json
+    python benchmarks/bench_hot_paths.py --update   # rewrite the baseline
+    python benchmarks/bench_hot_paths.py --only render --only encode   # some groups only
+
+Measured, each as the median of ``--runs`` runs:
+
+* single sends/s and batch sends/s (emails per second), ``--workers`` threads
+* list throughput: contacts per second through cursor pagination
+* attachment encoding MB/s: streaming body, and a cold attachment cache
+* rendering 10k, 100k and 1M rows as json, jsonl and csv, and as a Rich
+  table up to ``--table-max-rows`` (100k by default; a 1M-row table takes
+  minutes)
+* CLI cold start: ``--help``, ``send --dry-run`` and ``status`` against the stub
+
+The stub answers without added latency, so the numbers are client-side
+costs. ``--check`` fails if a throughput drops below ``baseline / tolerance``
+or a duration grows past ``baseline * tolerance``.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from bench_startup import measure
+
+from resend_cli import formatters, output
+from resend_cli.attachments import FileAttachment, StreamingBody
+from resend_cli.cache import AttachmentCache
+from resend_cli.client import ResendClient
+from resend_cli.stub_server import StubServer
+
+BASELINE = Path(__file__).with_name("hot_paths_baseline.json")
+ROWS = (10_000, 100_000, 1_000_000)
+TOLERANCE = 1.5
+PAYLOAD = {"from": "Bench <bench@example.com>", "to": ["user@example.com"], "subject": "Hello", "text": "Hi there"}
+
+
+def median_of(runs: int, fn: Callable[[], float]) -> float:
+    return statistics.median(fn() for _ in range(runs))
+
+
+def rate(count: int, fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def bench_sends(stub: StubServer, n: int, workers: int, runs: int) -> dict:
+    client = ResendClient("bench", base_url=stub.url, pool_maxsize=workers)
+    batches = [[PAYLOAD] * 100 for _ in range(max(1, n // 100))]
+
+    def singles() -> None:
+        with ThreadPoolExecutor(workers) as ex:
+            list(ex.map(lambda _: client.send_email(PAYLOAD), range(n)))
+
+    def batched() -> None:
+        with ThreadPoolExecutor(workers) as ex:
+            list(ex.map(client.send_batch, batches))
+
+    return {
+        "send single": (median_of(runs, lambda: rate(n, singles)), "emails/s"),
+        "send batch": (median_of(runs, lambda: rate(100 * len(batches), batched)), "emails/s"),
+    }
+
+
+def bench_list(stub: StubServer, n: int, runs: int) -> dict:
+    stub.seed(audiences=1, contacts=n)
+    client = ResendClient("bench", base_url=stub.url)
+    audience = client.list_audiences()[0]["id"]
+    return {"list contacts": (median_of(runs, lambda: rate(n, lambda: list(client.iter_contacts(audience)))),
+                              "items/s")}
+
+
+def bench_encoding(mb: int, runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "attachment.bin"
+        path.write_bytes(os.urandom(mb * 1024 * 1024))
+
+        def stream() -> None:
+            for _ in StreamingBody({**PAYLOAD, "attachments": [FileAttachment(path)]}):
+                pass
+
+        def cold_cache() -> None:
+            AttachmentCache(Path(tempfile.mkdtemp(dir=tmp))).get(path)
+
+        return {
+            "encode streaming body": (median_of(runs, lambda: rate(mb, stream)), "MB/s"),
+            "encode attachment cache": (median_of(runs, lambda: rate(mb, cold_cache)), "MB/s"),
+        }
+
+
+def bench_render(rows: tuple[int, ...], table_max: int, runs: int) -> dict:
+    def records(n: int):
+        return ({"id": f"c{i}", "email": f"user{i}@example.com", "first_name": "Ada", "last_name": "Lovelace",
+                 "unsubscribed": False, "created_at": "2026-01-01 00:00:00+00"} for i in range(n))
+
+    def write(fmt: str, n: int) -> float:
+        start = time.perf_counter()
+        output.write(records(n), fmt, output.CONTACT_FIELDS, out=io.StringIO())
+        return (time.perf_counter() - start) * 1000
+
+    def table(n: int) -> float:
+        console = formatters.console
+        formatters.console = formatters.Console(file=io.StringIO(), width=120)
+        try:
+            start = time.perf_counter()
+            formatters.print_contacts(records(n))
+            return (time.perf_counter() - start) * 1000
+        finally:
+            formatters.console = console
+
+    results = {}
+    for n in rows:
+        # Big renders are slow and steady; one run is enough.
+        n_runs = runs if n <= 10_000 else 1
+        for fmt in ("json", "jsonl", "csv"):
+            results[f"render {fmt} {n} rows"] = (median_of(n_runs, lambda: write(fmt, n)), "ms")
+        if n <= table_max:
+            results[f"render table {n} rows"] = (median_of(n_runs, lambda: table(n)), "ms")
+    return results
+
+
+def bench_cold_start(stub: StubServer, runs: int) -> dict:
+    email_id = ResendClient("bench", base_url=stub.url).send_email(PAYLOAD)["id"]
+    commands = {
+        "cold start --help": ["--help"],
+        "cold start send --dry-run": ["send", "--to", "a@example.com", "--subject", "Hi", "--text", "x", "--dry-run"],
+        "cold start status": ["status", email_id],
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "HOME": home, "XDG_CACHE_HOME": home, "RESEND_API_KEY": "bench",
+               "RESEND_API_BASE": stub.url, "RESEND_RATE_LIMIT": "0", "RESEND_NO_DAEMON": "1"}
+        for label, args in commands.items():
+            results[label] = (median_of(runs, lambda: measure(args, env)[1]), "ms")
+    return results
+
+
+GROUPS = ("send", "list", "cold-start", "encode", "render")
+
+
+def run(args: argparse.Namespace) -> dict:
+    groups = set(args.only or GROUPS)
+    results: dict = {}
+    with StubServer() as stub:
+        if "send" in groups:
+            results.update(bench_sends(stub, args.sends, args.workers, args.runs))
+        if "list" in groups:
+            results.update(bench_list(stub, args.contacts, args.runs))
+        if "cold-start" in groups:
+            results.update(bench_cold_start(stub, args.runs))
+    if "encode" in groups:
+        results.update(bench_encoding(args.attachment_mb, args.runs))
+    if "render" in groups:
+        results.update(bench_render(args.rows, args.table_max_rows, args.runs))
+    return {label: {"value": round(value, 1), "unit": unit} for label, (value, unit) in results.items()}
+
+
+def check(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    failures = []
+    for label, res in results.items():
+        base = baseline.get(label)
+        if base is None:
+            continue
+        if base["unit"] == "ms":
+            limit = base["value"] * tolerance
+            if res["value"] > limit:
+                failures.append(f"{label}: {res['value']} ms > {limit:.1f} ms")
+        else:
+            limit = base["value"] / tolerance
+            if res["value"] < limit:
+                failures.append(f"{label}: {res['value']} {res['unit']} < {limit:.1f} {res['unit']}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=8, help="Threads sending at once")
+    parser.add_argument("--sends", type=int, default=1000, help="Emails per send benchmark")
+    parser.add_argument("--contacts", type=int, default=5000, help="Contacts listed per run")
+    parser.add_argument("--attachment-mb", type=int, default=32)
+    parser.add_argument("--rows", type=lambda s: tuple(int(n) for n in s.split(",")), default=ROWS,
+                        help="Comma-separated row counts to render (default: 10000,100000,1000000)")
+    parser.add_argument("--table-max-rows", type=int, default=100_000, help="Largest row count rendered as a table")
+    parser.add_argument("--only", action="append", choices=GROUPS, help="Run only this group (repeatable)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--check", action="store_true", help="Fail on regressions against the baseline")
+    group.add_argument("--update", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args()
+
+    results = run(args)
+    for label, res in results.items():
+        print(f"{label:<32} {res['value']:>12,.1f} {res['unit']}")
+
+    if args.update:
+        baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        BASELINE.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE}")
+    elif args.check:
+        failures = check(results, json.loads(BASELINE.read_text()), args.tolerance)
+        for f in failures:
+            print(f"REGRESSION {f}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
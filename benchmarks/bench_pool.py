@@ -0,0 +1,52 @@
+"""Count new connections (handshakes) per 1,000 requests against a local stub.
+
+Usage: python benchmarks/bench_pool.py [--requests 1000] [--threads 32] [--latency 0.02]
+
+Every new TCP connection to the stub is what a TLS handshake costs against
+the real API. Requests are issued in bursts of ``--threads`` concurrent calls,
+like batches being dispatched. The default adapter keeps 10 connections per
+host, so with more concurrent callers the extras are opened and thrown away
+on every burst.
+"""
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from resend_cli.client import ResendClient
+from resend_cli.stub_server import StubServer
+
+
+def run(label: str, stub: StubServer, email_id: str, requests_n: int, threads: int, **pool) -> None:
+    client = ResendClient("bench", base_url=stub.url, **pool)
+    before = stub.stats["connections"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as ex:
+        for offset in range(0, requests_n, threads):
+            burst = min(threads, requests_n - offset)
+            list(ex.map(lambda _: client.get_email(email_id), range(burst)))
+    elapsed = time.perf_counter() - start
+    opened = stub.stats["connections"] - before
+    print(f"{label:<34} {opened * 1000 / requests_n:8.1f} handshakes/1k  {requests_n / elapsed:8.0f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub response delay in seconds")
+    args = parser.parse_args()
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+
+    with StubServer(latency=args.latency) as stub:
+        email_id = ResendClient("bench", base_url=stub.url).send_email(
+            {"from": "a@example.com", "to": ["b@example.com"], "subject": "Hi"})["id"]
+        n, t = args.requests, args.threads
+        run("default pool (maxsize=10)", stub, email_id, n, t)
+        run(f"pool_maxsize={t}", stub, email_id, n, t, pool_maxsize=t)
+        run("pool_maxsize=10, pool_block", stub, email_id, n, t, pool_block=True)
+
+
+if __name__ == "__main__":
+    main()
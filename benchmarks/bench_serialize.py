@@ -0,0 +1,89 @@
+"""CPU time and peak memory per MB of JSON request body, by serializer.
+
+Usage: python benchmarks/bench_serialize.py [--sizes 1,8,32] [--runs 5]
+
+Each payload has an HTML body (with some non-ASCII text) and base64
+attachments of the given total size in MB. For each serializer we prepare a
+real ``requests`` request, as ResendClient does, and report the median CPU
+time and the tracemalloc peak, both per MB of payload:
+
+* ``requests json=``: the old path; requests builds a str and encodes it
+* ``dumps (stdlib)``: resend_cli.serialization without orjson
+* ``dumps (orjson)``: resend_cli.serialization with orjson, if installed
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import requests
+
+from resend_cli import serialization
+
+URL = "https://api.resend.com/emails"
+MB = 1024 * 1024
+
+
+def make_payload(mb: int) -> dict:
+    line = "<p>Grüße aus Köln, thanks for reading – see you next week.</p>\n"
+    html = (line * (mb * MB // 2 // len(line) + 1))[: mb * MB // 2]
+    raw = os.urandom(mb * MB // 2 * 3 // 4)
+    content = base64.b64encode(raw).decode()
+    half = len(content) // 2 // 4 * 4
+    return {"from": "News <news@example.com>", "to": ["reader@example.com"], "subject": "Weekly digest",
+            "html": html, "attachments": [{"filename": "a.pdf", "content": content[:half]},
+                                          {"filename": "b.pdf", "content": content[half:]}]}
+
+
+def via_requests(payload: dict) -> Any:
+    return requests.Request("POST", URL, json=payload).prepare()
+
+
+def via_dumps(payload: dict) -> Any:
+    return requests.Request("POST", URL, data=serialization.dumps(payload),
+                            headers={"Content-Type": "application/json"}).prepare()
+
+
+def measure(fn: Callable[[dict], Any], payload: dict, runs: int) -> tuple[float, float]:
+    """Median CPU seconds and peak traced bytes for ``fn(payload)``."""
+    cpu, peaks = [], []
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.process_time()
+        prepared = fn(payload)
+        cpu.append(time.process_time() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del prepared
+    return statistics.median(cpu), statistics.median(peaks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=lambda s: [int(n) for n in s.split(",")], default=[1, 8, 32])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    orjson = serialization.orjson
+    for mb in args.sizes:
+        payload = make_payload(mb)
+        size = len(serialization.dumps(payload)) / MB
+        print(f"payload {size:.1f} MB")
+        cases = [("requests json=", via_requests)]
+        serialization.orjson = None
+        cases.append(("dumps (stdlib)", via_dumps))
+        for label, fn in cases:
+            cpu, peak = measure(fn, payload, args.runs)
+            print(f"  {label:<16} {cpu * 1000 / size:8.2f} ms CPU/MB   {peak / MB / size:6.2f} MB peak/MB")
+        serialization.orjson = orjson
+        if orjson is not None:
+            cpu, peak = measure(via_dumps, payload, args.runs)
+            print(f"  {'dumps (orjson)':<16} {cpu * 1000 / size:8.2f} ms CPU/MB   {peak / MB / size:6.2f} MB peak/MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Track CLI startup cost per subcommand.
+
+Usage:
+    python benchmarks/bench_startup.py            # print timings
+    python benchmarks/bench_startup.py --check    # compare with startup_baseline.json
+    python benchmarks/bench_startup.py --update   # rewrite the baseline
+
+Each command runs in a fresh interpreter with ``-X importtime``. We report the
+median total import time and wall time over ``--runs`` runs, and which heavy
+modules (requests, rich) were imported. ``--check`` fails if a command starts
+importing a heavy module it did not import before, or if its import time
+grows past ``baseline * 1.5 + 10ms``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASELINE = Path(__file__).with_name("startup_baseline.json")
+HEAVY = ("requests", "rich", "urllib3")
+
+COMMANDS = {
+    "--help": ["--help"],
+    "send --help": ["send", "--help"],
+    "send --dry-run": ["send", "--to", "a@example.com", "--subject", "Hi", "--text", "Body", "--dry-run"],
+    "send-batch --help": ["send-batch", "--help"],
+    "inbox --help": ["inbox", "--help"],
+    "status --help": ["status", "--help"],
+    "domains --help": ["domains", "--help"],
+    "audiences --help": ["audiences", "--help"],
+    "contacts --help": ["contacts", "--help"],
+}
+
+
+def measure(args: list[str], env: dict) -> tuple[float, float, list[str]]:
+    """Return (import ms, wall ms, heavy modules imported) for one run."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "resend_cli.cli", *args],
+                          capture_output=True, text=True, env=env)
+    wall = (time.perf_counter() - start) * 1000
+    import_us = 0
+    heavy = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            import_us += int(cumulative)
+        top = name.strip().split(".")[0]
+        if top in HEAVY:
+            heavy.add(top)
+    return import_us / 1000, wall, sorted(heavy)
+
+
+def run(runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        # An empty HOME keeps real credentials and caches out of the numbers.
+        env = {**os.environ, "HOME": home, "XDG_CACHE_HOME": home}
+        results = {}
+        for label, args in COMMANDS.items():
+            samples = [measure(args, env) for _ in range(runs)]
+            results[label] = {
+                "import_ms": round(statistics.median(s[0] for s in samples), 1),
+                "wall_ms": round(statistics.median(s[1] for s in samples), 1),
+                "heavy": samples[-1][2],
+            }
+    return results
+
+
+def check(results: dict, baseline: dict) -> list[str]:
+    failures = []
+    for label, res in results.items():
+        base = baseline.get(label)
+        if base is None:
+            continue
+        new_heavy = set(res["heavy"]) - set(base["heavy"])
+        if new_heavy:
+            failures.append(f"{label}: now imports {', '.join(sorted(new_heavy))}")
+        limit = base["import_ms"] * 1.5 + 10
+        if res["import_ms"] > limit:
+            failures.append(f"{label}: import time {res['import_ms']}ms > {limit:.1f}ms")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--check", action="store_true", help="Fail on regressions against the baseline")
+    group.add_argument("--update", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    for label, res in results.items():
+        heavy = ", ".join(res["heavy"]) or "-"
+        print(f"{label:<20} import {res['import_ms']:7.1f} ms   wall {res['wall_ms']:7.1f} ms   heavy: {heavy}")
+
+    if args.update:
+        BASELINE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE}")
+    elif args.check:
+        failures = check(results, json.loads(BASELINE.read_text()))
+        for f in failures:
+            print(f"REGRESSION {f}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""Streaming helpers for bulk operations (batch sends, imports)."""
+
+import csv
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypeVar
+
+from .config import BATCH_MAX
+from .errors import ResendError
+
+if TYPE_CHECKING:
+    from .journal import Run
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+LIST_FIELDS = ("to", "cc", "bcc", "reply_to")
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Yield rows from a CSV or JSONL file one at a time.
+
+    The format is picked from the extension: ``.jsonl``/``.ndjson`` are read
+    as one JSON object per line, anything else as CSV with a header row.
+    """
+    p = Path(path)
+    with p.open(newline="", encoding="utf-8") as f:
+        if p.suffix.lower() in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            for row in csv.DictReader(f):
+                yield {k: v for k, v in row.items() if k and v not in (None, "")}
+
+
+def _split(val: Any) -> Any:
+    if isinstance(val, str):
+        return [a.strip() for a in val.split(";") if a.strip()]
+    return val
+
+
+def row_to_payload(row: dict, default_from: str = "", default_reply_to: str = "",
+                   load_attachment: Callable[[str], Any] | None = None) -> dict:
+    """Turn an input row into a /emails payload.
+
+    CSV cells for address fields may hold several addresses separated by ``;``.
+    An ``attach`` field (``;``-separated paths, or a list in JSONL) is turned
+    into ``attachments`` with ``load_attachment``.
+    """
+    payload = dict(row)
+    for key in LIST_FIELDS:
+        if key in payload:
+            payload[key] = _split(payload[key])
+    attach = _split(payload.pop("attach", None))
+    if attach and load_attachment is not None:
+        payload["attachments"] = [load_attachment(p) for p in attach]
+    if not payload.get("from") and default_from:
+        payload["from"] = default_from
+    if not payload.get("reply_to") and default_reply_to:
+        payload["reply_to"] = [default_reply_to]
+    return payload
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield lists of at most ``size`` items without materializing the input."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], workers: int = 4,
+                max_pending: int | None = None) -> Iterator[tuple[T, Future]]:
+    """Run ``fn`` over ``items`` on a thread pool, yielding in completion order.
+
+    At most ``max_pending`` (default ``2 * workers``) items are submitted at
+    once, so the input iterator is only consumed as fast as work completes.
+    Items found finished by the same wait are yielded in submission order.
+    Yields ``(item, future)`` pairs; callers inspect the future for the result
+    or exception.
+    """
+    max_pending = max_pending or workers * 2
+    it = iter(items)
+    pending: dict[Future, T] = {}
+
+    def finished() -> Iterator[tuple[T, Future]]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        # ``done`` is an unordered set; ``pending`` keeps submission order.
+        for fut in [f for f in pending if f in done]:
+            yield pending.pop(fut), fut
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in it:
+            pending[pool.submit(fn, item)] = item
+            if len(pending) >= max_pending:
+                yield from finished()
+        while pending:
+            yield from finished()
+
+
+def _jobs(numbered: Iterable[tuple[int, dict]], batch_size: int) -> Iterator[list[tuple[int, dict]]]:
+    # The batch endpoint does not take attachments, so those rows go out alone.
+    pending: list[tuple[int, dict]] = []
+    for n, payload in numbered:
+        if payload.get("attachments"):
+            yield [(n, payload)]
+            continue
+        pending.append((n, payload))
+        if len(pending) == batch_size:
+            yield pending
+            pending = []
+    if pending:
+        yield pending
+
+
+def _journaled_jobs(numbered: Iterable[tuple[int, dict]], batch_size: int,
+                   run: "Run") -> Iterator[tuple[list[tuple[int, dict]], str]]:
+    """Group rows into jobs like ``_jobs``, recording each job in ``run`` before it is sent.
+
+    Rows the run already sent are skipped. Rows it planned but did not finish
+    are regrouped exactly as before and sent under their original key.
+    """
+    from .journal import SENT, payload_hash
+
+    digests: dict[int, str] = {}
+    replay: dict[str, list[tuple[int, dict]]] = {}
+    ready: list[tuple[list[tuple[int, dict]], str]] = []
+
+    def fresh() -> Iterator[tuple[int, dict]]:
+        for n, payload in numbered:
+            digest = payload_hash(payload)
+            entry = run.entry(n)
+            if entry is None:
+                digests[n] = digest
+                yield n, payload
+            elif entry["payload_hash"] != digest:
+                raise ValueError(f"row {n} differs from the interrupted run; start a new run without --resume")
+            elif entry["status"] == SENT:
+                run.skipped += 1
+            else:
+                key = entry["idempotency_key"]
+                group = replay.setdefault(key, [])
+                group.append((n, payload))
+                if len(group) == run.group_size(key):
+                    ready.append((replay.pop(key), key))
+
+    for job in _jobs(fresh(), batch_size):
+        yield from ready
+        ready.clear()
+        rows = [(n, digests.pop(n)) for n, _ in job]
+        key = run.key_for(rows)
+        run.plan(rows, key)
+        yield job, key
+    yield from ready
+    # Groups cut short by a changed input still go out under their old key.
+    for key, group in replay.items():
+        yield group, key
+
+
+def _send_job(client: Any, job: list[tuple[int, dict]], idempotency_key: str | None = None) -> list:
+    if len(job) == 1 and job[0][1].get("attachments"):
+        return [client.send_email(job[0][1], idempotency_key=idempotency_key)]
+    return client.send_batch([p for _, p in job], idempotency_key=idempotency_key)
+
+
+def send_batches(client: Any, rows: Iterable[dict], out: IO[str], batch_size: int = BATCH_MAX,
+                 workers: int = 4, journal: "Run | None" = None) -> tuple[int, int]:
+    """Send ``rows`` through /emails/batch and write one JSONL result per row.
+
+    Rows with attachments are sent individually through /emails. Rows are
+    numbered from 1 in input order. With a ``journal`` run every request
+    carries an idempotency key and its outcome is recorded; rows the run
+    already sent are skipped (and counted in ``journal.skipped``). Returns
+    ``(sent, failed)``.
+    """
+    batch_size = max(1, min(batch_size, BATCH_MAX))
+    numbered = enumerate(rows, start=1)
+    if journal is not None:
+        jobs: Iterable[tuple[list[tuple[int, dict]], str | None]] = _journaled_jobs(numbered, batch_size, journal)
+    else:
+        jobs = ((job, None) for job in _jobs(numbered, batch_size))
+    sent = failed = 0
+    for (batch, _), fut in bounded_map(lambda job: _send_job(client, *job), jobs, workers=workers):
+        exc = fut.exception()
+        if exc is None:
+            reply = fut.result()
+            items = [item if isinstance(item, dict) else {} for item in reply[:len(batch)]]
+            items += [{}] * (len(batch) - len(items))
+            done = [(n, item["id"]) for (n, _), item in zip(batch, items) if item.get("id")]
+            # Rows without an id (a short reply, or an ``{"error": ...}`` entry for
+            # one failed part of a sharded batch) count as failed.
+            short = {"error": f"no id returned ({len(done)} ids for {len(batch)} emails)"}
+            missing = [(n, {k: item[k] for k in ("error", "status_code") if k in item} if item.get("error") else short)
+                       for (n, _), item in zip(batch, items) if not item.get("id")]
+            for n, email_id in done:
+                out.write(json.dumps({"row": n, "id": email_id}) + "\n")
+            sent += len(done)
+            if journal is not None and done:
+                journal.sent([n for n, _ in done], [email_id for _, email_id in done])
+        else:
+            record: dict = {"error": str(exc)}
+            if isinstance(exc, ResendError):
+                record = {"error": exc.message, "status_code": exc.status_code}
+            missing = [(n, record) for n, _ in batch]
+        errors: dict[str, list[int]] = {}
+        for n, record in missing:
+            out.write(json.dumps({"row": n, **record}) + "\n")
+            errors.setdefault(record["error"], []).append(n)
+        failed += len(missing)
+        if journal is not None:
+            for error, seqs in errors.items():
+                journal.failed(seqs, error)
+        out.flush()
+    return sent, failed
+
+
+class Checkpoint:
+    """Which input rows of a long job are finished, saved as JSON.
+
+    Rows complete out of order, so progress is a watermark (every row up to
+    it is done) plus the finished rows above it. Failed rows count as
+    finished for the watermark but are kept in ``failed``, so a rerun retries
+    just those. ``save`` writes atomically and is called at most every
+    ``interval`` seconds from ``mark``, so an interrupted job redoes at most a
+    few seconds of work.
+    """
+
+    def __init__(self, path: str | Path, interval: float = 2.0):
+        self.path = Path(path)
+        self.interval = interval
+        self.watermark = 0
+        self.above: set[int] = set()
+        self.failed: set[int] = set()
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            self.watermark = state["watermark"]
+            self.above = set(state["above"])
+            self.failed = set(state.get("failed", ()))
+        self._saved = time.monotonic()
+
+    def done(self, n: int) -> bool:
+        return (n <= self.watermark or n in self.above) and n not in self.failed
+
+    def mark(self, n: int, failed: bool = False) -> None:
+        if failed:
+            self.failed.add(n)
+        else:
+            self.failed.discard(n)
+        self.above.add(n)
+        while self.watermark + 1 in self.above:
+            self.watermark += 1
+            self.above.discard(self.watermark)
+        if time.monotonic() - self._saved >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"watermark": self.watermark, "above": sorted(self.above), "failed": sorted(self.failed)}, f)
+        os.replace(tmp, self.path)
+        self._saved = time.monotonic()
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+CONTACT_KEYS = ("first_name", "last_name", "unsubscribed")
+
+
+def row_to_contact(row: dict) -> dict:
+    """Turn an input row into ``create_contact`` arguments (email plus known fields)."""
+    contact = {"email": str(row.get("email", "")).strip()}
+    for key in CONTACT_KEYS:
+        if row.get(key) not in (None, ""):
+            contact[key] = row[key]
+    if isinstance(contact.get("unsubscribed"), str):
+        contact["unsubscribed"] = contact["unsubscribed"].strip().lower() in ("1", "true", "yes")
+    return contact
+
+
+def import_contacts(client: Any, audience_id: str, rows: Iterable[dict], out: IO[str],
+                    existing: Iterable[str] = (), checkpoint: Checkpoint | None = None,
+                    workers: int = 4, mirror: Any = None) -> dict:
+    """Create a contact for each row not already in the audience.
+
+    Rows without an email, repeats of an earlier row's email and emails in
+    ``existing`` are skipped (case-insensitively). Rows the ``checkpoint`` has
+    already handled are skipped without a call, except failed ones, which
+    are tried again. Created and failed rows are written to ``out`` as JSONL
+    like ``send_batches``, and created contacts to ``mirror`` when given.
+    Returns counts of ``created``, ``skipped`` and ``failed`` rows.
+    """
+    seen = {e.lower() for e in existing}
+    stats = {"created": 0, "skipped": 0, "failed": 0}
+
+    def todo() -> Iterator[tuple[int, dict]]:
+        for n, row in enumerate(rows, start=1):
+            contact = row_to_contact(row)
+            email = contact["email"].lower()
+            if not email or email in seen:
+                stats["skipped"] += 1
+                if checkpoint is not None:
+                    checkpoint.mark(n)
+                continue
+            seen.add(email)
+            if checkpoint is not None and checkpoint.done(n):
+                stats["skipped"] += 1
+                continue
+            yield n, contact
+
+    def create(job: tuple[int, dict]) -> dict:
+        contact = dict(job[1])
+        return client.create_contact(audience_id, contact.pop("email"), **contact)
+
+    try:
+        for (n, contact), fut in bounded_map(create, todo(), workers=workers):
+            exc = fut.exception()
+            if exc is None:
+                contact_id = (fut.result() or {}).get("id")
+                out.write(json.dumps({"row": n, "id": contact_id}) + "\n")
+                stats["created"] += 1
+                if mirror is not None:
+                    mirror.add_contact(audience_id, {**contact, "id": contact_id})
+            else:
+                record: dict = {"error": str(exc)}
+                if isinstance(exc, ResendError):
+                    record = {"error": exc.message, "status_code": exc.status_code}
+                out.write(json.dumps({"row": n, "email": contact["email"], **record}) + "\n")
+                stats["failed"] += 1
+            if checkpoint is not None:
+                # Failed rows are kept in checkpoint.failed, so a rerun of the import retries them.
+                checkpoint.mark(n, failed=exc is not None)
+    finally:
+        out.flush()
+        if checkpoint is not None:
+            checkpoint.save()
+    return stats
@@ -0,0 +1,163 @@
+"""Content-addressed on-disk cache of base64-encoded attachments."""
+
+import base64
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .attachments import CHUNK_SIZE, FileAttachment
+from .config import CACHE_DIR
+from .profiling import span
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+# Blobs used this recently are never evicted: a send in this or another
+# process (the daemon, a worker) may be about to stream them.
+EVICT_GRACE = 600.0
+
+
+class CachedAttachment(FileAttachment):
+    """An attachment backed by an already-encoded blob in the cache.
+
+    If the blob is gone by the time it is read (evicted or cleared by another
+    process), the content is encoded again from ``source``.
+    """
+
+    def __init__(self, blob: Path, filename: str, source: Path | None = None):
+        self.path = blob
+        self.filename = filename
+        self.source = source
+        self.size = blob.stat().st_size
+
+    @property
+    def encoded_size(self) -> int:
+        return self.size
+
+    def iter_base64(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            f = self.path.open("rb")
+        except FileNotFoundError:
+            if self.source is None:
+                raise
+            fallback = FileAttachment(self.source, self.filename)
+            if fallback.encoded_size != self.size:
+                raise FileNotFoundError(f"{self.path} was evicted and {self.source} has changed since") from None
+            yield from fallback.iter_base64(chunk_size)
+            return
+        with f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+class AttachmentCache:
+    """Maps files to cached base64 blobs, evicting least recently used blobs.
+
+    Layout under ``root``:
+
+    * ``blobs/<sha256>.b64`` holds the encoded content, named by the hash of
+      the raw bytes, so identical files at different paths share one blob.
+    * ``index/<key>`` holds the content hash for a file, where ``key`` hashes
+      its resolved path, mtime and size. A hit therefore costs one ``stat``
+      and one tiny read; any change to the file misses and re-encodes.
+
+    A hit touches the blob's mtime, and eviction after each insert removes the
+    oldest blobs until the total is under ``max_bytes``, sparing any used in
+    the last ``grace`` seconds. Writes go through a temp file and
+    ``os.replace``, so concurrent processes never see a partial blob.
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_CACHE_BYTES, grace: float = EVICT_GRACE):
+        self.root = Path(root) if root else CACHE_DIR / "attachments"
+        self.blobs = self.root / "blobs"
+        self.index = self.root / "index"
+        self.max_bytes = max_bytes
+        self.grace = grace
+
+    def _index_key(self, path: Path) -> str:
+        st = path.stat()
+        ident = f"{path.resolve()}\0{st.st_mtime_ns}\0{st.st_size}"
+        return hashlib.sha256(ident.encode()).hexdigest()
+
+    def get(self, file_path: str | Path) -> CachedAttachment:
+        """Return a cached attachment for ``file_path``, encoding it on a miss."""
+        path = Path(file_path)
+        key = self._index_key(path)
+        try:
+            blob = self.blobs / f"{(self.index / key).read_text().strip()}.b64"
+            os.utime(blob)
+            return CachedAttachment(blob, path.name, path)
+        except FileNotFoundError:
+            pass
+        blob = self._store(path)
+        self._write_atomic(self.index / key, blob.stem.encode())
+        attachment = CachedAttachment(blob, path.name, path)
+        self.evict(keep=blob)
+        return attachment
+
+    def _store(self, path: Path) -> Path:
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.blobs, suffix=".tmp")
+        try:
+            with span("encode"), os.fdopen(fd, "wb") as out, path.open("rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    out.write(base64.b64encode(chunk))
+            blob = self.blobs / f"{digest.hexdigest()}.b64"
+            os.replace(tmp, blob)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return blob
+
+    def _write_atomic(self, target: Path, data: bytes) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+
+    def evict(self, keep: Path | None = None) -> int:
+        """Drop least recently used blobs until under ``max_bytes``; returns bytes freed.
+
+        ``keep`` is never evicted, so a blob larger than the cap can still be
+        used by the send that created it; neither is a blob used within the
+        last ``grace`` seconds, so the cache may stay over the cap for a while.
+        """
+        recent = time.time_ns() - int(self.grace * 1e9)
+        entries = []
+        for blob in self.blobs.glob("*.b64"):
+            if blob == keep:
+                continue
+            try:
+                st = blob.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, blob))
+        total = sum(size for _, size, _ in entries) + (keep.stat().st_size if keep else 0)
+        freed = 0
+        for mtime, size, blob in sorted(entries):
+            if total - freed <= self.max_bytes or mtime >= recent:
+                break
+            blob.unlink(missing_ok=True)
+            freed += size
+        if freed:
+            self._prune_index()
+        return freed
+
+    def _prune_index(self) -> None:
+        for entry in self.index.iterdir():
+            try:
+                if not (self.blobs / f"{entry.read_text().strip()}.b64").exists():
+                    entry.unlink(missing_ok=True)
+            except (FileNotFoundError, UnicodeDecodeError):
+                continue
+
+
+def attachment_loader(max_bytes: int) -> Callable[[str], FileAttachment]:
+    """Return a path -> attachment function, going through the cache unless ``max_bytes`` is 0."""
+    if max_bytes <= 0:
+        return FileAttachment
+    return AttachmentCache(max_bytes=max_bytes).get
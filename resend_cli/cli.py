@@ -1,38 +1,238 @@
 """Click CLI entry point."""
 
+import json
+import os
 import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
-from .client import ResendClient, ResendError
-from .config import get_default_from, get_default_reply_to, get_default_signature, load_api_key
-from .formatters import (
-    print_audience_created,
-    print_audience_deleted,
-    print_audiences,
-    print_contact_created,
-    print_contact_deleted,
-    print_contacts,
-    print_domain_verified,
-    print_domains,
-    print_dry_run,
-    print_email_sent,
-    print_email_status,
-    print_inbound_detail,
-    print_inbound_list,
-)
-
-
-def get_client() -> ResendClient:
-    api_key = load_api_key()
-    return ResendClient(api_key)
+from . import output
+from .config import BATCH_MAX, CACHE_DIR, Config, get_config
+from .errors import ResendError
+from .lanes import LANES
+from .profiling import span
+
+# Everything heavier than click (requests, rich, thread pools) is imported
+# inside the commands that use it, so --help, --dry-run and argument errors
+# never pay for it. benchmarks/bench_startup.py tracks this.
+if TYPE_CHECKING:
+    from .client import ResendClient
+    from .journal import Journal
+    from .metrics import Metrics
+    from .mirror import Mirror
+    from .retry import RetryPolicy
+    from .sharding import ShardedClient
+    from .spool import Spool
+
+
+def current_config() -> Config:
+    """Return the Config for the --profile given on this invocation, built once."""
+    ctx = click.get_current_context().find_root()
+    ctx.ensure_object(dict)
+    if "config" not in ctx.obj:
+        try:
+            ctx.obj["config"] = get_config(ctx.obj.get("profile"))
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+    return ctx.obj["config"]
+
+
+def emit(printer: str, data, fields: tuple[str, ...] | None = None, **options) -> None:
+    """Show a command result with the formatter named ``printer`` or in the --output format.
+
+    ``options`` are passed on to the formatter.
+    """
+    fmt = click.get_current_context().find_root().obj.get("output", "table")
+    with span("render"):
+        if fmt == "table":
+            from . import formatters
+
+            getattr(formatters, printer)(data, **options)
+        else:
+            output.write(data, fmt, fields)
+
+
+def get_client(workers: int = 1, standalone: bool = False, long_running: bool = False) -> "ResendClient":
+    """Return the API client: a proxy to this profile's daemon when one is running.
+
+    Set RESEND_NO_DAEMON=1 (or pass ``standalone``) to always talk to the API directly.
+    With --stats or --metrics-file the daemon is skipped too, since its requests
+    would be counted in the daemon rather than in this run. ``long_running``
+    (the daemon and worker) gives the client a retry budget that refills each
+    minute instead of one for the whole run.
+    """
+    config = current_config()
+    api_key = config.api_key
+    metrics = current_metrics()
+    if metrics is None and not standalone and not os.environ.get("RESEND_NO_DAEMON"):
+        from .daemon import connect, daemon_path
+
+        proxy = connect(daemon_path(click.get_current_context().find_root().obj.get("profile")), api_key,
+                        config.api_base)
+        if proxy is not None:
+            return proxy  # type: ignore[return-value]
+
+    from .client import get_shared_client
+    from .ratelimit import bucket_for_key
+
+    pool = config.pool_options
+    pool["pool_maxsize"] = max(pool["pool_maxsize"], workers)
+    client = get_shared_client(api_key, config.api_base, rate_limiter=bucket_for_key(api_key, config.rate_limit),
+                               retry_policy=_retry_policy(long_running), **pool)
+    if metrics is not None:
+        client.metrics = metrics  # one invocation per process, so the shared client is this run's
+    return client
+
+
+def _retry_policy(long_running: bool) -> "RetryPolicy | None":
+    if not long_running:
+        return None
+    from .retry import LONG_RUNNING_BUDGET_WINDOW, RetryPolicy
+
+    return RetryPolicy(budget_window=LONG_RUNNING_BUDGET_WINDOW)
+
+
+def get_sharded_client(profiles: str, strategy: str, workers: int = 1,
+                       long_running: bool = False) -> "ShardedClient":
+    """Return a client spreading sends over the comma-separated credentials ``profiles``.
+
+    Each profile brings its own API key, and so its own rate limiter and
+    connection pool; RESEND_DOMAINS in a profile lists its sender domains.
+    ``long_running`` is as for ``get_client``.
+    """
+    from .client import get_shared_client
+    from .ratelimit import bucket_for_key
+    from .sharding import Shard, ShardedClient
+
+    metrics = current_metrics()
+    shards = []
+    for name in dict.fromkeys(p.strip() for p in profiles.split(",") if p.strip()):
+        try:
+            config = get_config(name)
+            api_key = config.api_key
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        pool = config.pool_options
+        pool["pool_maxsize"] = max(pool["pool_maxsize"], workers)
+        client = get_shared_client(api_key, config.api_base, rate_limiter=bucket_for_key(api_key, config.rate_limit),
+                                   retry_policy=_retry_policy(long_running), **pool)
+        if metrics is not None:
+            client.metrics = metrics
+        shards.append(Shard(name, client, config.domains))
+    if not shards:
+        raise click.ClickException("--shards needs at least one profile")
+    return ShardedClient(shards, strategy)
+
+
+def report_shards(client: "ShardedClient") -> None:
+    for shard in client.report():
+        click.echo(f"Shard {shard['shard']}: {shard['sent']} sent, {shard['failed']} failed "
+                   f"in {shard['requests']} requests ({shard['busy']:.2f}s)", err=True)
+
+
+def current_metrics() -> "Metrics | None":
+    """Return this invocation's Metrics when --stats or --metrics-file asked for them."""
+    return click.get_current_context().find_root().ensure_object(dict).get("metrics")
+
+
+def open_mirror(create: bool = True) -> "Mirror | None":
+    """Open this profile's local mirror; with ``create=False`` only if it already exists."""
+    from .mirror import Mirror, mirror_path
+
+    path = mirror_path(click.get_current_context().find_root().obj.get("profile"))
+    if not create and not path.exists():
+        return None
+    return Mirror(path)
+
+
+def open_journal() -> "Journal":
+    """Open this profile's send journal, dropping runs past its retention."""
+    from .journal import Journal, journal_path
+
+    journal = Journal(journal_path(click.get_current_context().find_root().obj.get("profile")))
+    journal.prune()
+    return journal
+
+
+def check_priority(queue: bool) -> None:
+    """Reject --priority without --queue, where it would be silently ignored."""
+    source = click.get_current_context().get_parameter_source("priority")
+    if not queue and source not in (None, click.core.ParameterSource.DEFAULT):
+        raise click.UsageError("--priority only applies with --queue")
+
+
+def open_spool(path: str | None = None) -> "Spool":
+    """Open the spool at ``path``, or this profile's default one."""
+    from .spool import Spool, spool_path
+
+    return Spool(Path(path) if path else spool_path(click.get_current_context().find_root().obj.get("profile")))
 
 
 @click.group()
-def cli():
+@click.option("--profile", envvar="RESEND_PROFILE", default=None,
+              help="Credentials profile (a [section] of the credentials file)")
+@click.option("--output", "-o", "output_format", type=click.Choice(output.FORMATS), default="table",
+              envvar="RESEND_OUTPUT", show_default=True,
+              help="Output format; json/jsonl/csv stream rows to stdout as they arrive")
+@click.option("--stats", is_flag=True, help="Print per-endpoint request counts and latencies to stderr at exit")
+@click.option("--metrics-file", type=click.Path(dir_okay=False), envvar="RESEND_METRICS_FILE", default=None,
+              help="Write this run's request metrics to a Prometheus textfile at exit")
+@click.option("--timings", is_flag=True,
+              help="Print time spent building, encoding, serializing, in HTTP and rendering to stderr at exit")
+@click.option("--timings-out", type=click.Path(dir_okay=False), default=None,
+              help="Also save a profile: cProfile stats for .pstats/.prof, else a Chrome trace (JSON)")
+@click.pass_context
+def cli(ctx, profile, output_format, stats, metrics_file, timings, timings_out):
     """Resend CLI - manage emails via the Resend API."""
-    pass
+    ctx.ensure_object(dict).update(profile=profile, output=output_format)
+    if timings or timings_out:
+        start_timings(ctx, timings, timings_out)
+    if stats or metrics_file:
+        from .metrics import Metrics
+
+        metrics = ctx.obj["metrics"] = Metrics()
+
+        def report() -> None:
+            if stats:
+                click.echo(metrics.summary(), err=True)
+            if metrics_file:
+                try:
+                    metrics.write_textfile(metrics_file)
+                except OSError as e:
+                    click.echo(f"Error: cannot write metrics to {metrics_file}: {e}", err=True)
+
+        ctx.call_on_close(report)
+
+
+def start_timings(ctx: click.Context, show: bool, out: str | None) -> None:
+    """Turn on the profiling spans (and cProfile for a .pstats/.prof file) until the command ends."""
+    from . import profiling
+
+    use_cprofile = bool(out) and out.endswith((".pstats", ".prof"))
+    profiler = profiling.start(trace=bool(out) and not use_cprofile)
+    if use_cprofile:
+        import cProfile
+
+        cprof = cProfile.Profile()
+        cprof.enable()
+
+    def report() -> None:
+        profiling.stop()
+        try:
+            if use_cprofile:
+                cprof.disable()
+                cprof.dump_stats(out)
+            elif out:
+                profiler.write_trace(out)
+        except OSError as e:
+            click.echo(f"Error: cannot write profile to {out}: {e}", err=True)
+        if show:
+            click.echo(profiler.summary(), err=True)
+
+    ctx.call_on_close(report)
 
 
 @cli.command()
@@ -51,9 +251,28 @@ def cli():
 @click.option("--tag", multiple=True, help="Tags as key=value")
 @click.option("--idempotency-key", default=None, help="Idempotency key")
 @click.option("--dry-run", is_flag=True, help="Print payload without sending")
+@click.option("--journal", "journaled", is_flag=True,
+              help="Record the send in the local journal, so it can be retried with --resume")
+@click.option("--resume", is_flag=True, help="Skip the send if this exact email was already sent; "
+                                             "otherwise retry it under its earlier idempotency key")
+@click.option("--queue", is_flag=True, help="Write the email to the spool for 'resend-cli worker' and return")
+@click.option("--spool", "spool_dir", type=click.Path(file_okay=False), default=None, envvar="RESEND_SPOOL",
+              help="Spool directory (default: one per profile in the cache dir)")
+@click.option("--priority", type=click.Choice(LANES), default="normal", show_default=True,
+              help="Lane for a queued email; the worker serves high first without starving bulk")
 def send(to_addrs, subject, text_body, html_body, html_file, text_file,
-         from_addr, reply_to, cc, bcc, attach, sign, tag, idempotency_key, dry_run):
-    """Send an email."""
+         from_addr, reply_to, cc, bcc, attach, sign, tag, idempotency_key, dry_run, journaled, resume, queue,
+         spool_dir, priority):
+    """Send an email.
+
+    With --journal (or --resume) the send is recorded in a local journal with
+    an idempotency key derived from the payload, so a send that may or may
+    not have gone through can be retried with --resume without risking a
+    duplicate.
+    """
+    from .attachments import materialize
+    from .cache import attachment_loader
+    check_priority(queue)
     if html_file:
         html_body = Path(html_file).read_text()
     if text_file:
@@ -63,52 +282,203 @@ def send(to_addrs, subject, text_body, html_body, html_file, text_file,
         click.echo("Error: provide --text, --html, --text-file, or --html-file", err=True)
         sys.exit(1)
 
-    if sign:
-        sig = get_default_signature()
-        if sig:
-            if text_body:
-                text_body = text_body + f"\n\n{sig}"
-            if html_body:
-                html_body = html_body + f"<br><br>{sig}"
-
-    payload: dict = {
-        "from": from_addr or get_default_from(),
-        "to": list(to_addrs),
-        "subject": subject,
-    }
-    default_reply = reply_to or get_default_reply_to()
-    if default_reply:
-        payload["reply_to"] = [default_reply]
-    if text_body:
-        payload["text"] = text_body
-    if html_body:
-        payload["html"] = html_body
-    if cc:
-        payload["cc"] = list(cc)
-    if bcc:
-        payload["bcc"] = list(bcc)
-    if attach:
-        payload["attachments"] = [ResendClient.encode_attachment(a) for a in attach]
-    if tag:
-        payload["tags"] = []
-        for t in tag:
-            if "=" in t:
-                k, v = t.split("=", 1)
-                payload["tags"].append({"name": k, "value": v})
-    if idempotency_key:
-        payload["headers"] = {"Idempotency-Key": idempotency_key}
+    with span("build"):
+        config = current_config()
+        if sign:
+            sig = config.signature
+            if sig:
+                if text_body:
+                    text_body = text_body + f"\n\n{sig}"
+                if html_body:
+                    html_body = html_body + f"<br><br>{sig}"
+
+        payload: dict = {
+            "from": from_addr or config.default_from,
+            "to": list(to_addrs),
+            "subject": subject,
+        }
+        default_reply = reply_to or config.default_reply_to
+        if default_reply:
+            payload["reply_to"] = [default_reply]
+        if text_body:
+            payload["text"] = text_body
+        if html_body:
+            payload["html"] = html_body
+        if cc:
+            payload["cc"] = list(cc)
+        if bcc:
+            payload["bcc"] = list(bcc)
+        if attach:
+            load = attachment_loader(config.attachment_cache_bytes)
+            payload["attachments"] = [load(a) for a in attach]
+        if tag:
+            payload["tags"] = []
+            for t in tag:
+                if "=" in t:
+                    k, v = t.split("=", 1)
+                    payload["tags"].append({"name": k, "value": v})
 
     if dry_run:
-        print_dry_run(payload)
+        emit("print_dry_run", materialize(payload))
+        return
+
+    if queue:
+        # Attachments are encoded now: the files may be gone by the time a worker sends.
+        name = open_spool(spool_dir).put(materialize(payload), idempotency_key, lane=priority)
+        emit("print_email_queued", {"id": name})
         return
 
+    if not (journaled or resume):
+        try:
+            client = get_client()
+            result = client.send_email(payload, idempotency_key=idempotency_key)
+        except (ResendError, RuntimeError) as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        emit("print_email_sent", result)
+        return
+
+    from .journal import SENT, payload_hash
+
+    digest = payload_hash(payload)
+    run = open_journal().start(f"send:{digest}", resume=resume)
+    entry = run.entry(1)
+    if entry is not None and entry["status"] == SENT:
+        click.echo("Already sent; not sending again", err=True)
+        emit("print_email_sent", {"id": entry["email_id"]})
+        return
+    key = idempotency_key or (entry["idempotency_key"] if entry else run.key_for([(1, digest)]))
+    run.plan([(1, digest)], key)
     try:
         client = get_client()
-        result = client.send_email(payload)
-        print_email_sent(result)
+        result = client.send_email(payload, idempotency_key=key)
     except (ResendError, RuntimeError) as e:
+        run.failed([1], str(e))
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
+    run.sent([1], [(result or {}).get("id")])
+    run.finish()
+    emit("print_email_sent", result)
+
+
+@cli.command("send-batch")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--from", "from_addr", default=None, help="Sender for rows without one")
+@click.option("--results", type=click.File("w"), default="-", help="Write JSONL results here (default: stdout)")
+@click.option("--batch-size", default=BATCH_MAX, type=click.IntRange(1, BATCH_MAX), help="Emails per batch request")
+@click.option("--workers", default=4, type=click.IntRange(1), help="Batches in flight at once")
+@click.option("--resume", is_flag=True, help="Continue the last run for this file, skipping rows already sent")
+@click.option("--queue", is_flag=True, help="Write the emails to the spool for 'resend-cli worker' instead")
+@click.option("--spool", "spool_dir", type=click.Path(file_okay=False), default=None, envvar="RESEND_SPOOL",
+              help="Spool directory (default: one per profile in the cache dir)")
+@click.option("--priority", type=click.Choice(LANES), default="bulk", show_default=True,
+              help="Lane for queued emails")
+@click.option("--shards", default=None, envvar="RESEND_SHARDS", metavar="PROFILE,...",
+              help="Spread the sends over these credentials profiles, one account each")
+@click.option("--shard-by", type=click.Choice(("domain", "round-robin")), default="domain", show_default=True,
+              help="Pick a shard owning the sender domain (RESEND_DOMAINS), or any shard")
+def send_batch(file, from_addr, results, batch_size, workers, resume, queue, spool_dir, priority, shards,
+               shard_by):
+    """Send emails from a CSV or JSONL file via the batch endpoint.
+
+    Rows with an ``attach`` column are sent one by one, since the batch
+    endpoint does not accept attachments. Each run is journaled with
+    idempotency keys, so after a crash --resume finishes it without sending
+    any row twice. With --queue the rows go to the spool in the --priority
+    lane instead, to be sent one by one by the worker alongside other mail.
+
+    With --shards each profile's account sends its share under its own rate
+    limit, and a report per shard is printed at the end. Resume a sharded
+    run with the same --shards, so every batch goes back to its account.
+    """
+    from .attachments import materialize
+    from .bulk import read_rows, row_to_payload, send_batches
+    from .cache import attachment_loader
+
+    check_priority(queue)
+    config = current_config()
+    default_from = from_addr or config.default_from
+    load = attachment_loader(config.attachment_cache_bytes)
+    payloads = (row_to_payload(r, default_from, config.default_reply_to, load) for r in read_rows(file))
+    if queue:
+        spool = open_spool(spool_dir)
+        count = 0
+        for count, payload in enumerate(payloads, start=1):
+            results.write(json.dumps({"row": count, "item": spool.put(materialize(payload), lane=priority)}) + "\n")
+        click.echo(f"Queued {count} in the {priority} lane", err=True)
+        return
+    client = get_sharded_client(shards, shard_by, workers) if shards else None
+    try:
+        if client is None:
+            client = get_client(workers)
+        run = open_journal().start(f"send-batch:{Path(file).resolve()}", resume=resume)
+        sent, failed = send_batches(client, payloads, results, batch_size=batch_size, workers=workers,
+                                    journal=run)
+    except (ResendError, RuntimeError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    finally:
+        if shards and client is not None:
+            report_shards(client)
+    if not failed:
+        run.finish()
+    skipped = f", skipped {run.skipped} already sent" if run.skipped else ""
+    click.echo(f"Sent {sent}, failed {failed}{skipped}", err=True)
+    if failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("--spool", "spool_dir", type=click.Path(file_okay=False), default=None, envvar="RESEND_SPOOL",
+              help="Spool directory (default: one per profile in the cache dir)")
+@click.option("--results", type=click.File("w"), default="-", help="Write JSONL results here (default: stdout)")
+@click.option("--workers", default=4, type=click.IntRange(1), help="Emails sent at once")
+@click.option("--once", is_flag=True, help="Exit when the spool has nothing due instead of waiting for more")
+@click.option("--poll", default=1.0, type=click.FloatRange(min=0.01), show_default=True,
+              help="Seconds between scans of an idle spool")
+@click.option("--max-attempts", default=5, type=click.IntRange(1), show_default=True,
+              help="Sends tried before an email goes to the dead-letter folder")
+@click.option("--shards", default=None, envvar="RESEND_SHARDS", metavar="PROFILE,...",
+              help="Spread the sends over these credentials profiles, one account each")
+@click.option("--shard-by", type=click.Choice(("domain", "round-robin")), default="domain", show_default=True,
+              help="Pick a shard owning the sender domain (RESEND_DOMAINS), or any shard")
+def worker(spool_dir, results, workers, once, poll, max_attempts, shards, shard_by):
+    """Send emails queued with 'send --queue'.
+
+    Several workers may share a spool. High-priority emails go first, but
+    each lane gets a share of the send rate so bulk mail keeps moving; time
+    spent waiting per lane is reported on exit. Emails that fail with a
+    retryable error are requeued with backoff; the rest end up in the
+    spool's dead/ folder with the error recorded.
+    """
+    from .lanes import LaneScheduler
+    from .spool import drain
+
+    spool = open_spool(spool_dir)
+    scheduler: LaneScheduler = LaneScheduler()
+    client = get_sharded_client(shards, shard_by, workers, long_running=True) if shards else None
+    try:
+        if client is None:
+            client = get_client(workers, long_running=True)
+        while True:
+            spool.recover()
+            stats = drain(spool, client, results, workers=workers, max_attempts=max_attempts, scheduler=scheduler)
+            if once and not any(stats.values()):
+                break
+            if not any(stats.values()):
+                time.sleep(poll)
+    except (ResendError, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    for lane, waits in scheduler.stats().items():
+        click.echo(f"{lane}: {waits['count']} emails, waited {waits['avg_wait']:.2f}s on average, "
+                   f"{waits['max_wait']:.2f}s at most", err=True)
+    if shards:
+        report_shards(client)
+    counts = spool.counts()
+    click.echo(f"Spool: {counts['new']} queued, {counts['dead']} dead", err=True)
 
 
 @cli.group(invoke_without_command=True)
@@ -119,10 +489,7 @@ def inbox(ctx, limit):
     if ctx.invoked_subcommand is None:
         try:
             client = get_client()
-            items = client.list_inbound()
-            if limit:
-                items = items[:limit]
-            print_inbound_list(items)
+            emit("print_inbound_list", client.iter_inbound(limit=limit), output.INBOUND_FIELDS)
         except (ResendError, RuntimeError) as e:
             click.echo(f"Error: {e}", err=True)
             sys.exit(1)
@@ -135,23 +502,55 @@ def inbox_read(email_id):
     try:
         client = get_client()
         data = client.get_inbound(email_id)
-        print_inbound_detail(data)
+        emit("print_inbound_detail", data)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
 
 
 @cli.command()
-@click.argument("email_id")
-def status(email_id):
-    """Get sent email delivery status."""
+@click.argument("email_ids", nargs=-1)
+@click.option("--file", "ids_file", type=click.File("r"), default=None,
+              help="Read email ids from a file, one per line ('-' for stdin)")
+@click.option("--watch", is_flag=True, help="Keep polling until every email reaches a final event")
+@click.option("--interval", default=2.0, type=click.FloatRange(min=0.1), show_default=True,
+              help="Seconds between polls of an email whose status just changed")
+@click.option("--max-interval", default=60.0, type=click.FloatRange(min=0.1), show_default=True,
+              help="Longest wait between polls of an email whose status has settled")
+@click.option("--budget", default=None, type=click.FloatRange(min=0),
+              help="Status requests per second across all emails (default: RESEND_RATE_LIMIT, 0 for none)")
+@click.option("--workers", default=4, type=click.IntRange(1), help="Requests in flight at once")
+@click.option("--timeout", default=None, type=click.FloatRange(min=0), help="Give up watching after this many seconds")
+def status(email_ids, ids_file, watch, interval, max_interval, budget, workers, timeout):
+    """Get sent email delivery status.
+
+    With --watch, every change of an email's last event is printed as it
+    happens; emails that stop changing are polled less and less often.
+    """
+    if ids_file is not None:
+        email_ids = (*email_ids, *(line.strip() for line in ids_file if line.strip()))
+    if not email_ids:
+        raise click.UsageError("give at least one email id, or --file")
     try:
-        client = get_client()
-        data = client.get_email(email_id)
-        print_email_status(data)
+        if not watch:
+            client = get_client()
+            for email_id in email_ids:
+                emit("print_email_status", client.get_email(email_id))
+            return
+        from .watch import Watcher
+
+        client = get_client(workers)
+        budget = current_config().rate_limit if budget is None else budget
+        watcher = Watcher(client, email_ids, budget=budget, interval=interval,
+                          max_interval=max_interval, workers=workers)
+        for change in watcher.run(timeout=timeout):
+            emit("print_status_change", change)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
+    if watcher.unfinished:
+        click.echo(f"Timed out with {len(watcher.unfinished)} email(s) still pending", err=True)
+        sys.exit(1)
 
 
 @cli.group()
@@ -165,8 +564,7 @@ def domains_list():
     """List all domains."""
     try:
         client = get_client()
-        items = client.list_domains()
-        print_domains(items)
+        emit("print_domains", client.iter_domains(), output.DOMAIN_FIELDS)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -179,7 +577,7 @@ def domains_verify(domain_id):
     try:
         client = get_client()
         data = client.verify_domain(domain_id)
-        print_domain_verified(data)
+        emit("print_domain_verified", data)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -196,8 +594,7 @@ def audiences_list():
     """List all audiences."""
     try:
         client = get_client()
-        items = client.list_audiences()
-        print_audiences(items)
+        emit("print_audiences", client.iter_audiences(), output.AUDIENCE_FIELDS)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -210,7 +607,7 @@ def audiences_create(name):
     try:
         client = get_client()
         data = client.create_audience(name)
-        print_audience_created(data)
+        emit("print_audience_created", data)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -223,7 +620,7 @@ def audiences_remove(audience_id):
     try:
         client = get_client()
         data = client.delete_audience(audience_id)
-        print_audience_deleted(data)
+        emit("print_audience_deleted", data)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -237,12 +634,37 @@ def contacts():
 
 @contacts.command("list")
 @click.option("--audience", required=True, help="Audience ID")
-def contacts_list(audience):
+@click.option("--cached", is_flag=True, help="Read from the local mirror (see 'sync') instead of the API")
+def contacts_list(audience, cached):
     """List contacts in an audience."""
     try:
-        client = get_client()
-        items = client.list_contacts(audience)
-        print_contacts(items)
+        if cached:
+            mirror = open_mirror(create=False)
+            if mirror is None or mirror.synced_at(audience) is None:
+                raise RuntimeError(f"audience {audience} is not mirrored; run 'resend-cli sync' first")
+            items = mirror.contacts(audience)
+        else:
+            items = get_client().iter_contacts(audience)
+        emit("print_contacts", items, output.CONTACT_FIELDS)
+    except (ResendError, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@contacts.command("get")
+@click.option("--audience", required=True, help="Audience ID")
+@click.option("--email", required=True, help="Contact email/ID")
+@click.option("--cached", is_flag=True, help="Only consult the local mirror")
+def contacts_get(audience, email, cached):
+    """Look up one contact, from the local mirror when possible."""
+    try:
+        mirror = open_mirror(create=False)
+        data = mirror.find_contact(audience, email) if mirror else None
+        if data is None:
+            if cached:
+                raise RuntimeError(f"{email} not found in the local mirror of audience {audience}")
+            data = get_client().get_contact(audience, email)
+        emit("print_contact", data)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -263,24 +685,197 @@ def contacts_add(audience, email, first_name, last_name):
         if last_name:
             kwargs["last_name"] = last_name
         data = client.create_contact(audience, email, **kwargs)
-        print_contact_created(data)
+        mirror = open_mirror(create=False)
+        if mirror is not None:
+            mirror.add_contact(audience, {"email": email, **kwargs, **(data or {})})
+        emit("print_contact_created", data)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
 
 
+@contacts.command("import")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--audience", required=True, help="Audience ID")
+@click.option("--results", type=click.File("w"), default="-", help="Write JSONL results here (default: stdout)")
+@click.option("--workers", default=4, type=click.IntRange(1), help="Contacts created at once")
+@click.option("--checkpoint", type=click.Path(dir_okay=False), default=None,
+              help="Progress file (default: one per audience and input file in the cache dir)")
+@click.option("--restart", is_flag=True, help="Ignore saved progress and start from the first row")
+def contacts_import(file, audience, results, workers, checkpoint, restart):
+    """Import contacts from a CSV or JSONL file.
+
+    Rows need an ``email`` and may have ``first_name``, ``last_name`` and
+    ``unsubscribed``. Duplicate emails and contacts already in the audience
+    (from the local mirror if synced, otherwise the API) are skipped. Progress
+    is checkpointed, so rerunning an interrupted or partly failed import
+    resumes it and retries the failed rows. Created contacts are written to
+    the local mirror.
+    """
+    import hashlib
+
+    from .bulk import Checkpoint, import_contacts, read_rows
+
+    if checkpoint is None:
+        digest = hashlib.sha256(str(Path(file).resolve()).encode()).hexdigest()[:16]
+        checkpoint = CACHE_DIR / "imports" / f"{audience}-{digest}.json"
+    try:
+        client = get_client(workers)
+        if restart:
+            Path(checkpoint).unlink(missing_ok=True)
+        progress = Checkpoint(checkpoint)
+        mirror = open_mirror(create=False)
+        if mirror is not None and mirror.synced_at(audience) is not None:
+            existing = (c["email"] for c in mirror.contacts(audience))
+        else:
+            existing = (c["email"] for c in client.iter_contacts(audience))
+        stats = import_contacts(client, audience, read_rows(file), results, existing=existing,
+                                checkpoint=progress, workers=workers, mirror=mirror)
+    except (ResendError, RuntimeError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Created {stats['created']}, skipped {stats['skipped']}, failed {stats['failed']}", err=True)
+    if stats["failed"]:
+        click.echo("Progress kept; rerun the import to retry the failed rows", err=True)
+        sys.exit(1)
+    progress.remove()
+
+
+@contacts.command("reconcile")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--audience", required=True, help="Audience ID")
+@click.option("--results", type=click.File("w"), default="-", help="Write JSONL results here (default: stdout)")
+@click.option("--workers", default=4, type=click.IntRange(1), help="Changes applied at once")
+@click.option("--dry-run", is_flag=True, help="Only show how many contacts would be added, updated and removed")
+@click.option("--allow-mass-remove", is_flag=True, help="Apply the plan even if it removes over 10% of the audience")
+def contacts_reconcile(file, audience, results, workers, dry_run, allow_mass_remove):
+    """Make an audience match a CSV or JSONL file of contacts.
+
+    Contacts missing from the file are removed, new ones added, and ones whose
+    ``first_name``, ``last_name`` or ``unsubscribed`` differ are updated. Blank
+    cells leave that field as it is. A file without an ``email`` column or
+    without any emails is rejected, and a plan removing more than 10% of the
+    audience needs --allow-mass-remove.
+    """
+    from .bulk import read_rows
+    from .reconcile import Reconciliation, apply
+
+    try:
+        client = get_client(workers)
+        plan = Reconciliation(lambda: read_rows(file), client.iter_contacts(audience))
+        if dry_run:
+            emit("print_reconcile_summary", plan.summary(), dry_run=True)
+            if plan.mass_remove:
+                click.echo(f"Warning: removes {len(plan.removes)} of {plan.remote_total} contacts; "
+                           "applying it needs --allow-mass-remove", err=True)
+            return
+        stats = apply(client, audience, plan, results, workers=workers, mirror=open_mirror(create=False),
+                      allow_mass_remove=allow_mass_remove)
+    except (ResendError, RuntimeError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Added {stats['add']}, updated {stats['update']}, removed {stats['remove']}, "
+               f"failed {stats['failed']}", err=True)
+    if stats["failed"]:
+        sys.exit(1)
+
+
 @contacts.command("remove")
 @click.option("--audience", required=True, help="Audience ID")
 @click.option("--email", required=True, help="Contact email/ID to remove")
 def contacts_remove(audience, email):
-    """Remove a contact from an audience."""
+    """Remove a contact from an audience.
+
+    Emails are resolved to contact ids through the local mirror when it has
+    them; otherwise the email is passed to the API as is.
+    """
     try:
         client = get_client()
-        data = client.delete_contact(audience, email)
-        print_contact_deleted(data)
+        mirror = open_mirror(create=False)
+        contact = email
+        if mirror is not None and "@" in email:
+            found = mirror.find_contact(audience, email)
+            if found:
+                contact = found["id"]
+        data = client.delete_contact(audience, contact)
+        if mirror is not None:
+            mirror.remove_contact(audience, contact)
+        emit("print_contact_deleted", data)
+    except (ResendError, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("--audience", "audience_ids", multiple=True, help="Only sync these audience IDs (default: all)")
+def sync(audience_ids):
+    """Mirror audiences and contacts into a local SQLite database."""
+    try:
+        client = get_client()
+        mirror = open_mirror()
+        stats = mirror.sync(client, audience_ids or None)
+        emit("print_sync_summary", stats)
+    except (ResendError, RuntimeError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command("exec")
+@click.argument("ops_file", metavar="FILE", type=click.File("r"), default="-")
+@click.option("--workers", default=4, type=click.IntRange(1), help="Operations run at once")
+def exec_ops(ops_file, workers):
+    """Run JSONL operation records from FILE (default: stdin) in one process.
+
+    Each line is {"id": ..., "op": <client method>, "args": [...], "kwargs": {...}},
+    e.g. {"id": "a1", "op": "get_email", "args": ["<email-id>"]}. Results are
+    written to stdout as JSONL in completion order, tagged with the record's
+    id. send_email payloads get the same defaults as send-batch rows.
+    """
+    from .bulk import row_to_payload
+    from .cache import attachment_loader
+    from .pipe import parse_ops, run_ops
+
+    config = current_config()
+    load = attachment_loader(config.attachment_cache_bytes)
+
+    def prepare(record: dict) -> dict:
+        args = record.get("args")
+        if record.get("op") == "send_email" and isinstance(args, list) and args and isinstance(args[0], dict):
+            payload = row_to_payload(args[0], config.default_from, config.default_reply_to, load)
+            record = {**record, "args": [payload, *args[1:]]}
+        return record
+
+    try:
+        client = get_client(workers)
+        ok, failed = run_ops(client, parse_ops(ops_file), sys.stdout, workers=workers, prepare=prepare)
     except (ResendError, RuntimeError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
+    click.echo(f"Succeeded {ok}, failed {failed}", err=True)
+    if failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("--workers", default=32, type=click.IntRange(1), show_default=True,
+              help="Keep-alive connections to hold open to the API")
+def daemon(workers):
+    """Serve API calls for other resend-cli commands over a Unix socket.
+
+    While it runs, commands using the same profile and API key forward their
+    requests to it and skip building a client, the TLS handshake and the
+    rate limiter setup. Without it they work standalone as before.
+    """
+    from .daemon import daemon_path, serve
+
+    path = daemon_path(click.get_current_context().find_root().obj.get("profile"))
+    try:
+        client = get_client(workers, standalone=True, long_running=True)
+        click.echo(f"Listening on {path}", err=True)
+        serve(path, client, current_config().api_key, current_config().api_base)
+    except (ResendError, RuntimeError, OSError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
 
 
 def main():
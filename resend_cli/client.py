@@ -1,31 +1,49 @@
 """Resend API client wrapping all endpoints."""
 
 import base64
+import threading
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from .config import API_BASE, DEFAULT_TIMEOUT
-
-
-class ResendError(Exception):
-    """Raised on API errors."""
-
-    def __init__(self, status_code: int, message: str):
-        self.status_code = status_code
-        self.message = message
-        super().__init__(f"Resend API error {status_code}: {message}")
+from .attachments import MAX_EMAIL_BYTES, StreamingBody, has_file_attachments
+from .config import API_BASE, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT, PAGE_SIZE_MAX
+from .errors import ResendError
+from .metrics import Metrics
+from .profiling import span
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy, parse_retry_after
+from .serialization import dumps
 
 
 class ResendClient:
-    """Wraps the Resend REST API."""
-
-    def __init__(self, api_key: str, base_url: str = API_BASE, timeout: int = DEFAULT_TIMEOUT):
+    """Wraps the Resend REST API.
+
+    A client is safe to share between threads. Size ``pool_maxsize`` to the
+    number of concurrent callers so each keeps a warm keep-alive connection;
+    with ``pool_block`` callers wait for a free connection instead of opening
+    (and later discarding) extra ones. Pass ``metrics`` to record every
+    attempt, retry and rate-limiter wait.
+    """
+
+    def __init__(self, api_key: str, base_url: str = API_BASE, timeout: int = DEFAULT_TIMEOUT,
+                 rate_limiter: TokenBucket | None = None, retry_policy: RetryPolicy | None = None,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False, metrics: Metrics | None = None):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics
         self.session = requests.Session()
+        # Retries are handled by RetryPolicy, not urllib3.
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -33,13 +51,32 @@ class ResendClient:
 
     def _request(self, method: str, path: str, **kwargs: Any) -> Any:
         kwargs.setdefault("timeout", self.timeout)
+        if "json" in kwargs:
+            # Encoded once to bytes (the session already sends Content-Type: application/json),
+            # instead of requests building a str and then encoding it on every attempt.
+            with span("serialize"):
+                kwargs["data"] = dumps(kwargs.pop("json"))
         url = f"{self.base_url}{path}"
-        resp = self.session.request(method, url, **kwargs)
-
-        if resp.status_code == 429:
-            retry_after = int(resp.headers.get("Retry-After", "1"))
-            time.sleep(retry_after)
-            resp = self.session.request(method, url, **kwargs)
+        policy = self.retry_policy
+        headers = kwargs.get("headers")
+        attempt = 1
+        while True:
+            try:
+                resp = self._send(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not policy.should_retry(attempt, method, headers):
+                    raise
+                slept = policy.wait(attempt)
+                if self.metrics is not None:
+                    self.metrics.retry(path, method, slept)
+                attempt += 1
+                continue
+            if resp.status_code < 400 or not policy.should_retry(attempt, method, headers, resp.status_code):
+                break
+            slept = policy.wait(attempt, parse_retry_after(resp.headers.get("Retry-After")))
+            if self.metrics is not None:
+                self.metrics.retry(path, method, slept)
+            attempt += 1
 
         if resp.status_code >= 400:
             try:
@@ -52,10 +89,75 @@ class ResendClient:
             return None
         return resp.json()
 
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        body = kwargs.get("data")
+        if isinstance(body, StreamingBody):
+            body.seek(0)  # a retry must resend the whole stream
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire()
+            if self.metrics is not None:
+                self.metrics.rate_limited(waited)
+        if self.metrics is None:
+            with span("http"):
+                return self.session.request(method, url, **kwargs)
+        path = url[len(self.base_url):]
+        started = time.perf_counter()
+        try:
+            with span("http"):
+                resp = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.metrics.observe(path, method, None, time.perf_counter() - started)
+            raise
+        self.metrics.observe(path, method, resp.status_code, time.perf_counter() - started)
+        return resp
+
+    def _paginate(self, path: str, limit: int | None = None, page_size: int = PAGE_SIZE_MAX,
+                  after: str | None = None) -> Iterator[dict]:
+        """Yield items from a list endpoint, following ``after`` cursors page by page.
+
+        ``limit`` caps the total and shrinks the last page request, so no more
+        is fetched than will be used. ``after`` resumes from the item with that
+        id. Endpoints that answer with a plain list are treated as a single page.
+        """
+        remaining = limit
+        params: dict = {"after": after} if after else {}
+        while remaining is None or remaining > 0:
+            params["limit"] = min(page_size, remaining) if remaining is not None else page_size
+            data = self._request("GET", path, params=dict(params))
+            items = data.get("data", []) if isinstance(data, dict) else (data or [])
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            yield from items
+            if not isinstance(data, dict) or not data.get("has_more") or not items:
+                return
+            params["after"] = items[-1]["id"]
+
     # --- Email sending ---
 
-    def send_email(self, payload: dict) -> dict:
-        return self._request("POST", "/emails", json=payload)
+    @staticmethod
+    def _idempotency_headers(idempotency_key: str | None) -> dict:
+        return {"headers": {"Idempotency-Key": idempotency_key}} if idempotency_key else {}
+
+    def send_email(self, payload: dict, idempotency_key: str | None = None) -> dict:
+        """Send one email. FileAttachment entries are streamed from disk in chunks."""
+        headers = self._idempotency_headers(idempotency_key)
+        if has_file_attachments(payload):
+            with span("serialize"):
+                body = StreamingBody(payload)
+            if len(body) > MAX_EMAIL_BYTES:
+                raise ResendError(413, f"email is {len(body) / 2**20:.1f} MB after encoding; "
+                                       f"the limit is {MAX_EMAIL_BYTES // 2**20} MB")
+            return self._request("POST", "/emails", data=body, **headers)
+        return self._request("POST", "/emails", json=payload, **headers)
+
+    def send_batch(self, payloads: list[dict], idempotency_key: str | None = None) -> list:
+        """Send up to 100 emails in one /emails/batch call; returns the created ids."""
+        data = self._request("POST", "/emails/batch", json=payloads,
+                             **self._idempotency_headers(idempotency_key))
+        if isinstance(data, dict):
+            return data.get("data", [])
+        return data
 
     # --- Sent email status ---
 
@@ -64,33 +166,33 @@ class ResendClient:
 
     # --- Inbound (receiving) ---
 
-    def list_inbound(self) -> list:
-        data = self._request("GET", "/emails/receiving")
-        if isinstance(data, dict):
-            return data.get("data", [])
-        return data
+    def iter_inbound(self, limit: int | None = None) -> Iterator[dict]:
+        return self._paginate("/emails/receiving", limit)
+
+    def list_inbound(self, limit: int | None = None) -> list:
+        return list(self.iter_inbound(limit=limit))
 
     def get_inbound(self, email_id: str) -> dict:
         return self._request("GET", f"/emails/receiving/{email_id}")
 
     # --- Domains ---
 
-    def list_domains(self) -> list:
-        data = self._request("GET", "/domains")
-        if isinstance(data, dict):
-            return data.get("data", [])
-        return data
+    def iter_domains(self, limit: int | None = None) -> Iterator[dict]:
+        return self._paginate("/domains", limit)
+
+    def list_domains(self, limit: int | None = None) -> list:
+        return list(self.iter_domains(limit=limit))
 
     def verify_domain(self, domain_id: str) -> dict:
         return self._request("POST", f"/domains/{domain_id}/verify")
 
     # --- Audiences ---
 
-    def list_audiences(self) -> list:
-        data = self._request("GET", "/audiences")
-        if isinstance(data, dict):
-            return data.get("data", [])
-        return data
+    def iter_audiences(self, limit: int | None = None) -> Iterator[dict]:
+        return self._paginate("/audiences", limit)
+
+    def list_audiences(self, limit: int | None = None) -> list:
+        return list(self.iter_audiences(limit=limit))
 
     def create_audience(self, name: str) -> dict:
         return self._request("POST", "/audiences", json={"name": name})
@@ -100,11 +202,15 @@ class ResendClient:
 
     # --- Contacts ---
 
-    def list_contacts(self, audience_id: str) -> list:
-        data = self._request("GET", f"/audiences/{audience_id}/contacts")
-        if isinstance(data, dict):
-            return data.get("data", [])
-        return data
+    def iter_contacts(self, audience_id: str, limit: int | None = None, after: str | None = None) -> Iterator[dict]:
+        return self._paginate(f"/audiences/{audience_id}/contacts", limit, after=after)
+
+    def get_contact(self, audience_id: str, contact: str) -> dict:
+        """Fetch a contact by id or email address."""
+        return self._request("GET", f"/audiences/{audience_id}/contacts/{contact}")
+
+    def list_contacts(self, audience_id: str, limit: int | None = None) -> list:
+        return list(self.iter_contacts(audience_id, limit=limit))
 
     def create_contact(self, audience_id: str, email: str, **kwargs: Any) -> dict:
         payload: dict = {"email": email}
@@ -116,6 +222,10 @@ class ResendClient:
             payload["unsubscribed"] = kwargs["unsubscribed"]
         return self._request("POST", f"/audiences/{audience_id}/contacts", json=payload)
 
+    def update_contact(self, audience_id: str, contact_id: str, **kwargs: Any) -> dict:
+        payload = {k: kwargs[k] for k in ("first_name", "last_name", "unsubscribed") if k in kwargs}
+        return self._request("PATCH", f"/audiences/{audience_id}/contacts/{contact_id}", json=payload)
+
     def delete_contact(self, audience_id: str, contact_id: str) -> dict:
         return self._request("DELETE", f"/audiences/{audience_id}/contacts/{contact_id}")
 
@@ -124,5 +234,23 @@ class ResendClient:
     @staticmethod
     def encode_attachment(file_path: str) -> dict:
         p = Path(file_path)
-        content = base64.b64encode(p.read_bytes()).decode()
+        with span("encode"):
+            content = base64.b64encode(p.read_bytes()).decode()
         return {"filename": p.name, "content": content}
+
+
+_shared_clients: dict[tuple, ResendClient] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(api_key: str, base_url: str = API_BASE, **kwargs: Any) -> ResendClient:
+    """Return the process-wide client for ``(api_key, base_url)``, creating it once.
+
+    Keyword arguments only apply when the client is first created.
+    """
+    key = (api_key, base_url.rstrip("/"))
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = ResendClient(api_key, base_url, **kwargs)
+        return client
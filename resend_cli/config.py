@@ -1,61 +1,203 @@
 """Credential loading and default configuration."""
 
 import os
+import threading
 from pathlib import Path
 
 API_BASE = "https://api.resend.com"
 CREDENTIALS_PATH = Path.home() / ".openclaw" / "credentials" / "resend.env"
 DEFAULT_TIMEOUT = 30
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "resend-cli"
+# Resend's default account limit is 2 requests per second.
+DEFAULT_RATE_LIMIT = 2.0
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_ATTACHMENT_CACHE_MB = 256
+# Most emails accepted by one /emails/batch call.
+BATCH_MAX = 100
+# Largest page the list endpoints return.
+PAGE_SIZE_MAX = 100
 
 # Defaults are loaded from env vars or credentials file.
 # Set these in your environment or credentials file:
 #   RESEND_FROM="Your Name <you@yourdomain.com>"
 #   RESEND_REPLY_TO="you@yourdomain.com"
 #   RESEND_SIGNATURE="-- Your Name, Your Title"
+#   RESEND_RATE_LIMIT=2        (requests per second, 0 disables the limiter)
+#   RESEND_POOL_CONNECTIONS=10 (connection pools to cache)
+#   RESEND_POOL_MAXSIZE=10     (keep-alive connections kept per host)
+#   RESEND_POOL_BLOCK=false    (wait for a free connection instead of opening extras)
+#   RESEND_ATTACHMENT_CACHE_MB=256 (encoded attachment cache size, 0 disables)
+#   RESEND_API_BASE=https://api.resend.com (e.g. a local resend_cli.stub_server)
+#   RESEND_DOMAINS=example.com,news.example.com (sender domains of this account, for --shards)
+#
+# Named profiles are sections of the same file; their keys override the
+# top-level ones (and the environment) when selected with --profile:
+#   [prod]
+#   RESEND_API_KEY=re_prod_key
+#   RESEND_FROM="Ops <ops@example.com>"
 _FALLBACK_FROM = "sender@example.com"
 _FALLBACK_REPLY_TO = ""
 _FALLBACK_SIGNATURE = ""
 
+_parsed: tuple[object, tuple[int, int], dict[str, dict[str, str]]] | None = None
+_parsed_lock = threading.Lock()
+
+
+def _parse_credentials(text: str) -> dict[str, dict[str, str]]:
+    """Parse key=value lines into sections; top-level keys live under ``""``."""
+    sections: dict[str, dict[str, str]] = {"": {}}
+    current = sections[""]
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("[") and line.endswith("]"):
+            current = sections.setdefault(line[1:-1].strip(), {})
+            continue
+        if line.startswith("#") or not line or "=" not in line:
+            continue
+        k, v = line.split("=", 1)
+        current[k.strip()] = v.strip().strip('"').strip("'")
+    return sections
+
+
+def _load_sections() -> dict[str, dict[str, str]]:
+    """Return the parsed credentials file, re-reading it only when it changes."""
+    global _parsed
+    path = CREDENTIALS_PATH
+    if not path.exists():
+        return {"": {}}
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _parsed_lock:
+        if _parsed is None or _parsed[0] is not path or _parsed[1] != stamp:
+            _parsed = (path, stamp, _parse_credentials(path.read_text()))
+        return _parsed[2]
+
 
 def _load_credentials() -> dict[str, str]:
-    """Load key=value pairs from the credentials file."""
-    creds: dict[str, str] = {}
-    if CREDENTIALS_PATH.exists():
-        for line in CREDENTIALS_PATH.read_text().splitlines():
-            line = line.strip()
-            if line.startswith("#") or not line or "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            creds[k.strip()] = v.strip().strip('"').strip("'")
-    return creds
+    """Load top-level key=value pairs from the credentials file."""
+    return _load_sections()[""]
+
+
+class Config:
+    """Resolved settings for one profile.
+
+    Values come from the credentials file's top level, then environment
+    variables, then the named profile's section, each overriding the last.
+    The file parse is shared and memoized by mtime, and a Config never touches
+    the disk after construction, so long-running code should build one and
+    keep it.
+    """
+
+    def __init__(self, profile: str | None = None):
+        sections = _load_sections()
+        if profile and profile not in sections:
+            raise RuntimeError(f"Profile {profile!r} not found in {CREDENTIALS_PATH}")
+        env = {k: v for k, v in os.environ.items() if k.startswith("RESEND_") and v}
+        self.profile = profile
+        self.values = {**sections[""], **env, **(sections[profile] if profile else {})}
+
+    def get(self, name: str, default: str = "") -> str:
+        return self.values.get(name) or default
+
+    @property
+    def api_key(self) -> str:
+        key = self.get("RESEND_API_KEY").strip()
+        if not key:
+            raise RuntimeError(
+                "RESEND_API_KEY not found. Set it in the environment or in "
+                f"{CREDENTIALS_PATH}"
+            )
+        return key
+
+    @property
+    def api_base(self) -> str:
+        return self.get("RESEND_API_BASE", API_BASE).rstrip("/")
+
+    @property
+    def domains(self) -> frozenset[str]:
+        """Sender domains verified on this account; empty when not configured."""
+        return frozenset(d.strip().lower() for d in self.get("RESEND_DOMAINS").split(",") if d.strip())
+
+    @property
+    def default_from(self) -> str:
+        return self.get("RESEND_FROM", _FALLBACK_FROM)
+
+    @property
+    def default_reply_to(self) -> str:
+        return self.get("RESEND_REPLY_TO", _FALLBACK_REPLY_TO)
+
+    @property
+    def signature(self) -> str:
+        return self.get("RESEND_SIGNATURE", _FALLBACK_SIGNATURE)
+
+    def _number(self, name: str, default: float) -> float:
+        raw = self.get(name)
+        try:
+            return float(raw) if raw else default
+        except ValueError:
+            raise RuntimeError(f"{name} must be a number, got {raw!r}")
+
+    @property
+    def rate_limit(self) -> float:
+        """Client-side request rate per second; 0 disables the limiter."""
+        return max(0.0, self._number("RESEND_RATE_LIMIT", DEFAULT_RATE_LIMIT))
+
+    @property
+    def pool_options(self) -> dict:
+        """HTTP connection pool settings as ResendClient keyword arguments."""
+        return {
+            "pool_connections": int(self._number("RESEND_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS)),
+            "pool_maxsize": int(self._number("RESEND_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)),
+            "pool_block": self.get("RESEND_POOL_BLOCK").lower() in ("1", "true", "yes"),
+        }
+
+    @property
+    def attachment_cache_bytes(self) -> int:
+        """Attachment cache size cap in bytes; 0 means caching is off."""
+        return max(0, int(self._number("RESEND_ATTACHMENT_CACHE_MB", DEFAULT_ATTACHMENT_CACHE_MB) * 1024 * 1024))
+
+
+def get_config(profile: str | None = None) -> Config:
+    """Build the Config for ``profile`` (the top level when None)."""
+    return Config(profile)
 
 
 def load_api_key() -> str:
     """Load RESEND_API_KEY from env, falling back to credentials file."""
-    key = os.environ.get("RESEND_API_KEY")
-    if key:
-        return key.strip()
+    return get_config().api_key
 
-    creds = _load_credentials()
-    if "RESEND_API_KEY" in creds:
-        return creds["RESEND_API_KEY"]
 
-    raise RuntimeError(
-        "RESEND_API_KEY not found. Set it in the environment or in "
-        f"{CREDENTIALS_PATH}"
-    )
+def get_api_base() -> str:
+    """Get the API base URL from env/credentials or the public API."""
+    return get_config().api_base
 
 
 def get_default_from() -> str:
     """Get default sender from env/credentials or fallback."""
-    return os.environ.get("RESEND_FROM") or _load_credentials().get("RESEND_FROM", _FALLBACK_FROM)
+    return get_config().default_from
 
 
 def get_default_reply_to() -> str:
     """Get default reply-to from env/credentials or fallback."""
-    return os.environ.get("RESEND_REPLY_TO") or _load_credentials().get("RESEND_REPLY_TO", _FALLBACK_REPLY_TO)
+    return get_config().default_reply_to
 
 
 def get_default_signature() -> str:
     """Get default signature from env/credentials or fallback."""
-    return os.environ.get("RESEND_SIGNATURE") or _load_credentials().get("RESEND_SIGNATURE", _FALLBACK_SIGNATURE)
+    return get_config().signature
+
+
+def get_rate_limit() -> float:
+    """Get the client-side request rate (per second) from env/credentials or default."""
+    return get_config().rate_limit
+
+
+def get_pool_options() -> dict:
+    """Get HTTP connection pool settings as ResendClient keyword arguments."""
+    return get_config().pool_options
+
+
+def get_attachment_cache_bytes() -> int:
+    """Get the attachment cache size cap in bytes (0 means caching is off)."""
+    return get_config().attachment_cache_bytes
@@ -0,0 +1,226 @@
+"""Long-running daemon holding a warm client, and the thin proxy the CLI uses to reach it.
+
+The protocol is one JSON object per line over a Unix socket. A request is
+``{"op": ..., "args": [...], "kwargs": {...}, "key": ...}``; the answer is
+``{"ok": true, "result": ...}``, or for ``iter_*`` ops one ``{"item": ...}``
+line per item followed by ``{"ok": true}``. Failures are
+``{"ok": false, "error": ..., "status_code": ...}``.
+
+This module is imported on every CLI call that might use the daemon, so it
+must stay import-light: only the ``daemon`` command builds a real client.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from .attachments import FileAttachment
+from .config import API_BASE, CACHE_DIR
+from .errors import ResendError
+from .ops import OPS, invoke
+
+CONNECT_TIMEOUT = 0.5
+
+
+def daemon_path(profile: str | None = None) -> Path:
+    """Each credentials profile gets its own daemon socket."""
+    return CACHE_DIR / f"daemon-{profile or 'default'}.sock"
+
+
+def key_id(api_key: str, base_url: str = API_BASE) -> str:
+    """Identify an API key and the API it is used with, without sending the key over the socket."""
+    return hashlib.sha256(f"{api_key} {base_url.rstrip('/')}".encode()).hexdigest()[:16]
+
+
+def _encode(obj: Any) -> Any:
+    # Attachments travel as paths; the daemon runs on the same host and streams them itself.
+    if isinstance(obj, FileAttachment):
+        from .cache import CachedAttachment
+
+        if isinstance(obj, CachedAttachment):
+            source = str(obj.source) if obj.source is not None else None
+            return {"$attachment": "blob", "path": str(obj.path), "filename": obj.filename, "source": source}
+        return {"$attachment": "file", "path": str(obj.path), "filename": obj.filename}
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode(v) for v in obj]
+    return obj
+
+
+def _decode(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        kind = obj.get("$attachment")
+        if kind == "file":
+            return FileAttachment(obj["path"], obj["filename"])
+        if kind == "blob":
+            from .cache import CachedAttachment
+
+            source = obj.get("source")
+            return CachedAttachment(Path(obj["path"]), obj["filename"], Path(source) if source else None)
+        return {k: _decode(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    return obj
+
+
+def _write(wfile: IO[bytes], message: dict) -> None:
+    wfile.write(json.dumps(message).encode() + b"\n")
+    wfile.flush()
+
+
+class DaemonClient:
+    """Stands in for ResendClient by forwarding each call to the daemon.
+
+    Every call opens its own connection (cheap on a Unix socket), so one
+    DaemonClient can be shared by threads like the real client.
+    """
+
+    def __init__(self, path: Path, api_key: str, base_url: str = API_BASE):
+        self.path = Path(path)
+        self.key = key_id(api_key, base_url)
+
+    def _request(self, op: str, *args: Any, **kwargs: Any) -> Iterator[dict]:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self.path))
+            with sock.makefile("rwb") as f:
+                _write(f, {"op": op, "args": _encode(args), "kwargs": _encode(kwargs), "key": self.key})
+                for line in f:
+                    message = json.loads(line)
+                    if "item" not in message:
+                        if not message.get("ok"):
+                            if message.get("status_code"):
+                                raise ResendError(message["status_code"], message["error"])
+                            raise RuntimeError(message["error"])
+                        yield message
+                        return
+                    yield message
+            raise RuntimeError("resend-cli daemon closed the connection")
+        finally:
+            sock.close()
+
+    def call(self, op: str, *args: Any, **kwargs: Any) -> Any:
+        return list(self._request(op, *args, **kwargs))[-1].get("result")
+
+    def stream(self, op: str, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        for message in self._request(op, *args, **kwargs):
+            if "item" in message:
+                yield message["item"]
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in OPS:
+            raise AttributeError(name)
+        if name.startswith("iter_"):
+            return lambda *args, **kwargs: self.stream(name, *args, **kwargs)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+
+def connect(path: Path, api_key: str, base_url: str = API_BASE) -> DaemonClient | None:
+    """Return a proxy if a daemon for this API key and base URL answers at ``path``, else None."""
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+        with sock.makefile("rwb") as f:
+            _write(f, {"op": "ping", "key": key_id(api_key, base_url)})
+            reply = json.loads(f.readline() or "{}")
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+    return DaemonClient(path, api_key, base_url) if reply.get("ok") else None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            for line in self.rfile:
+                self.server.dispatch(json.loads(line), self.wfile)  # type: ignore[attr-defined]
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the CLI went away mid-answer, e.g. piped into head
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves OPS on ``client`` to CLI processes connecting to ``path``.
+
+    Each connection gets a thread, and they all share ``client`` with its
+    connection pool and rate limiter. Requests must carry the key id of
+    ``api_key`` and ``base_url``, so a CLI configured for another account or
+    API never borrows this daemon. The socket is only accessible to its owner.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, client: Any, api_key: str, base_url: str = API_BASE):
+        self.path = Path(path)
+        self.client = client
+        self.key = key_id(api_key, base_url)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+            except OSError:
+                self.path.unlink()  # left behind by a daemon that died
+            else:
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+            finally:
+                probe.close()
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+    def dispatch(self, request: dict, wfile: IO[bytes]) -> None:
+        op = request.get("op")
+        if request.get("key") != self.key:
+            _write(wfile, {"ok": False, "error": "the daemon serves a different API key"})
+            return
+        if op == "ping":
+            _write(wfile, {"ok": True, "result": {"pid": os.getpid()}})
+            return
+        try:
+            result = invoke(self.client, op, _decode(request.get("args")), _decode(request.get("kwargs")))
+            if op.startswith("iter_"):
+                for item in result:
+                    _write(wfile, {"item": item})
+                result = None
+            _write(wfile, {"ok": True, "result": result})
+        except ResendError as e:
+            _write(wfile, {"ok": False, "error": e.message, "status_code": e.status_code})
+        except OSError as e:
+            if isinstance(e, (BrokenPipeError, ConnectionResetError)):
+                raise
+            _write(wfile, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            _write(wfile, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+
+def _terminate(signum: int, frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(path: Path, client: Any, api_key: str, base_url: str = API_BASE) -> None:
+    """Run the daemon in the foreground until interrupted or terminated."""
+    import signal
+
+    server = DaemonServer(path, client, api_key, base_url)
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
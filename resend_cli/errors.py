@@ -0,0 +1,10 @@
+"""Exception types, kept import-light so the CLI can catch them cheaply."""
+
+
+class ResendError(Exception):
+    """Raised on API errors."""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"Resend API error {status_code}: {message}")
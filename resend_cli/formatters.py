@@ -1,16 +1,48 @@
 """Rich output formatting for CLI results."""
 
+from itertools import islice
+from typing import Iterable
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
 console = Console()
 
+# Rows per printed table when streaming a list; matches the API page size so
+# each page is shown as soon as it has been fetched.
+STREAM_ROWS = 100
+
+
+def _print_streamed(title: str, columns: list[tuple[str, str | None]], fields: tuple[str, ...],
+                    items: Iterable[dict], empty: str) -> None:
+    """Print ``items`` as tables of up to STREAM_ROWS rows while they arrive.
+
+    Only the first table carries the title and header. Columns are sized by
+    ratio across the full width, so consecutive tables line up.
+    """
+    it = iter(items)
+    first = True
+    while chunk := list(islice(it, STREAM_ROWS)):
+        table = Table(title=title if first else None, show_header=first, expand=True)
+        for name, style in columns:
+            table.add_column(name, style=style, ratio=1)
+        for item in chunk:
+            table.add_row(*(str(item.get(f, "")) for f in fields))
+        console.print(table)
+        first = False
+    if first:
+        console.print(f"[dim]{empty}[/dim]")
+
 
 def print_email_sent(data: dict) -> None:
     console.print(Panel(f"[green]Email sent![/green]\nID: {data.get('id', 'N/A')}"))
 
 
+def print_email_queued(data: dict) -> None:
+    console.print(Panel(f"[green]Email queued[/green]\nItem: {data.get('id', 'N/A')}"))
+
+
 def print_email_status(data: dict) -> None:
     table = Table(title="Email Status")
     table.add_column("Field", style="bold")
@@ -23,23 +55,19 @@ def print_email_status(data: dict) -> None:
     console.print(table)
 
 
-def print_inbound_list(items: list) -> None:
-    if not items:
-        console.print("[dim]No inbound emails found.[/dim]")
+def print_status_change(data: dict) -> None:
+    if "error" in data:
+        console.print(f"[cyan]{data['id']}[/cyan]  [red]error[/red]  {data['error']}")
         return
-    table = Table(title="Inbound Emails")
-    table.add_column("ID", style="cyan")
-    table.add_column("From")
-    table.add_column("Subject")
-    table.add_column("Date")
-    for item in items:
-        table.add_row(
-            str(item.get("id", "")),
-            str(item.get("from", "")),
-            str(item.get("subject", "")),
-            str(item.get("created_at", "")),
-        )
-    console.print(table)
+    to = data.get("to", "")
+    if isinstance(to, list):
+        to = ", ".join(to)
+    console.print(f"[cyan]{data.get('id')}[/cyan]  [bold]{data.get('last_event')}[/bold]  {to}  {data.get('subject', '')}")
+
+
+def print_inbound_list(items: Iterable[dict]) -> None:
+    _print_streamed("Inbound Emails", [("ID", "cyan"), ("From", None), ("Subject", None), ("Date", None)],
+                    ("id", "from", "subject", "created_at"), items, "No inbound emails found.")
 
 
 def print_inbound_detail(data: dict) -> None:
@@ -54,37 +82,17 @@ def print_inbound_detail(data: dict) -> None:
     console.print(table)
 
 
-def print_domains(items: list) -> None:
-    if not items:
-        console.print("[dim]No domains found.[/dim]")
-        return
-    table = Table(title="Domains")
-    table.add_column("ID", style="cyan")
-    table.add_column("Name")
-    table.add_column("Status")
-    for item in items:
-        table.add_row(
-            str(item.get("id", "")),
-            str(item.get("name", "")),
-            str(item.get("status", "")),
-        )
-    console.print(table)
+def print_domains(items: Iterable[dict]) -> None:
+    _print_streamed("Domains", [("ID", "cyan"), ("Name", None), ("Status", None)],
+                    ("id", "name", "status"), items, "No domains found.")
 
 
 def print_domain_verified(data: dict) -> None:
     console.print(Panel(f"[green]Domain verification initiated[/green]\nID: {data.get('id', 'N/A') if data else 'N/A'}"))
 
 
-def print_audiences(items: list) -> None:
-    if not items:
-        console.print("[dim]No audiences found.[/dim]")
-        return
-    table = Table(title="Audiences")
-    table.add_column("ID", style="cyan")
-    table.add_column("Name")
-    for item in items:
-        table.add_row(str(item.get("id", "")), str(item.get("name", "")))
-    console.print(table)
+def print_audiences(items: Iterable[dict]) -> None:
+    _print_streamed("Audiences", [("ID", "cyan"), ("Name", None)], ("id", "name"), items, "No audiences found.")
 
 
 def print_audience_created(data: dict) -> None:
@@ -95,22 +103,17 @@ def print_audience_deleted(data: dict) -> None:
     console.print(Panel("[green]Audience deleted.[/green]"))
 
 
-def print_contacts(items: list) -> None:
-    if not items:
-        console.print("[dim]No contacts found.[/dim]")
-        return
-    table = Table(title="Contacts")
-    table.add_column("ID", style="cyan")
-    table.add_column("Email")
-    table.add_column("First Name")
-    table.add_column("Last Name")
-    for item in items:
-        table.add_row(
-            str(item.get("id", "")),
-            str(item.get("email", "")),
-            str(item.get("first_name", "")),
-            str(item.get("last_name", "")),
-        )
+def print_contacts(items: Iterable[dict]) -> None:
+    _print_streamed("Contacts", [("ID", "cyan"), ("Email", None), ("First Name", None), ("Last Name", None)],
+                    ("id", "email", "first_name", "last_name"), items, "No contacts found.")
+
+
+def print_contact(data: dict) -> None:
+    table = Table(title="Contact")
+    table.add_column("Field", style="bold")
+    table.add_column("Value")
+    for key in ("id", "email", "first_name", "last_name", "unsubscribed", "created_at"):
+        table.add_row(key, str(data.get(key, "N/A")))
     console.print(table)
 
 
@@ -122,6 +125,17 @@ def print_contact_deleted(data: dict) -> None:
     console.print(Panel("[green]Contact deleted.[/green]"))
 
 
+def print_sync_summary(stats: dict) -> None:
+    console.print(Panel(f"[green]Sync complete[/green]\nAudiences: {stats['audiences']}\n"
+                        f"Contacts: {stats['contacts']}\nRemoved: {stats['removed']}"))
+
+
+def print_reconcile_summary(stats: dict, dry_run: bool = False) -> None:
+    title = "[yellow]DRY RUN[/yellow]" if dry_run else "[green]Reconciled[/green]"
+    lines = [f"{key.capitalize()}: {value}" for key, value in stats.items()]
+    console.print(Panel("\n".join(lines), title=title))
+
+
 def print_dry_run(payload: dict) -> None:
     import json
     console.print(Panel(json.dumps(payload, indent=2), title="[yellow]DRY RUN[/yellow]"))
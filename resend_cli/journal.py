@@ -0,0 +1,161 @@
+"""Crash-safe journal of sends, so an interrupted run can be resumed without duplicates."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from .attachments import FileAttachment
+from .cache import CachedAttachment
+from .config import CACHE_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    nonce TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_source ON runs (source, id);
+CREATE TABLE IF NOT EXISTS messages (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    seq INTEGER NOT NULL,
+    payload_hash TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    email_id TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS messages_by_key ON messages (run_id, idempotency_key);
+"""
+
+PLANNED, SENT, FAILED = "planned", "sent", "failed"
+# Finished runs are kept this long (seconds) for --resume to find, then pruned.
+RETENTION = 30 * 24 * 3600
+
+
+def journal_path(profile: str | None = None) -> Path:
+    """Each credentials profile gets its own journal."""
+    return CACHE_DIR / f"journal-{profile or 'default'}.sqlite3"
+
+
+def payload_hash(payload: dict) -> str:
+    """SHA-256 of the payload as canonical JSON, without reading attachment content.
+
+    A cached attachment counts by its blob's name, the hash of its content; a
+    plain file attachment by its path, size and mtime, like the cache index.
+    """
+    h = hashlib.sha256()
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, CachedAttachment):
+            return {"filename": obj.filename, "sha256": obj.path.stem}
+        if isinstance(obj, FileAttachment):
+            st = obj.path.stat()
+            return {"filename": obj.filename, "path": str(obj.path.resolve()), "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns}
+        raise TypeError(f"cannot hash {type(obj).__name__}")
+
+    h.update(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=default).encode())
+    return h.hexdigest()
+
+
+class Run:
+    """One send run's rows in the journal, numbered by ``seq``.
+
+    Every request's idempotency key is derived from the run's random nonce and
+    the rows (seq and payload hash) it carries, and is recorded as ``planned``
+    before the request goes out. A resumed run resends unfinished rows in
+    their original groups under the same key, so the API drops any request
+    that had in fact gone through before the crash.
+    """
+
+    def __init__(self, db: sqlite3.Connection, run_id: int, nonce: str):
+        self.db = db
+        self.id = run_id
+        self.nonce = nonce
+        self.skipped = 0
+
+    def entry(self, seq: int) -> sqlite3.Row | None:
+        return self.db.execute("SELECT * FROM messages WHERE run_id = ? AND seq = ?", (self.id, seq)).fetchone()
+
+    def key_for(self, rows: Iterable[tuple[int, str]]) -> str:
+        """Derive the idempotency key for a request carrying ``(seq, payload_hash)`` rows."""
+        material = self.nonce + "".join(f":{seq}/{digest}" for seq, digest in rows)
+        return "resend-cli-" + hashlib.sha256(material.encode()).hexdigest()[:40]
+
+    def plan(self, rows: Iterable[tuple[int, str]], key: str) -> None:
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO messages (run_id, seq, payload_hash, idempotency_key, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(run_id, seq) DO UPDATE SET "
+                "idempotency_key = excluded.idempotency_key, updated_at = excluded.updated_at",
+                [(self.id, seq, digest, key, PLANNED, now) for seq, digest in rows])
+
+    def sent(self, seqs: Iterable[int], email_ids: Iterable[str | None]) -> None:
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "UPDATE messages SET status = ?, email_id = ?, error = NULL, updated_at = ? "
+                "WHERE run_id = ? AND seq = ?",
+                [(SENT, email_id, now, self.id, seq) for seq, email_id in zip(seqs, email_ids)])
+
+    def failed(self, seqs: Iterable[int], error: str) -> None:
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "UPDATE messages SET status = ?, error = ?, updated_at = ? WHERE run_id = ? AND seq = ?",
+                [(FAILED, error, now, self.id, seq) for seq in seqs])
+
+    def finish(self) -> None:
+        with self.db:
+            self.db.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), self.id))
+
+    def group_size(self, key: str) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM messages WHERE run_id = ? AND idempotency_key = ?",
+                               (self.id, key)).fetchone()[0]
+
+
+class Journal:
+    """SQLite (WAL) record of every message sent: payload hash, key, status and id."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        # WAL with the default synchronous=FULL: a commit (the "planned" record
+        # in particular) is on disk before the request it describes is sent.
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def prune(self, max_age: float = RETENTION) -> int:
+        """Delete runs that finished more than ``max_age`` seconds ago; returns how many."""
+        cutoff = time.time() - max_age
+        with self.db:
+            self.db.execute("DELETE FROM messages WHERE run_id IN "
+                            "(SELECT id FROM runs WHERE finished_at < ?)", (cutoff,))
+            return self.db.execute("DELETE FROM runs WHERE finished_at < ?", (cutoff,)).rowcount
+
+    def start(self, source: str, resume: bool = False) -> Run:
+        """Begin a run for ``source``, or with ``resume`` continue its latest one."""
+        if resume:
+            row = self.db.execute("SELECT id, nonce FROM runs WHERE source = ? ORDER BY id DESC LIMIT 1",
+                                  (source,)).fetchone()
+            if row is not None:
+                return Run(self.db, row["id"], row["nonce"])
+        nonce = os.urandom(16).hex()
+        with self.db:
+            cur = self.db.execute("INSERT INTO runs (source, nonce, started_at) VALUES (?, ?, ?)",
+                                  (source, nonce, time.time()))
+        return Run(self.db, cur.lastrowid, nonce)
@@ -0,0 +1,154 @@
+"""Per-request counters and latency histograms, summarized for --stats or exported for Prometheus."""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Upper bounds (seconds) of the request latency histogram buckets.
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Path segments that name a resource; any other segment is an id.
+_STATIC_SEGMENTS = frozenset({"emails", "batch", "receiving", "domains", "verify", "audiences", "contacts"})
+_PREFIX = "resend_cli"
+
+
+def endpoint(path: str) -> str:
+    """Collapse ids out of an API path: ``/audiences/abc/contacts`` -> ``/audiences/{id}/contacts``."""
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    return "/" + "/".join(p if p in _STATIC_SEGMENTS else "{id}" for p in parts)
+
+
+class _Series:
+    __slots__ = ("count", "total", "worst", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+
+class Metrics:
+    """Thread-safe registry filled in by ResendClient.
+
+    * ``requests``: attempts by (endpoint, method, status), where status is
+      the HTTP status or ``"error"`` for connection errors and timeouts.
+    * ``latency``: a histogram of attempt durations by (endpoint, method).
+    * ``retries`` and ``retry_sleep``: retries and seconds slept before them,
+      by (endpoint, method).
+    * ``ratelimit_wait``: seconds spent waiting for the client-side limiter.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.latency: dict[tuple[str, str], _Series] = {}
+        self.retries: dict[tuple[str, str], int] = {}
+        self.retry_sleep: dict[tuple[str, str], float] = {}
+        self.ratelimit_wait = 0.0
+
+    def observe(self, path: str, method: str, status: int | None, seconds: float) -> None:
+        key = (endpoint(path), method.upper())
+        with self._lock:
+            series = self.latency.get(key)
+            if series is None:
+                series = self.latency[key] = _Series()
+            series.observe(seconds)
+            full = (*key, str(status) if status is not None else "error")
+            self.requests[full] = self.requests.get(full, 0) + 1
+
+    def retry(self, path: str, method: str, slept: float) -> None:
+        key = (endpoint(path), method.upper())
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+            self.retry_sleep[key] = self.retry_sleep.get(key, 0.0) + slept
+
+    def rate_limited(self, slept: float) -> None:
+        with self._lock:
+            self.ratelimit_wait += slept
+
+    def summary(self) -> str:
+        """Plain-text report for the end of a run."""
+        with self._lock:
+            if not self.latency:
+                return "No API requests made."
+            lines = [f"{'endpoint':<34}{'method':<8}{'count':>7}{'avg ms':>9}{'max ms':>9}  statuses"]
+            for (path, method), series in sorted(self.latency.items()):
+                statuses = ", ".join(f"{status}: {n}" for (p, m, status), n in sorted(self.requests.items())
+                                     if (p, m) == (path, method))
+                lines.append(f"{path:<34}{method:<8}{series.count:>7}{series.total / series.count * 1000:>9.1f}"
+                             f"{series.worst * 1000:>9.1f}  {statuses}")
+            retries = sum(self.retries.values())
+            throttled = sum(n for (_, _, status), n in self.requests.items() if status == "429")
+            lines.append(f"429 responses: {throttled}, retries: {retries} "
+                         f"(slept {sum(self.retry_sleep.values()):.2f}s), "
+                         f"rate limiter waits: {self.ratelimit_wait:.2f}s")
+            return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """The metrics in Prometheus text exposition format."""
+        def labels(**kv: str) -> str:
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in kv.items()) + "}"
+
+        out = []
+        with self._lock:
+            out += [f"# HELP {_PREFIX}_requests_total API request attempts by endpoint, method and status.",
+                    f"# TYPE {_PREFIX}_requests_total counter"]
+            for (path, method, status), n in sorted(self.requests.items()):
+                out.append(f"{_PREFIX}_requests_total{labels(endpoint=path, method=method, status=status)} {n}")
+            out += [f"# HELP {_PREFIX}_request_duration_seconds API request attempt latency.",
+                    f"# TYPE {_PREFIX}_request_duration_seconds histogram"]
+            for (path, method), series in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS, series.buckets):
+                    cumulative += n
+                    le = labels(endpoint=path, method=method, le=repr(bound))
+                    out.append(f"{_PREFIX}_request_duration_seconds_bucket{le} {cumulative}")
+                le = labels(endpoint=path, method=method, le="+Inf")
+                out.append(f"{_PREFIX}_request_duration_seconds_bucket{le} {series.count}")
+                out.append(f"{_PREFIX}_request_duration_seconds_sum{labels(endpoint=path, method=method)} "
+                           f"{series.total}")
+                out.append(f"{_PREFIX}_request_duration_seconds_count{labels(endpoint=path, method=method)} "
+                           f"{series.count}")
+            out += [f"# HELP {_PREFIX}_retries_total Retried request attempts.",
+                    f"# TYPE {_PREFIX}_retries_total counter"]
+            for (path, method), n in sorted(self.retries.items()):
+                out.append(f"{_PREFIX}_retries_total{labels(endpoint=path, method=method)} {n}")
+            out += [f"# HELP {_PREFIX}_retry_sleep_seconds_total Seconds slept before retries.",
+                    f"# TYPE {_PREFIX}_retry_sleep_seconds_total counter"]
+            for (path, method), seconds in sorted(self.retry_sleep.items()):
+                out.append(f"{_PREFIX}_retry_sleep_seconds_total{labels(endpoint=path, method=method)} {seconds}")
+            out += [f"# HELP {_PREFIX}_ratelimit_wait_seconds_total Seconds spent waiting for the client-side "
+                    "rate limiter.",
+                    f"# TYPE {_PREFIX}_ratelimit_wait_seconds_total counter",
+                    f"{_PREFIX}_ratelimit_wait_seconds_total {self.ratelimit_wait}",
+                    f"# HELP {_PREFIX}_last_run_timestamp_seconds When the run that wrote this file started.",
+                    f"# TYPE {_PREFIX}_last_run_timestamp_seconds gauge",
+                    f"{_PREFIX}_last_run_timestamp_seconds {self.started}"]
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self, path: str | Path) -> None:
+        """Write ``prometheus()`` for node-exporter's textfile collector, atomically."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.prometheus())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+
+
+def _escape(value: str) -> str:
+    return re.sub(r'(["\\\n])', lambda m: "\\n" if m.group(1) == "\n" else "\\" + m.group(1), value)
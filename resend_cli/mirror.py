@@ -0,0 +1,171 @@
+"""Local SQLite mirror of audiences and contacts."""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .bulk import chunked
+from .config import CACHE_DIR, PAGE_SIZE_MAX
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audiences (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    audience_id TEXT NOT NULL,
+    email TEXT NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    unsubscribed INTEGER,
+    created_at TEXT,
+    generation INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_by_email ON contacts (audience_id, email COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS sync_state (
+    audience_id TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    cursor TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL
+);
+"""
+
+CONTACT_COLUMNS = ("id", "email", "first_name", "last_name", "unsubscribed", "created_at")
+
+
+def mirror_path(profile: str | None = None) -> Path:
+    """Each credentials profile gets its own mirror database."""
+    return CACHE_DIR / f"mirror-{profile or 'default'}.sqlite3"
+
+
+class Mirror:
+    """Audiences and contacts copied from the API into SQLite.
+
+    ``sync`` walks each audience's contacts page by page, upserting every page
+    in its own transaction and recording the cursor, so an interrupted sync
+    resumes where it stopped. Each pass stamps rows with a new generation;
+    once an audience has been read to the end, rows from older generations
+    were deleted upstream and are dropped. Local adds and removes are written
+    through, keeping the mirror current between syncs.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    # --- Sync ---
+
+    def sync(self, client: Any, audience_ids: Iterable[str] | None = None) -> dict:
+        """Mirror the given audiences (all of them by default). Returns counts."""
+        stats = {"audiences": 0, "contacts": 0, "removed": 0}
+        if audience_ids is None:
+            audiences = list(client.iter_audiences())
+            audience_ids = [a["id"] for a in audiences]
+            current = set(audience_ids)
+            gone = [(r["id"],) for r in self.db.execute("SELECT id FROM audiences") if r["id"] not in current]
+            with self.db:
+                self.db.executemany(
+                    "INSERT INTO audiences (id, name, created_at) VALUES (:id, :name, :created_at) "
+                    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, created_at = excluded.created_at",
+                    [{"name": None, "created_at": None, **a} for a in audiences])
+                for table, column in (("audiences", "id"), ("contacts", "audience_id"), ("sync_state", "audience_id")):
+                    self.db.executemany(f"DELETE FROM {table} WHERE {column} = ?", gone)
+        for audience_id in audience_ids:
+            contacts, removed = self.sync_audience(client, audience_id)
+            stats["audiences"] += 1
+            stats["contacts"] += contacts
+            stats["removed"] += removed
+        return stats
+
+    def sync_audience(self, client: Any, audience_id: str) -> tuple[int, int]:
+        """Sync one audience's contacts. Returns (contacts seen, contacts removed)."""
+        state = self.db.execute("SELECT generation, cursor, complete FROM sync_state WHERE audience_id = ?",
+                                (audience_id,)).fetchone()
+        if state is None or state["complete"]:
+            generation = (state["generation"] if state else 0) + 1
+            cursor = None
+        else:
+            generation, cursor = state["generation"], state["cursor"]
+        with self.db:
+            self.db.execute(
+                "INSERT INTO sync_state (audience_id, generation, cursor, complete) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT(audience_id) DO UPDATE SET generation = excluded.generation, "
+                "cursor = excluded.cursor, complete = 0",
+                (audience_id, generation, cursor))
+        seen = 0
+        for page in chunked(client.iter_contacts(audience_id, after=cursor), PAGE_SIZE_MAX):
+            with self.db:
+                self._upsert(audience_id, page, generation)
+                self.db.execute("UPDATE sync_state SET cursor = ? WHERE audience_id = ?",
+                                (page[-1]["id"], audience_id))
+            seen += len(page)
+        with self.db:
+            removed = self.db.execute("DELETE FROM contacts WHERE audience_id = ? AND generation < ?",
+                                      (audience_id, generation)).rowcount
+            self.db.execute("UPDATE sync_state SET cursor = NULL, complete = 1, synced_at = ? "
+                            "WHERE audience_id = ?", (time.time(), audience_id))
+        return seen, removed
+
+    def _upsert(self, audience_id: str, contacts: list[dict], generation: int) -> None:
+        rows = [{**dict.fromkeys(CONTACT_COLUMNS), **c, "audience_id": audience_id, "generation": generation}
+                for c in contacts]
+        self.db.executemany(
+            "INSERT INTO contacts (id, audience_id, email, first_name, last_name, unsubscribed, created_at, generation) "
+            "VALUES (:id, :audience_id, :email, :first_name, :last_name, :unsubscribed, :created_at, :generation) "
+            "ON CONFLICT(id) DO UPDATE SET audience_id = excluded.audience_id, email = excluded.email, "
+            "first_name = excluded.first_name, last_name = excluded.last_name, "
+            "unsubscribed = excluded.unsubscribed, created_at = excluded.created_at, "
+            "generation = excluded.generation",
+            rows)
+
+    # --- Queries ---
+
+    def synced_at(self, audience_id: str) -> float | None:
+        row = self.db.execute("SELECT synced_at FROM sync_state WHERE audience_id = ? AND complete = 1",
+                              (audience_id,)).fetchone()
+        return row["synced_at"] if row else None
+
+    def contacts(self, audience_id: str) -> Iterator[dict]:
+        cur = self.db.execute(f"SELECT {', '.join(CONTACT_COLUMNS)} FROM contacts WHERE audience_id = ? "
+                              "ORDER BY created_at, id", (audience_id,))
+        for row in cur:
+            yield self._contact(row)
+
+    def find_contact(self, audience_id: str, email: str) -> dict | None:
+        row = self.db.execute(f"SELECT {', '.join(CONTACT_COLUMNS)} FROM contacts "
+                              "WHERE audience_id = ? AND email = ? COLLATE NOCASE", (audience_id, email)).fetchone()
+        return self._contact(row) if row else None
+
+    @staticmethod
+    def _contact(row: sqlite3.Row) -> dict:
+        contact = dict(row)
+        if contact["unsubscribed"] is not None:
+            contact["unsubscribed"] = bool(contact["unsubscribed"])
+        return contact
+
+    # --- Write-through ---
+
+    def add_contact(self, audience_id: str, contact: dict) -> None:
+        """Record a contact created through the API, if its audience is mirrored."""
+        state = self.db.execute("SELECT generation FROM sync_state WHERE audience_id = ?",
+                                (audience_id,)).fetchone()
+        if state is not None and contact.get("id") and contact.get("email"):
+            with self.db:
+                self._upsert(audience_id, [contact], state["generation"])
+
+    def remove_contact(self, audience_id: str, contact: str) -> None:
+        """Forget a contact given by id or email."""
+        with self.db:
+            self.db.execute("DELETE FROM contacts WHERE audience_id = ? AND (id = ? OR email = ? COLLATE NOCASE)",
+                            (audience_id, contact, contact))
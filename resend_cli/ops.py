@@ -0,0 +1,19 @@
+"""Client operations that can be invoked by name (by the daemon and by ``exec``)."""
+
+from typing import Any
+
+# ResendClient methods that may be called by name; each takes and returns JSON-able values.
+OPS = frozenset({
+    "send_email", "send_batch", "get_email",
+    "iter_inbound", "list_inbound", "get_inbound",
+    "iter_domains", "list_domains", "verify_domain",
+    "iter_audiences", "list_audiences", "create_audience", "delete_audience",
+    "iter_contacts", "list_contacts", "get_contact", "create_contact", "update_contact", "delete_contact",
+})
+
+
+def invoke(client: Any, op: str, args: list | None = None, kwargs: dict | None = None) -> Any:
+    """Call ``client.<op>(*args, **kwargs)``, refusing anything not in OPS."""
+    if op not in OPS:
+        raise ValueError(f"unknown operation {op!r}")
+    return getattr(client, op)(*(args or []), **(kwargs or {}))
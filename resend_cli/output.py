@@ -0,0 +1,69 @@
+"""Machine-readable output (json, jsonl, csv) streamed straight to stdout."""
+
+import csv
+import json
+import sys
+from typing import IO, Any, Iterable
+
+FORMATS = ("table", "json", "jsonl", "csv")
+# Flush after this many rows so consumers see progress without a syscall per row.
+FLUSH_ROWS = 100
+
+# CSV columns for list commands; json/jsonl always emit full records.
+INBOUND_FIELDS = ("id", "from", "to", "subject", "created_at")
+DOMAIN_FIELDS = ("id", "name", "status", "region", "created_at")
+AUDIENCE_FIELDS = ("id", "name", "created_at")
+CONTACT_FIELDS = ("id", "email", "first_name", "last_name", "unsubscribed", "created_at")
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(_cell(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value)
+
+
+def write(data: dict | Iterable[dict] | None, fmt: str, fields: tuple[str, ...] | None = None,
+          out: IO[str] | None = None) -> None:
+    """Write a single record (a dict) or a stream of records in ``fmt``.
+
+    Streams are consumed lazily and never collected: ``json`` emits an array
+    element by element, ``jsonl`` one object per line, ``csv`` a header then one
+    row per record. CSV columns are ``fields``, or the first record's keys.
+    """
+    out = out or sys.stdout
+    single = data is None or isinstance(data, dict)
+    records: Iterable[dict] = [data or {}] if single else data  # type: ignore[list-item]
+
+    if fmt == "json" and single:
+        out.write(json.dumps(data or {}) + "\n")
+        out.flush()
+        return
+
+    writer = None
+    count = 0
+    if fmt == "json":
+        out.write("[")
+    for record in records:
+        if fmt == "json":
+            out.write(("," if count else "") + "\n" + json.dumps(record))
+        elif fmt == "jsonl":
+            out.write(json.dumps(record) + "\n")
+        elif fmt == "csv":
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(fields or record), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow({k: _cell(v) for k, v in record.items()})
+        else:
+            raise ValueError(f"unknown output format {fmt!r}")
+        count += 1
+        if count % FLUSH_ROWS == 0:
+            out.flush()
+    if fmt == "json":
+        out.write("\n]\n" if count else "]\n")
+    elif fmt == "csv" and writer is None and fields:
+        csv.writer(out).writerow(fields)
+    out.flush()
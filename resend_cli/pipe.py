@@ -0,0 +1,82 @@
+"""``resend-cli exec``: run a stream of JSONL operation records in one process."""
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from .errors import ResendError
+from .ops import invoke
+
+
+def parse_ops(lines: Iterable[str]) -> Iterator[dict]:
+    """Yield one record per non-blank line; unparseable lines become ``{"error": ...}`` records.
+
+    Each record keeps its ``line`` number, and records without an ``id`` get
+    the line number as their correlation id.
+    """
+    for n, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            yield {"id": n, "line": n, "error": f"invalid record: {e}"}
+            continue
+        record.setdefault("id", n)
+        record["line"] = n
+        yield record
+
+
+def run_ops(client: Any, records: Iterable[dict], out: IO[str], workers: int = 4,
+            prepare: Callable[[dict], dict] | None = None) -> tuple[int, int]:
+    """Run each ``{"id", "op", "args", "kwargs"}`` record and write a JSONL result per record.
+
+    Results are written in completion order as ``{"id", "ok": true, "result"}``
+    or ``{"id", "ok": false, "error"[, "status_code"]}``; ``iter_*`` results are
+    collected into a list. Each result is written and flushed as soon as its
+    operation finishes, even while the next input line has not arrived, so
+    ``exec`` works as a coprocess. At most ``2 * workers`` records are in
+    flight. ``prepare`` rewrites each record before it runs (the CLI uses it
+    to apply sender defaults to ``send_email`` payloads). Returns
+    ``(succeeded, failed)``.
+    """
+    counts = [0, 0]
+    lock = threading.Lock()
+    slots = threading.Semaphore(workers * 2)
+
+    def run(record: dict) -> Any:
+        if "error" in record:
+            raise ValueError(record["error"])
+        if prepare is not None:
+            record = prepare(record)
+        args = record.get("args", [])
+        if not isinstance(args, list):
+            args = [args]
+        result = invoke(client, record.get("op", ""), args, record.get("kwargs"))
+        return list(result) if str(record.get("op")).startswith("iter_") else result
+
+    def report(record: dict, fut: Future) -> None:
+        exc = fut.exception()
+        if exc is None:
+            line = {"id": record.get("id"), "ok": True, "result": fut.result()}
+        else:
+            line = {"id": record.get("id"), "ok": False, "error": str(exc)}
+            if isinstance(exc, ResendError):
+                line.update(error=exc.message, status_code=exc.status_code)
+        try:
+            with lock:
+                out.write(json.dumps(line, default=str) + "\n")
+                out.flush()
+                counts[exc is not None] += 1
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for record in records:
+            slots.acquire()
+            pool.submit(run, record).add_done_callback(lambda fut, record=record: report(record, fut))
+    return counts[0], counts[1]
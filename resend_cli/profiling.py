@@ -0,0 +1,103 @@
+"""Opt-in timing spans around the phases of a command (build, encode, serialize, http, render).
+
+Code marks a phase with ``with span("http"):``. Until ``start()`` is called
+(by --timings or --timings-out) ``span`` returns a shared no-op context
+manager, so the hooks cost one global lookup each.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL = _NullSpan()
+
+
+class Profiler:
+    """Collects span timings; with ``trace`` it also keeps every span for a Chrome trace."""
+
+    def __init__(self, trace: bool = False):
+        self._lock = threading.Lock()
+        self.origin = time.perf_counter_ns()
+        self.totals: dict[str, list[int]] = {}  # name -> [count, total ns, worst ns]
+        self.events: list[tuple[str, int, int, int]] | None = [] if trace else None
+
+    def record(self, name: str, start: int, end: int) -> None:
+        elapsed = end - start
+        with self._lock:
+            totals = self.totals.get(name)
+            if totals is None:
+                totals = self.totals[name] = [0, 0, 0]
+            totals[0] += 1
+            totals[1] += elapsed
+            totals[2] = max(totals[2], elapsed)
+            if self.events is not None:
+                self.events.append((name, start, elapsed, threading.get_ident()))
+
+    def summary(self) -> str:
+        """Plain-text table of time per phase. Nested phases are also counted in their parent."""
+        wall = (time.perf_counter_ns() - self.origin) / 1e6
+        lines = [f"{'phase':<12}{'count':>7}{'total ms':>11}{'max ms':>10}"]
+        with self._lock:
+            for name, (count, total, worst) in sorted(self.totals.items(), key=lambda kv: -kv[1][1]):
+                lines.append(f"{name:<12}{count:>7}{total / 1e6:>11.1f}{worst / 1e6:>10.1f}")
+        lines.append(f"{'wall':<12}{'':>7}{wall:>11.1f}")
+        return "\n".join(lines)
+
+    def write_trace(self, path: str | Path) -> None:
+        """Write the recorded spans as Chrome trace events (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self._lock:
+            events = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                       "ts": (start - self.origin) / 1e3, "dur": elapsed / 1e3}
+                      for name, start, elapsed, tid in self.events or ()]
+        Path(path).write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: Profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+
+
+_active: Profiler | None = None
+
+
+def span(name: str) -> Any:
+    """Context manager timing the phase ``name`` while profiling is on."""
+    profiler = _active
+    if profiler is None:
+        return _NULL
+    return _Span(profiler, name)
+
+
+def start(trace: bool = False) -> Profiler:
+    global _active
+    _active = Profiler(trace)
+    return _active
+
+
+def stop() -> None:
+    global _active
+    _active = None
@@ -0,0 +1,82 @@
+"""Client-side token bucket shared across threads and processes."""
+
+import hashlib
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+from .config import CACHE_DIR
+
+_STATE = struct.Struct("dd")  # tokens, wall-clock timestamp of last update
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``burst``.
+
+    With a ``state_path`` the bucket lives in that file and is updated under an
+    exclusive ``flock``, so every process pointing at the same file draws from
+    one budget. Without it (or on platforms without ``fcntl``) the bucket is
+    shared by the threads of this process only.
+
+    ``acquire`` reserves a token even when the bucket is empty and sleeps for
+    the deficit, so concurrent callers queue up instead of spinning on the lock.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None, state_path: Path | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._stamp = time.time()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is due. Returns the seconds slept."""
+        with self._lock:
+            if self.state_path is not None and fcntl is not None:
+                wait = self._reserve_shared()
+            else:
+                self._tokens, self._stamp, wait = self._reserve(self._tokens, self._stamp)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _reserve(self, tokens: float, stamp: float) -> tuple[float, float, float]:
+        now = time.time()
+        tokens = min(self.burst, tokens + max(0.0, now - stamp) * self.rate) - 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def _reserve_shared(self) -> float:
+        assert self.state_path is not None
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, _STATE.size, 0)
+            if len(raw) == _STATE.size:
+                tokens, stamp = _STATE.unpack(raw)
+            else:
+                tokens, stamp = self.burst, time.time()
+            tokens, stamp, wait = self._reserve(tokens, stamp)
+            os.pwrite(fd, _STATE.pack(tokens, stamp), 0)
+            return wait
+        finally:
+            os.close(fd)  # closing the descriptor releases the flock
+
+
+def bucket_for_key(api_key: str, rate: float) -> TokenBucket | None:
+    """Return a bucket shared by every process using ``api_key``, or None if ``rate`` is 0."""
+    if rate <= 0:
+        return None
+    digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return TokenBucket(rate, state_path=CACHE_DIR / f"ratelimit-{digest}.state")
@@ -0,0 +1,162 @@
+"""Diff a source-of-truth contact list against an audience and apply the difference."""
+
+import hashlib
+import json
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from .bulk import CONTACT_KEYS, bounded_map, row_to_contact
+from .errors import ResendError
+
+# Removing more than this share of an audience (and more than MASS_REMOVE_MIN
+# contacts) needs allow_mass_remove: it usually means a bad or truncated source.
+MASS_REMOVE_SHARE = 0.1
+MASS_REMOVE_MIN = 10
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def _email_key(email: str) -> int:
+    return _digest(email.strip().lower())
+
+
+def _normalize(key: str, value: Any) -> Any:
+    if key == "unsubscribed":
+        return bool(value)
+    return str(value or "").strip()
+
+
+def _fields_digest(contact: dict, keys: tuple[str, ...]) -> int:
+    return _digest(json.dumps([_normalize(k, contact.get(k)) for k in keys]))
+
+
+def _mask(contact: dict) -> int:
+    return sum(1 << i for i, k in enumerate(CONTACT_KEYS) if k in contact)
+
+
+def _keys(mask: int) -> tuple[str, ...]:
+    return tuple(k for i, k in enumerate(CONTACT_KEYS) if mask & (1 << i))
+
+
+class Reconciliation:
+    """The changes that make an audience match ``source``.
+
+    Both sides are streamed. The source is held as one pair of 64-bit BLAKE2
+    digests per contact (email, and the fields the row sets), so millions of
+    rows fit in memory; full rows are only re-read, by calling ``source``
+    again, when the actions are generated. Blank source fields mean "leave
+    as is", so a file without an ``unsubscribed`` column never resubscribes
+    anyone. The first row for an email wins.
+
+    A source without an ``email`` column, or without a single email, raises
+    ValueError before the audience is read: planned against it, every
+    contact would be removed.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[dict]], remote: Iterable[dict]):
+        self.source = source
+        # email digest -> (fields digest << 3) | mask of the fields the row sets
+        wanted: dict[int, int] = {}
+        rows = 0
+        has_column = False
+        for row in source():
+            rows += 1
+            has_column = has_column or "email" in row
+            contact = row_to_contact(row)
+            if contact["email"]:
+                mask = _mask(contact)
+                wanted.setdefault(_email_key(contact["email"]), _fields_digest(contact, _keys(mask)) << 3 | mask)
+        if rows and not has_column:
+            raise ValueError("the source has no 'email' column (column names are case-sensitive)")
+        if not wanted:
+            raise ValueError("the source has no emails")
+        self.updates: dict[int, str] = {}
+        self.removes: list[dict] = []
+        self.unchanged = 0
+        self.remote_total = 0
+        for contact in remote:
+            self.remote_total += 1
+            key = _email_key(contact["email"])
+            packed = wanted.pop(key, None)
+            if packed is None:
+                self.removes.append({"id": contact["id"], "email": contact["email"]})
+            elif packed >> 3 != _fields_digest(contact, _keys(packed & 7)):
+                self.updates[key] = contact["id"]
+            else:
+                self.unchanged += 1
+        self.adds = set(wanted)
+
+    @property
+    def mass_remove(self) -> bool:
+        """Whether the plan removes more of the audience than MASS_REMOVE_SHARE allows."""
+        removes = len(self.removes)
+        return removes > MASS_REMOVE_MIN and removes > self.remote_total * MASS_REMOVE_SHARE
+
+    def summary(self) -> dict:
+        return {"add": len(self.adds), "update": len(self.updates),
+                "remove": len(self.removes), "unchanged": self.unchanged}
+
+    def actions(self) -> Iterator[tuple[str, str | None, dict]]:
+        """Yield ``(action, contact_id, contact)``: removes first, then adds and updates in source order."""
+        for contact in self.removes:
+            yield "remove", contact["id"], contact
+        adds, updates = set(self.adds), dict(self.updates)
+        for row in self.source():
+            contact = row_to_contact(row)
+            if not contact["email"]:
+                continue
+            key = _email_key(contact["email"])
+            if key in adds:
+                adds.discard(key)
+                yield "add", None, contact
+            elif key in updates:
+                yield "update", updates.pop(key), contact
+
+
+def apply(client: Any, audience_id: str, plan: Reconciliation, out: IO[str], workers: int = 4,
+          mirror: Any = None, allow_mass_remove: bool = False) -> dict:
+    """Run ``plan`` against the audience and write one JSONL result per action.
+
+    Successful changes are written through to ``mirror`` when given. A plan
+    that would remove a large share of the audience raises ValueError before
+    any change unless ``allow_mass_remove`` is set. Returns counts per action
+    plus ``failed``.
+    """
+    if plan.mass_remove and not allow_mass_remove:
+        raise ValueError(f"refusing to remove {len(plan.removes)} of {plan.remote_total} contacts; "
+                         "check the source, or pass --allow-mass-remove")
+    stats = {"add": 0, "update": 0, "remove": 0, "failed": 0}
+
+    def run(job: tuple[str, str | None, dict]) -> Any:
+        action, contact_id, contact = job
+        fields = {k: v for k, v in contact.items() if k != "email"}
+        if action == "add":
+            return client.create_contact(audience_id, contact["email"], **fields)
+        if action == "update":
+            return client.update_contact(audience_id, contact_id, **fields)
+        return client.delete_contact(audience_id, contact_id)
+
+    try:
+        for (action, contact_id, contact), fut in bounded_map(run, plan.actions(), workers=workers):
+            record: dict = {"action": action, "email": contact["email"]}
+            exc = fut.exception()
+            if exc is None:
+                contact_id = contact_id or (fut.result() or {}).get("id")
+                out.write(json.dumps({**record, "id": contact_id}) + "\n")
+                stats[action] += 1
+                if mirror is not None:
+                    if action == "remove":
+                        mirror.remove_contact(audience_id, contact_id)
+                    else:
+                        known = mirror.find_contact(audience_id, contact["email"]) or {}
+                        mirror.add_contact(audience_id, {**known, **contact, "id": contact_id})
+            else:
+                record["error"] = str(exc)
+                if isinstance(exc, ResendError):
+                    record.update(error=exc.message, status_code=exc.status_code)
+                out.write(json.dumps(record) + "\n")
+                stats["failed"] += 1
+    finally:
+        out.flush()
+    return stats
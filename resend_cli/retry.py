@@ -0,0 +1,103 @@
+"""Retry policy for ResendClient: capped exponential backoff with jitter."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Budget window for the daemon and spool worker, which run far longer than one job.
+LONG_RUNNING_BUDGET_WINDOW = 60.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given as delay-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a request.
+
+    * ``max_attempts`` counts the first try, so 4 means up to 3 retries.
+    * Backoff is "full jitter": a random delay up to
+      ``min(max_delay, base_delay * 2 ** (attempt - 1))``, so workers that
+      fail together do not retry together. A Retry-After header wins over the
+      computed delay (plus a little jitter), capped at ``max_delay``.
+    * ``budget`` caps the total retries made through this policy; one policy
+      per run means a flapping API cannot stretch a job indefinitely.
+      ``None`` disables the budget. A long-lived daemon or worker sets
+      ``budget_window`` so the budget refills every that many seconds.
+    * 429 responses are always retryable since the API did not process the
+      request. 5xx responses, connection errors and timeouts are retried only
+      for idempotent methods or requests that carry an ``Idempotency-Key``.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    budget: int | None = 100
+    budget_window: float | None = None
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    retries_used: int = field(default=0, init=False)
+    _window_start: float | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @staticmethod
+    def is_idempotent(method: str, headers: Mapping[str, str] | None = None) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return any(k.lower() == "idempotency-key" for k in (headers or {}))
+
+    def should_retry(self, attempt: int, method: str, headers: Mapping[str, str] | None = None,
+                     status: int | None = None) -> bool:
+        """Return True (and spend budget) if attempt number ``attempt`` may be retried.
+
+        ``status`` is the HTTP status, or None when the request raised a
+        connection error or timeout.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if status is not None and status not in RETRY_STATUSES:
+            return False
+        if status != 429 and not self.is_idempotent(method, headers):
+            return False
+        with self._lock:
+            now = self.clock()
+            if self.budget_window is not None and (self._window_start is None
+                                                   or now - self._window_start >= self.budget_window):
+                self._window_start = now
+                self.retries_used = 0
+            if self.budget is not None and self.retries_used >= self.budget:
+                return False
+            self.retries_used += 1
+        return True
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait before attempt ``attempt + 1``."""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after + random.uniform(0, self.base_delay))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def wait(self, attempt: int, retry_after: float | None = None) -> float:
+        seconds = self.delay(attempt, retry_after)
+        if seconds > 0:
+            self.sleep(seconds)
+        return seconds
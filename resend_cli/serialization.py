@@ -0,0 +1,37 @@
+"""JSON request bodies encoded straight to UTF-8 bytes, with orjson when it is installed.
+
+``pip install resend-cli[fast]`` pulls in orjson. Without it the stdlib
+encoder streams its output chunks into a bytes buffer, so the body is never
+also held as one big str.
+"""
+
+import io
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+# ASCII output keeps each chunk a 1-byte-per-char str; one non-ASCII character
+# would double the size of the large ones (HTML, base64 content) in memory.
+_encoder = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"), allow_nan=False)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes in one pass.
+
+    The stdlib fallback rejects NaN and infinity, as ``requests`` does for
+    ``json=``; orjson writes them as null.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. int keys or big ints; the stdlib handles those
+    buf = io.BytesIO()
+    for chunk in _encoder.iterencode(obj):
+        buf.write(chunk.encode())
+    return buf.getvalue()
@@ -0,0 +1,162 @@
+"""Spread sends over several Resend accounts (API keys), each with its own rate limit."""
+
+import hashlib
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .errors import ResendError
+
+STRATEGIES = ("domain", "round-robin")
+
+
+def sender_domain(payload: dict) -> str:
+    """The domain of a payload's ``from`` address, lowercased ("Name <a@b.com>" -> "b.com")."""
+    sender = str(payload.get("from") or "")
+    return sender.rsplit("@", 1)[-1].strip().rstrip(">").strip().lower() if "@" in sender else ""
+
+
+@dataclass(eq=False)
+class Shard:
+    """One account: a client with its own connection pool and rate limiter.
+
+    ``domains`` are the sender domains verified on the account; empty means
+    it may send from any domain.
+    """
+
+    name: str
+    client: Any
+    domains: frozenset[str] = frozenset()
+    sent: int = 0
+    failed: int = 0
+    requests: int = 0
+    busy: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def call(self, method: str, *args: Any, emails: int = 1, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            result = getattr(self.client, method)(*args, **kwargs)
+        except BaseException:
+            self._count(0, emails, started)
+            raise
+        self._count(emails, 0, started)
+        return result
+
+    def send_batch(self, payloads: list[dict], idempotency_key: str | None = None) -> list:
+        """Send one batch, counting as sent only the emails the reply gave an id."""
+        started = time.perf_counter()
+        try:
+            reply = self.client.send_batch(payloads, idempotency_key=idempotency_key)
+        except BaseException:
+            self._count(0, len(payloads), started)
+            raise
+        sent = sum(1 for item in reply[:len(payloads)] if isinstance(item, dict) and item.get("id"))
+        self._count(sent, len(payloads) - sent, started)
+        return reply
+
+    def _count(self, sent: int, failed: int, started: float) -> None:
+        with self._lock:
+            self.sent += sent
+            self.failed += failed
+            self.requests += 1
+            self.busy += time.perf_counter() - started
+
+
+class ShardedClient:
+    """Stands in for ResendClient, sending through a pool of accounts.
+
+    With the ``domain`` strategy an email goes to a shard that owns its sender
+    domain (or to one without a domain list); ``round-robin`` ignores domains.
+    Among the eligible shards, sends with an idempotency key are placed by a
+    hash of the key, so a retried or resumed send reaches the same account
+    and is deduplicated there; sends without a key rotate. A batch whose
+    emails belong to different shards is split into one batch per shard,
+    each sent under the batch's key, and the replies are returned in order.
+    If some of those batches fail, their emails get ``{"error": ...}`` entries
+    instead of ids; the error is raised only when nothing was sent.
+
+    ``get_email`` asks each shard in turn; every other call goes to the
+    first shard.
+    """
+
+    def __init__(self, shards: list[Shard], strategy: str = "domain"):
+        if not shards:
+            raise ValueError("need at least one shard")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy!r}; expected one of {', '.join(STRATEGIES)}")
+        self.shards = list(shards)
+        self.strategy = strategy
+        self._turn = itertools.count()
+
+    def _candidates(self, payload: dict) -> list[Shard]:
+        if self.strategy == "round-robin":
+            return self.shards
+        domain = sender_domain(payload)
+        owners = [s for s in self.shards if domain in s.domains] or [s for s in self.shards if not s.domains]
+        if not owners:
+            raise ValueError(f"no shard sends from {domain or 'an empty sender'}")
+        return owners
+
+    def shard_for(self, payload: dict, idempotency_key: str | None = None) -> Shard:
+        candidates = self._candidates(payload)
+        if idempotency_key:
+            digest = hashlib.blake2b(idempotency_key.encode(), digest_size=8).digest()
+            return candidates[int.from_bytes(digest, "big") % len(candidates)]
+        return candidates[next(self._turn) % len(candidates)]
+
+    def send_email(self, payload: dict, idempotency_key: str | None = None) -> dict:
+        return self.shard_for(payload, idempotency_key).call("send_email", payload, idempotency_key=idempotency_key)
+
+    def send_batch(self, payloads: list[dict], idempotency_key: str | None = None) -> list:
+        groups: dict[str, tuple[Shard, list[int]]] = {}
+        if idempotency_key:
+            for i, payload in enumerate(payloads):
+                shard = self.shard_for(payload, idempotency_key)
+                groups.setdefault(shard.name, (shard, []))[1].append(i)
+        else:
+            # Without a key, rotate per batch rather than per email so batches stay whole.
+            shard = self.shard_for(payloads[0] if payloads else {})
+            for i, payload in enumerate(payloads):
+                owner = shard if shard in self._candidates(payload) else self.shard_for(payload)
+                groups.setdefault(owner.name, (owner, []))[1].append(i)
+        results: list[dict] = [{}] * len(payloads)
+        errors: list[Exception] = []
+        for shard, indexes in groups.values():
+            try:
+                part = shard.send_batch([payloads[i] for i in indexes], idempotency_key=idempotency_key)
+            except Exception as e:
+                errors.append(e)
+                record = {"error": e.message, "status_code": e.status_code} if isinstance(e, ResendError) \
+                    else {"error": str(e)}
+                for i in indexes:
+                    results[i] = record
+                continue
+            for i, item in zip(indexes, part):
+                results[i] = item
+            for i in indexes[len(part):]:
+                results[i] = {"error": f"no id returned ({len(part)} ids for {len(indexes)} emails)"}
+        if errors and len(errors) == len(groups):
+            raise errors[0]
+        return results
+
+    def get_email(self, email_id: str) -> dict:
+        for shard in self.shards[:-1]:
+            try:
+                return shard.client.get_email(email_id)
+            except ResendError as e:
+                if e.status_code != 404:
+                    raise
+        return self.shards[-1].client.get_email(email_id)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name == "shards":
+            raise AttributeError(name)
+        return getattr(self.shards[0].client, name)
+
+    def report(self) -> list[dict]:
+        """Per shard: emails sent and failed, API calls, and seconds spent in them."""
+        return [{"shard": s.name, "sent": s.sent, "failed": s.failed, "requests": s.requests,
+                 "busy": round(s.busy, 3)} for s in self.shards]
@@ -0,0 +1,230 @@
+"""Maildir-style spool of queued sends, drained by ``resend-cli worker``."""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from .bulk import bounded_map
+from .config import CACHE_DIR
+from .errors import ResendError
+from .lanes import LANES, LaneScheduler
+from .retry import RETRY_STATUSES
+
+SUBDIRS = ("tmp", "new", "cur", "dead")
+# Items whose send keeps failing are retried this many times before going to dead/.
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 30.0
+MAX_RETRY_DELAY = 3600.0
+# A claimed item untouched for this long belongs to a worker that died.
+STALE_AFTER = 600.0
+# How often a drain looks for newly queued items, so urgent ones jump ahead.
+RESCAN_INTERVAL = 0.2
+# ``<due time>.<lane>.``; anything else in new/ (editor backups, .DS_Store) is not an item.
+ITEM_NAME = re.compile(r"\d{17}\.[a-z]+\.")
+
+
+def spool_path(profile: str | None = None) -> Path:
+    """Each credentials profile gets its own spool."""
+    return CACHE_DIR / f"spool-{profile or 'default'}"
+
+
+class Spool:
+    """Directory of queued emails, one JSON file per email.
+
+    Items are written to ``tmp/``, fsynced and renamed into ``new/``, so a
+    reader never sees a partial file. A worker claims an item by renaming it
+    into ``cur/`` (only one of several racing workers wins), removes it once
+    sent, and moves it to ``dead/`` when it cannot be sent. File names are
+    ``<due time>.<lane>.<unique>.json``: sorting them gives FIFO order,
+    retries are delayed by renaming them into the future, and the priority
+    lane is known without opening the file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        for sub in SUBDIRS:
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _name(due: float, lane: str) -> str:
+        return f"{int(due * 1e6):017d}.{lane}.{os.getpid()}.{os.urandom(4).hex()}.json"
+
+    @staticmethod
+    def lane_of(name: str) -> str:
+        lane = name.split(".")[1]
+        return lane if lane in LANES else "normal"
+
+    @staticmethod
+    def due_time(name: str) -> float:
+        return int(name[:17]) / 1e6
+
+    def put(self, payload: dict, idempotency_key: str | None = None, lane: str = "normal") -> str:
+        """Queue ``payload`` in priority ``lane`` and return the item name.
+
+        Every item gets an idempotency key up front, so a retry after a worker
+        crash cannot send it twice.
+        """
+        if lane not in LANES:
+            raise ValueError(f"unknown lane {lane!r}; expected one of {', '.join(LANES)}")
+        now = time.time()
+        name = self._name(now, lane)
+        item = {
+            "payload": payload,
+            "idempotency_key": idempotency_key or f"resend-cli-{os.urandom(16).hex()}",
+            "queued_at": now,
+            "attempts": 0,
+        }
+        tmp = self.root / "tmp" / name
+        with tmp.open("w") as f:
+            json.dump(item, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp, self.root / "new" / name)
+        return name
+
+    def due(self, now: float | None = None) -> list[Path]:
+        """Items in ``new/`` that are due, oldest first."""
+        cutoff = f"{int((now or time.time()) * 1e6):017d}"
+        return [self.root / "new" / n for n in sorted(os.listdir(self.root / "new"))
+                if ITEM_NAME.match(n) and n[:17] <= cutoff]
+
+    def claim(self, path: Path) -> Path | None:
+        """Move an item into ``cur/``; None if another worker got there first."""
+        target = self.root / "cur" / path.name
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            return None
+        os.utime(target)
+        return target
+
+    @staticmethod
+    def load(path: Path) -> dict:
+        return json.loads(path.read_text())
+
+    @staticmethod
+    def done(path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+    def _rewrite(self, path: Path, item: dict, target: Path) -> None:
+        tmp = self.root / "tmp" / target.name
+        tmp.write_text(json.dumps(item))
+        os.rename(tmp, target)
+        path.unlink(missing_ok=True)
+
+    def retry(self, path: Path, item: dict, delay: float) -> str:
+        """Put a claimed item back in ``new/``, due after ``delay`` seconds."""
+        name = self._name(time.time() + delay, self.lane_of(path.name))
+        self._rewrite(path, item, self.root / "new" / name)
+        return name
+
+    def bury(self, path: Path, item: dict | None = None) -> None:
+        """Move a claimed item to ``dead/`` for inspection.
+
+        Without ``item`` the file is moved as is, for items that cannot be read.
+        """
+        if item is None:
+            os.rename(path, self.root / "dead" / path.name)
+        else:
+            self._rewrite(path, item, self.root / "dead" / path.name)
+
+    def recover(self, stale_after: float = STALE_AFTER) -> int:
+        """Return items claimed by workers that died to ``new/``. Returns how many."""
+        cutoff = time.time() - stale_after
+        count = 0
+        for name in os.listdir(self.root / "cur"):
+            path = self.root / "cur" / name
+            try:
+                if path.stat().st_mtime < cutoff:
+                    os.rename(path, self.root / "new" / name)
+                    count += 1
+            except FileNotFoundError:
+                continue
+        return count
+
+    def counts(self) -> dict:
+        return {sub: len(os.listdir(self.root / sub)) for sub in ("new", "cur", "dead")}
+
+
+def _retryable(exc: BaseException) -> bool:
+    return not isinstance(exc, ResendError) or exc.status_code in RETRY_STATUSES
+
+
+def drain(spool: Spool, client: Any, out: IO[str], workers: int = 4, max_attempts: int = MAX_ATTEMPTS,
+          retry_delay: float = RETRY_DELAY, scheduler: LaneScheduler | None = None) -> dict:
+    """Send every item that is due, writing one JSONL result per item.
+
+    Items are taken from their lanes by ``scheduler``, and the spool is
+    rescanned while draining so newly queued high-priority mail overtakes a
+    bulk backlog. Failures the API may recover from (429, 5xx, network
+    errors) are requeued with exponential backoff until ``max_attempts``;
+    other failures, and items out of attempts, go to ``dead/``. Returns
+    counts of ``sent``, ``retried`` and ``dead`` items.
+    """
+    stats = {"sent": 0, "retried": 0, "dead": 0}
+    sched: LaneScheduler[Path] = scheduler if scheduler is not None else LaneScheduler()
+    known: set[str] = set()
+
+    def scan() -> None:
+        for path in spool.due():
+            if path.name not in known:
+                known.add(path.name)
+                sched.push(spool.lane_of(path.name), path)
+
+    def claimed() -> Iterator[tuple[Path, dict]]:
+        scan()
+        scanned = time.monotonic()
+        while True:
+            if time.monotonic() - scanned >= RESCAN_INTERVAL:
+                scan()
+                scanned = time.monotonic()
+            nxt = sched.pop()
+            if nxt is None:
+                return
+            lane, path = nxt
+            target = spool.claim(path)
+            if target is None:
+                continue
+            sched.record_wait(lane, time.time() - spool.due_time(path.name))
+            try:
+                item = spool.load(target)
+                if not isinstance(item, dict) or not {"payload", "idempotency_key", "attempts"} <= item.keys():
+                    raise ValueError("not a queued email")
+            except (OSError, ValueError) as e:
+                # A corrupt item would fail the same way on every drain.
+                spool.bury(target)
+                out.write(json.dumps({"item": target.name, "lane": lane, "error": f"unreadable item: {e}",
+                                      "dead": True}) + "\n")
+                stats["dead"] += 1
+                continue
+            yield target, item
+
+    def send(job: tuple[Path, dict]) -> Any:
+        path, item = job
+        return client.send_email(item["payload"], idempotency_key=item["idempotency_key"])
+
+    for (path, item), fut in bounded_map(send, claimed(), workers=workers):
+        exc = fut.exception()
+        lane = spool.lane_of(path.name)
+        if exc is None:
+            spool.done(path)
+            out.write(json.dumps({"item": path.name, "lane": lane, "id": (fut.result() or {}).get("id")}) + "\n")
+            stats["sent"] += 1
+        else:
+            item["attempts"] += 1
+            item["error"] = exc.message if isinstance(exc, ResendError) else str(exc)
+            record: dict = {"item": path.name, "lane": lane, "error": item["error"]}
+            if _retryable(exc) and item["attempts"] < max_attempts:
+                delay = min(retry_delay * 2 ** (item["attempts"] - 1), MAX_RETRY_DELAY)
+                record["retry_as"] = spool.retry(path, item, delay)
+                stats["retried"] += 1
+            else:
+                spool.bury(path, item)
+                record["dead"] = True
+                stats["dead"] += 1
+            out.write(json.dumps(record) + "\n")
+        out.flush()
+    return stats
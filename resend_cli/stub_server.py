@@ -0,0 +1,562 @@
+"""Local stand-in for the Resend API, for load tests and offline CI.
+
+Usage:
+    python -m resend_cli.stub_server --port 8025 --latency lognormal:0.08,0.5 --rate-limit 10
+    RESEND_API_BASE=http://127.0.0.1:8025 RESEND_API_KEY=re_test resend-cli send ...
+
+It serves the endpoints ResendClient calls (emails, batch, receiving,
+domains, audiences, contacts) from memory, with cursor pagination and
+idempotency keys, and can inject latency, 429s with Retry-After from a
+per-key token bucket, and 5xx errors. Tests use it in-process::
+
+    with StubServer(latency="uniform:0.01,0.05", rate_limit=5) as stub:
+        client = ResendClient("re_test", base_url=stub.url)
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from .config import BATCH_MAX, PAGE_SIZE_MAX
+from .metrics import endpoint
+
+DEFAULT_PAGE_SIZE = 20
+ERROR_STATUSES = (500, 502, 503)
+
+
+class Latency:
+    """A response delay distribution parsed from a spec string.
+
+    ``"0.05"`` or ``"fixed:0.05"``, ``"uniform:LOW,HIGH"``, ``"normal:MEAN,SD"``
+    or ``"lognormal:MEDIAN,SIGMA"``, all in seconds. Samples are never negative.
+    """
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(self, spec: str | float = 0):
+        spec = str(spec)
+        kind, _, args = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown latency distribution {kind!r}; expected one of {', '.join(self.KINDS)}")
+        try:
+            self.params = [float(a) for a in args.split(",")]
+        except ValueError:
+            raise ValueError(f"bad latency spec {spec!r}")
+        if len(self.params) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"bad latency spec {spec!r}")
+        self.kind = kind
+
+    def sample(self, rng: random.Random) -> float:
+        a = self.params[0]
+        if self.kind == "fixed":
+            return max(0.0, a)
+        b = self.params[1]
+        if self.kind == "uniform":
+            return max(0.0, rng.uniform(a, b))
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(a, b))
+        return rng.lognormvariate(math.log(a), b) if a > 0 else 0.0
+
+
+class _Reply(Exception):
+    """Raised by a route to answer with an error status."""
+
+    def __init__(self, status: int, message: str, name: str = "application_error",
+                 headers: dict[str, str] | None = None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"statusCode": status, "name": name, "message": message}
+        self.headers = headers or {}
+
+
+def _id() -> str:
+    return str(uuid.uuid4())
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S+00", time.gmtime())
+
+
+class _Table(dict):
+    """Items by id in insertion order, paged by cursor without copying or scanning.
+
+    Every id keeps its position in an append-only list, so a page after a
+    given id starts right there; deleted ids stay in the list as gaps until
+    they outnumber the live ones. With ``unique`` set, items are also indexed
+    by that field, case-insensitively.
+    """
+
+    def __init__(self, unique: str | None = None):
+        super().__init__()
+        self.unique = unique
+        self.by_key: dict[str, str] = {}
+        self._order: list[str] = []
+        self._pos: dict[str, int] = {}
+
+    def __setitem__(self, item_id: str, item: dict) -> None:
+        if item_id not in self._pos:
+            self._pos[item_id] = len(self._order)
+            self._order.append(item_id)
+        if self.unique:
+            self.by_key[item[self.unique].lower()] = item_id
+        super().__setitem__(item_id, item)
+
+    def __delitem__(self, item_id: str) -> None:
+        item = self[item_id]
+        super().__delitem__(item_id)
+        del self._pos[item_id]
+        if self.unique:
+            self.by_key.pop(item[self.unique].lower(), None)
+        if len(self._order) > 2 * len(self) + 64:
+            self._order = list(self)
+            self._pos = {k: i for i, k in enumerate(self._order)}
+
+    def pop(self, item_id: str, *default: Any) -> Any:
+        if item_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(item_id)
+        item = self[item_id]
+        del self[item_id]
+        return item
+
+    def page(self, after: str | None, limit: int) -> tuple[list[dict], bool]:
+        """Up to ``limit`` items after the one with id ``after``, and whether more follow."""
+        i = 0
+        if after:
+            i = self._pos[after] + 1
+        items: list[dict] = []
+        while i < len(self._order) and len(items) < limit:
+            item = self.get(self._order[i])
+            if item is not None:
+                items.append(item)
+            i += 1
+        return items, any(self._order[j] in self for j in range(i, len(self._order)))
+
+
+class StubServer(ThreadingHTTPServer):
+    """In-memory Resend API on ``url``.
+
+    ``latency`` applies to every response; ``route_latency`` overrides it per
+    endpoint, keyed like the metrics (``"POST /emails/batch"`` or just
+    ``"/emails/batch"``). With ``rate_limit`` (requests per second, bursts
+    of ``burst``) each API key has a token bucket, and requests beyond it get
+    429 with the seconds until a token frees up in Retry-After. A share
+    ``error_rate`` of requests fails with a status from ``error_statuses``,
+    and ``fail_next`` scripts failures for the next requests. Sent emails
+    report ``last_event`` "sent" until ``delivery_delay`` seconds have passed,
+    then "delivered". If ``api_key`` is set, other keys get 401.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, latency: str | float = 0,
+                 route_latency: dict[str, str | float] | None = None, rate_limit: float = 0,
+                 burst: int | None = None, error_rate: float = 0.0,
+                 error_statuses: tuple[int, ...] = ERROR_STATUSES, delivery_delay: float = 0.0,
+                 api_key: str | None = None, seed: int | None = None):
+        super().__init__((host, port), _Handler)
+        self.latency = Latency(latency)
+        self.route_latency = {k: Latency(v) for k, v in (route_latency or {}).items()}
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(1, math.ceil(rate_limit))
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.delivery_delay = delivery_delay
+        self.api_key = api_key
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats: dict[str, Any] = {"connections": 0, "requests": 0, "statuses": {}}
+        self.emails: dict[str, dict] = {}
+        self.inbound = _Table()
+        self.domains = _Table()
+        self.audiences = _Table()
+        self.contacts: dict[str, _Table] = {}
+        self._buckets: dict[str, list[float]] = {}
+        self._idempotent: dict[tuple[str, str], tuple[int, Any]] = {}
+        self._scripted: list[tuple[int, float | None]] = []
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # --- Test data ---
+
+    def fail_next(self, count: int = 1, status: int = 503, retry_after: float | None = None) -> None:
+        """Answer the next ``count`` requests with ``status`` (and Retry-After, if given)."""
+        with self.lock:
+            self._scripted += [(status, retry_after)] * count
+
+    def add_domain(self, name: str, status: str = "verified") -> dict:
+        domain = {"object": "domain", "id": _id(), "name": name, "status": status, "created_at": _now(),
+                  "region": "us-east-1"}
+        with self.lock:
+            self.domains[domain["id"]] = domain
+        return domain
+
+    def add_audience(self, name: str) -> dict:
+        audience = {"object": "audience", "id": _id(), "name": name, "created_at": _now()}
+        with self.lock:
+            self.audiences[audience["id"]] = audience
+            self.contacts[audience["id"]] = _Table(unique="email")
+        return audience
+
+    def add_contact(self, audience_id: str, email: str, first_name: str = "", last_name: str = "",
+                    unsubscribed: bool = False) -> dict:
+        contact = {"object": "contact", "id": _id(), "email": email, "first_name": first_name,
+                   "last_name": last_name, "unsubscribed": unsubscribed, "created_at": _now()}
+        with self.lock:
+            self.contacts[audience_id][contact["id"]] = contact
+        return contact
+
+    def add_inbound(self, sender: str, to: str, subject: str, text: str = "") -> dict:
+        email = {"object": "inbound_email", "id": _id(), "from": sender, "to": [to], "subject": subject,
+                 "text": text, "created_at": _now()}
+        with self.lock:
+            self.inbound[email["id"]] = email
+        return email
+
+    def seed(self, domains: int = 0, audiences: int = 0, contacts: int = 0, inbound: int = 0) -> None:
+        """Fill the store with generated data; ``contacts`` is per audience."""
+        for i in range(domains):
+            self.add_domain(f"mail{i}.example.com")
+        for i in range(audiences):
+            audience = self.add_audience(f"Audience {i}")
+            for j in range(contacts):
+                self.add_contact(audience["id"], f"user{j}@example.com", first_name=f"User{j}")
+        for i in range(inbound):
+            self.add_inbound(f"sender{i}@example.org", "inbox@example.com", f"Message {i}")
+
+    # --- Faults ---
+
+    def _take_token(self, key: str) -> float:
+        """Take a request token for ``key``; returns 0, or the seconds until one is free."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) * self.rate_limit)
+        if tokens >= 1:
+            self._buckets[key] = [tokens - 1, now]
+            return 0.0
+        self._buckets[key] = [tokens, now]
+        return (1 - tokens) / self.rate_limit
+
+    def fault(self, key: str) -> _Reply | None:
+        with self.lock:
+            if self._scripted:
+                status, retry_after = self._scripted.pop(0)
+                headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else {}
+                return _Reply(status, "injected failure", headers=headers)
+            if self.rate_limit > 0:
+                wait = self._take_token(key)
+                if wait:
+                    return _Reply(429, "Too many requests. Please limit the number of requests per second.",
+                                  "rate_limit_exceeded", {"Retry-After": f"{math.ceil(wait * 1000) / 1000:g}"})
+            if self.error_rate and self.rng.random() < self.error_rate:
+                return _Reply(self.rng.choice(self.error_statuses), "injected failure", "internal_server_error")
+        return None
+
+    def delay(self, method: str, path: str) -> float:
+        route = endpoint(path)
+        latency = self.route_latency.get(f"{method} {route}") or self.route_latency.get(route) or self.latency
+        with self.lock:
+            return latency.sample(self.rng)
+
+    # --- Routes ---
+
+    def handle_api(self, method: str, path: str, query: dict[str, str], body: Any,
+                   idempotency_key: str | None) -> tuple[int, Any]:
+        for pattern, verb, route in _ROUTES:
+            m = pattern.fullmatch(path)
+            if m and verb == method:
+                if idempotency_key and method == "POST":
+                    with self.lock:
+                        stored = self._idempotent.get((path, idempotency_key))
+                    if stored is not None:
+                        return stored
+                result = route(self, query, body, *m.groups())
+                if idempotency_key and method == "POST":
+                    with self.lock:
+                        self._idempotent[(path, idempotency_key)] = result
+                return result
+        raise _Reply(404, f"{method} {path} not found", "not_found")
+
+    def _page(self, table: _Table, query: dict[str, str]) -> tuple[int, dict]:
+        try:
+            limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise _Reply(422, "limit must be a number", "validation_error")
+        if not 1 <= limit <= PAGE_SIZE_MAX:
+            raise _Reply(422, f"limit must be between 1 and {PAGE_SIZE_MAX}", "validation_error")
+        with self.lock:
+            try:
+                page, has_more = table.page(query.get("after"), limit)
+            except KeyError:
+                raise _Reply(422, "after must be the id of an item in this list", "validation_error")
+        return 200, {"object": "list", "has_more": has_more, "data": page}
+
+    def _create_email(self, payload: Any) -> dict:
+        if not isinstance(payload, dict):
+            raise _Reply(422, "expected a JSON object", "validation_error")
+        missing = [f for f in ("from", "to", "subject") if not payload.get(f)]
+        if missing:
+            raise _Reply(422, f"missing required field: {missing[0]}", "validation_error")
+        for attachment in payload.get("attachments") or ():
+            if not attachment.get("filename") or not isinstance(attachment.get("content"), str):
+                raise _Reply(422, "attachments need a filename and base64 content", "validation_error")
+        to = payload["to"] if isinstance(payload["to"], list) else [payload["to"]]
+        email = {"object": "email", "id": _id(), "from": payload["from"], "to": to,
+                 "subject": payload["subject"], "created_at": _now(), "_sent": time.monotonic()}
+        with self.lock:
+            self.emails[email["id"]] = email
+        return email
+
+    def _send(self, query: dict, body: Any) -> tuple[int, dict]:
+        return 200, {"id": self._create_email(body)["id"]}
+
+    def _batch(self, query: dict, body: Any) -> tuple[int, dict]:
+        if not isinstance(body, list) or not body:
+            raise _Reply(422, "expected a non-empty JSON array", "validation_error")
+        if len(body) > BATCH_MAX:
+            raise _Reply(422, f"a batch holds at most {BATCH_MAX} emails", "validation_error")
+        return 200, {"data": [{"id": self._create_email(p)["id"]} for p in body]}
+
+    def _get_email(self, query: dict, body: Any, email_id: str) -> tuple[int, dict]:
+        with self.lock:
+            email = self.emails.get(email_id)
+        if email is None:
+            raise _Reply(404, "Email not found", "not_found")
+        delivered = time.monotonic() - email["_sent"] >= self.delivery_delay
+        return 200, {**{k: v for k, v in email.items() if k != "_sent"},
+                     "last_event": "delivered" if delivered else "sent"}
+
+    def _list_inbound(self, query: dict, body: Any) -> tuple[int, dict]:
+        return self._page(self.inbound, query)
+
+    def _get_inbound(self, query: dict, body: Any, email_id: str) -> tuple[int, dict]:
+        with self.lock:
+            email = self.inbound.get(email_id)
+        if email is None:
+            raise _Reply(404, "Inbound email not found", "not_found")
+        return 200, email
+
+    def _list_domains(self, query: dict, body: Any) -> tuple[int, dict]:
+        return self._page(self.domains, query)
+
+    def _verify_domain(self, query: dict, body: Any, domain_id: str) -> tuple[int, dict]:
+        with self.lock:
+            if domain_id not in self.domains:
+                raise _Reply(404, "Domain not found", "not_found")
+            self.domains[domain_id]["status"] = "verified"
+        return 200, {"object": "domain", "id": domain_id}
+
+    def _list_audiences(self, query: dict, body: Any) -> tuple[int, dict]:
+        return self._page(self.audiences, query)
+
+    def _create_audience(self, query: dict, body: Any) -> tuple[int, dict]:
+        if not isinstance(body, dict) or not body.get("name"):
+            raise _Reply(422, "missing required field: name", "validation_error")
+        audience = self.add_audience(body["name"])
+        return 200, {"object": "audience", "id": audience["id"], "name": audience["name"]}
+
+    def _delete_audience(self, query: dict, body: Any, audience_id: str) -> tuple[int, dict]:
+        with self.lock:
+            if self.audiences.pop(audience_id, None) is None:
+                raise _Reply(404, "Audience not found", "not_found")
+            del self.contacts[audience_id]
+        return 200, {"object": "audience", "id": audience_id, "deleted": True}
+
+    def _audience(self, audience_id: str) -> _Table:
+        contacts = self.contacts.get(audience_id)
+        if contacts is None:
+            raise _Reply(404, "Audience not found", "not_found")
+        return contacts
+
+    def _find(self, audience_id: str, contact: str) -> dict:
+        contacts = self._audience(audience_id)
+        found = contacts.get(contact) or contacts.get(contacts.by_key.get(contact.lower(), ""))
+        if found is None:
+            raise _Reply(404, "Contact not found", "not_found")
+        return found
+
+    def _list_contacts(self, query: dict, body: Any, audience_id: str) -> tuple[int, dict]:
+        with self.lock:
+            contacts = self._audience(audience_id)
+        return self._page(contacts, query)
+
+    def _create_contact(self, query: dict, body: Any, audience_id: str) -> tuple[int, dict]:
+        if not isinstance(body, dict) or not body.get("email"):
+            raise _Reply(422, "missing required field: email", "validation_error")
+        with self.lock:
+            self._audience(audience_id)
+            try:
+                existing = self._find(audience_id, body["email"])
+            except _Reply:
+                existing = None
+        if existing is not None:
+            return 200, {"object": "contact", "id": existing["id"]}
+        contact = self.add_contact(audience_id, body["email"], body.get("first_name") or "",
+                                   body.get("last_name") or "", bool(body.get("unsubscribed")))
+        return 200, {"object": "contact", "id": contact["id"]}
+
+    def _get_contact(self, query: dict, body: Any, audience_id: str, contact: str) -> tuple[int, dict]:
+        with self.lock:
+            return 200, dict(self._find(audience_id, contact))
+
+    def _update_contact(self, query: dict, body: Any, audience_id: str, contact: str) -> tuple[int, dict]:
+        if not isinstance(body, dict):
+            raise _Reply(422, "expected a JSON object", "validation_error")
+        with self.lock:
+            found = self._find(audience_id, contact)
+            found.update({k: body[k] for k in ("first_name", "last_name", "unsubscribed") if k in body})
+        return 200, {"object": "contact", "id": found["id"]}
+
+    def _delete_contact(self, query: dict, body: Any, audience_id: str, contact: str) -> tuple[int, dict]:
+        with self.lock:
+            found = self._find(audience_id, contact)
+            del self.contacts[audience_id][found["id"]]
+        return 200, {"object": "contact", "contact": found["id"], "deleted": True}
+
+
+_Route = Callable[..., tuple[int, Any]]
+_ROUTES: list[tuple[re.Pattern, str, _Route]] = [
+    (re.compile(r"/emails"), "POST", StubServer._send),
+    (re.compile(r"/emails/batch"), "POST", StubServer._batch),
+    (re.compile(r"/emails/receiving"), "GET", StubServer._list_inbound),
+    (re.compile(r"/emails/receiving/([^/]+)"), "GET", StubServer._get_inbound),
+    (re.compile(r"/emails/([^/]+)"), "GET", StubServer._get_email),
+    (re.compile(r"/domains"), "GET", StubServer._list_domains),
+    (re.compile(r"/domains/([^/]+)/verify"), "POST", StubServer._verify_domain),
+    (re.compile(r"/audiences"), "GET", StubServer._list_audiences),
+    (re.compile(r"/audiences"), "POST", StubServer._create_audience),
+    (re.compile(r"/audiences/([^/]+)"), "DELETE", StubServer._delete_audience),
+    (re.compile(r"/audiences/([^/]+)/contacts"), "GET", StubServer._list_contacts),
+    (re.compile(r"/audiences/([^/]+)/contacts"), "POST", StubServer._create_contact),
+    (re.compile(r"/audiences/([^/]+)/contacts/([^/]+)"), "GET", StubServer._get_contact),
+    (re.compile(r"/audiences/([^/]+)/contacts/([^/]+)"), "PATCH", StubServer._update_contact),
+    (re.compile(r"/audiences/([^/]+)/contacts/([^/]+)"), "DELETE", StubServer._delete_contact),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment, so delayed ACKs do not cap throughput.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    server: StubServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.stats["connections"] += 1
+
+    def _handle(self) -> None:
+        server = self.server
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        auth = self.headers.get("Authorization", "")
+        headers: dict[str, str] = {}
+        try:
+            if not auth.startswith("Bearer ") or (server.api_key and auth != f"Bearer {server.api_key}"):
+                raise _Reply(401, "API key is invalid", "validation_error")
+            failure = server.fault(auth)
+            if failure is not None:
+                raise failure
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                raise _Reply(400, "request body is not valid JSON", "invalid_json")
+            status, data = server.handle_api(self.command, url.path.rstrip("/") or "/", query, body,
+                                             self.headers.get("Idempotency-Key"))
+        except _Reply as e:
+            status, data, headers = e.status, e.body, e.headers
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # A body of the wrong shape (say, an attachment that is not an object)
+            # trips up a route; answer like the API would rather than dropping the connection.
+            status, data = 400, _Reply(400, f"malformed request body: {e!r}", "validation_error").body
+        except Exception as e:
+            status, data = 500, _Reply(500, f"stub server error: {e!r}", "internal_server_error").body
+        time.sleep(server.delay(self.command, url.path))
+        payload = json.dumps(data).encode()
+        with server.lock:
+            server.stats["requests"] += 1
+            server.stats["statuses"][status] = server.stats["statuses"].get(status, 0) + 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency", default="0", help="fixed:S, uniform:LO,HI, normal:MEAN,SD or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--route-latency", action="append", default=[], metavar="ROUTE=SPEC",
+                        help="Latency for one endpoint, e.g. 'POST /emails/batch=lognormal:0.3,0.4' (repeatable)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests per second per API key (0: off)")
+    parser.add_argument("--burst", type=int, default=None, help="Token bucket size (default: the rate limit)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 5xx")
+    parser.add_argument("--delivery-delay", type=float, default=0.0, help="Seconds before emails show delivered")
+    parser.add_argument("--api-key", default=None, help="Only accept this API key")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latency and errors")
+    parser.add_argument("--domains", type=int, default=0, help="Generated domains")
+    parser.add_argument("--audiences", type=int, default=0, help="Generated audiences")
+    parser.add_argument("--contacts", type=int, default=0, help="Generated contacts per audience")
+    parser.add_argument("--inbound", type=int, default=0, help="Generated inbound emails")
+    args = parser.parse_args(argv)
+    try:
+        route_latency = dict(spec.rsplit("=", 1) for spec in args.route_latency)
+        server = StubServer(args.host, args.port, latency=args.latency, route_latency=route_latency,
+                            rate_limit=args.rate_limit, burst=args.burst, error_rate=args.error_rate,
+                            delivery_delay=args.delivery_delay, api_key=args.api_key, seed=args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    server.seed(args.domains, args.audiences, args.contacts, args.inbound)
+    print(f"Serving a stand-in Resend API on {server.url}; use RESEND_API_BASE={server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Poll the delivery status of many sent emails at once."""
+
+import heapq
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Iterable, Iterator
+
+from .errors import ResendError
+from .ratelimit import TokenBucket
+
+# Once an email reaches one of these events its status is not worth polling.
+TERMINAL_EVENTS = frozenset({"delivered", "opened", "clicked", "bounced", "complained", "failed", "canceled"})
+
+
+class Watcher:
+    """Polls ``get_email`` for each id until it reaches a terminal event.
+
+    Ids are kept in a heap ordered by when they are next due. An id whose
+    ``last_event`` did not change since its previous poll waits twice as long
+    before the next one (up to ``max_interval``); a change resets it to
+    ``interval``. Polls run on ``workers`` threads and all draw from one
+    in-process token bucket of ``budget`` requests per second (0 for none),
+    on top of any limiter the client itself has.
+    """
+
+    def __init__(self, client: Any, email_ids: Iterable[str], budget: float = 0, interval: float = 2.0,
+                 max_interval: float = 60.0, workers: int = 4):
+        self.client = client
+        self.interval = interval
+        self.max_interval = max_interval
+        self.workers = workers
+        self.limiter = TokenBucket(budget) if budget > 0 else None
+        self.events: dict[str, str | None] = {}
+        self._delay: dict[str, float] = {}
+        self._due: list[tuple[float, int, str]] = []
+        now = time.monotonic()
+        for n, email_id in enumerate(dict.fromkeys(email_ids)):
+            self.events[email_id] = None
+            self._delay[email_id] = interval
+            self._due.append((now, n, email_id))
+        self._seq = len(self._due)
+
+    @property
+    def unfinished(self) -> list[str]:
+        """Ids still being polled (after a timeout, the ones that never finished)."""
+        return [email_id for _, _, email_id in sorted(self._due)]
+
+    def _schedule(self, email_id: str, delay: float) -> None:
+        heapq.heappush(self._due, (time.monotonic() + delay, self._seq, email_id))
+        self._seq += 1
+
+    def run(self, timeout: float | None = None) -> Iterator[dict]:
+        """Yield the email record each time an id's ``last_event`` changes.
+
+        Ids that cannot be polled (e.g. unknown ids) are yielded once as
+        ``{"id": ..., "error": ..., "status_code": ...}`` and dropped.
+        Transient errors back off like an unchanged status.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        pending: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while self._due or pending:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                while self._due and self._due[0][0] <= now and len(pending) < self.workers:
+                    email_id = heapq.heappop(self._due)[2]
+                    if self.limiter is not None:
+                        self.limiter.acquire()
+                    pending[pool.submit(self.client.get_email, email_id)] = email_id
+                wake = self._due[0][0] if self._due and len(pending) < self.workers else None
+                if deadline is not None:
+                    wake = min(wake, deadline) if wake is not None else deadline
+                delay = max(0.0, wake - time.monotonic()) if wake is not None else None
+                if not pending:
+                    time.sleep(delay or 0)
+                    continue
+                done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield from self._handle(pending.pop(fut), fut)
+            for email_id in pending.values():
+                self._schedule(email_id, 0)
+
+    def _handle(self, email_id: str, fut: Future) -> Iterator[dict]:
+        exc = fut.exception()
+        if isinstance(exc, ResendError) and 400 <= exc.status_code < 500 and exc.status_code != 429:
+            self.events.pop(email_id, None)
+            yield {"id": email_id, "error": exc.message, "status_code": exc.status_code}
+            return
+        if exc is not None:
+            self._backoff(email_id)
+            self._schedule(email_id, self._delay[email_id])
+            return
+        data = fut.result() or {}
+        event = data.get("last_event")
+        if event != self.events[email_id]:
+            self.events[email_id] = event
+            self._delay[email_id] = self.interval
+            yield data
+        else:
+            self._backoff(email_id)
+        if event not in TERMINAL_EVENTS:
+            self._schedule(email_id, self._delay[email_id])
+
+    def _backoff(self, email_id: str) -> None:
+        self._delay[email_id] = min(self._delay[email_id] * 2, self.max_interval)
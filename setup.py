@@ -5,7 +5,7 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=["click>=8.0", "requests>=2.28", "rich>=13.0"],
-    extras_require={"dev": ["pytest>=7.0", "pytest-cov"]},
+    extras_require={"dev": ["pytest>=7.0", "pytest-cov"], "fast": ["orjson>=3.8"]},
     entry_points={"console_scripts": ["resend-cli=resend_cli.cli:main"]},
     python_requires=">=3.10",
 )
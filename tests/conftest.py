@@ -4,6 +4,21 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 from resend_cli.client import ResendClient
+from resend_cli.retry import RetryPolicy
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep everything resend-cli writes to its cache dir (state, caches, sockets) inside tmp_path."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("resend_cli.cache.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("resend_cli.ratelimit.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("resend_cli.mirror.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("resend_cli.journal.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("resend_cli.spool.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("resend_cli.daemon.CACHE_DIR", cache_dir)
+    monkeypatch.setattr("resend_cli.cli.CACHE_DIR", cache_dir)
+    return cache_dir
 
 
 @pytest.fixture
@@ -16,7 +31,7 @@ def mock_session():
 
 @pytest.fixture
 def client(mock_session):
-    return ResendClient("test_api_key")
+    return ResendClient("test_api_key", retry_policy=RetryPolicy(sleep=lambda s: None))
 
 
 @pytest.fixture
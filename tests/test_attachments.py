@@ -0,0 +1,67 @@
+"""Tests for streaming attachment encoding."""
+
+import base64
+import json
+import os
+import tracemalloc
+
+from resend_cli.attachments import FileAttachment, StreamingBody, materialize
+
+
+def _payload(*files):
+    return {"from": "a@b.com", "to": ["c@d.com"], "subject": "Hi", "text": "Body",
+            "attachments": [FileAttachment(f) for f in files]}
+
+
+def test_file_attachment_encoding(tmp_path):
+    f = tmp_path / "data.bin"
+    f.write_bytes(os.urandom(1000))
+    att = FileAttachment(f)
+    assert att.filename == "data.bin"
+    assert att.encoded_size == len(base64.b64encode(f.read_bytes()))
+    assert b"".join(att.iter_base64(chunk_size=100)) == base64.b64encode(f.read_bytes())
+
+
+def test_materialize_matches_eager_encoding(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_bytes(b"hello world")
+    payload = materialize(_payload(f))
+    assert payload["attachments"] == [{"filename": "a.txt", "content": base64.b64encode(b"hello world").decode()}]
+
+
+def test_streaming_body_is_valid_json(tmp_path):
+    a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+    a.write_bytes(os.urandom(5000))
+    b.write_bytes(os.urandom(7))
+    payload = _payload(a, b)
+    body = StreamingBody(payload, chunk_size=300)
+    pieces = []
+    while chunk := body.read(1024):
+        pieces.append(chunk)
+    raw = b"".join(pieces)
+    assert len(raw) == len(body)
+    assert json.loads(raw) == materialize(payload)
+
+
+def test_streaming_body_rewinds(tmp_path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(os.urandom(100))
+    body = StreamingBody(_payload(f))
+    first = body.read()
+    body.seek(0)
+    assert body.tell() == 0
+    assert body.read() == first
+
+
+def test_streaming_body_memory_is_bounded_by_chunk_size(tmp_path):
+    f = tmp_path / "big.bin"
+    f.write_bytes(os.urandom(8 * 1024 * 1024))
+    body = StreamingBody(_payload(f), chunk_size=3 * 16 * 1024)
+    tracemalloc.start()
+    try:
+        while body.read(16384):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1024 * 1024
@@ -0,0 +1,243 @@
+"""Tests for bulk streaming helpers."""
+
+import io
+import json
+import threading
+import time
+
+from resend_cli.bulk import (
+    Checkpoint,
+    bounded_map,
+    chunked,
+    import_contacts,
+    read_rows,
+    row_to_payload,
+    send_batches,
+)
+from resend_cli.client import ResendError
+
+
+class FakeBatchClient:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.keys = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def send_email(self, payload, idempotency_key=None):
+        with self.lock:
+            self.calls.append([payload])
+        return {"id": f"single-{payload['subject']}"}
+
+    def send_batch(self, payloads, idempotency_key=None):
+        with self.lock:
+            self.calls.append(payloads)
+            self.keys.append(idempotency_key)
+        if self.fail_on and any(p["subject"] == self.fail_on for p in payloads):
+            raise ResendError(422, "bad batch")
+        return [{"id": f"id-{p['subject']}"} for p in payloads]
+
+
+def test_read_rows_csv(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("to,subject,html\na@b.com,Hi,\n")
+    assert list(read_rows(str(f))) == [{"to": "a@b.com", "subject": "Hi"}]
+
+
+def test_read_rows_jsonl_skips_blank_lines(tmp_path):
+    f = tmp_path / "in.jsonl"
+    f.write_text('{"to": ["a@b.com"]}\n\n{"to": ["c@d.com"]}\n')
+    assert [r["to"] for r in read_rows(str(f))] == [["a@b.com"], ["c@d.com"]]
+
+
+def test_row_to_payload_defaults():
+    payload = row_to_payload({"to": "a@b.com; c@d.com", "subject": "Hi"}, "me@x.com", "r@x.com")
+    assert payload == {"to": ["a@b.com", "c@d.com"], "subject": "Hi",
+                       "from": "me@x.com", "reply_to": ["r@x.com"]}
+
+
+def test_row_to_payload_attachments():
+    payload = row_to_payload({"to": "a@b.com", "attach": "a.pdf;b.png"}, load_attachment=str.upper)
+    assert payload["attachments"] == ["A.PDF", "B.PNG"]
+    assert "attach" not in payload
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_bounded_map_limits_pending():
+    consumed = []
+
+    def source():
+        for i in range(20):
+            consumed.append(i)
+            yield i
+
+    gen = bounded_map(lambda i: time.sleep(0.01) or i, source(), workers=2, max_pending=3)
+    first, _ = next(gen)
+    assert len(consumed) <= 4
+    rest = [i for i, _ in gen]
+    assert sorted(rest + [first]) == list(range(20))
+
+
+def test_send_batches_writes_result_per_row():
+    rows = ({"subject": str(i)} for i in range(250))
+    client = FakeBatchClient()
+    out = io.StringIO()
+    sent, failed = send_batches(client, rows, out, batch_size=100, workers=3)
+    assert (sent, failed) == (250, 0)
+    assert sorted(len(c) for c in client.calls) == [50, 100, 100]
+    results = {r["row"]: r["id"] for r in map(json.loads, out.getvalue().splitlines())}
+    assert results[1] == "id-0" and results[250] == "id-249"
+
+
+def test_send_batches_reports_batch_error_per_row():
+    rows = [{"subject": "ok"}, {"subject": "bad"}, {"subject": "ok2"}]
+    out = io.StringIO()
+    sent, failed = send_batches(FakeBatchClient(fail_on="bad"), rows, out, batch_size=2)
+    assert (sent, failed) == (1, 2)
+    records = [json.loads(l) for l in out.getvalue().splitlines()]
+    assert {r["row"] for r in records if r.get("status_code") == 422} == {1, 2}
+
+
+def test_send_batches_counts_rows_without_id_as_failed():
+    class ShortClient(FakeBatchClient):
+        def send_batch(self, payloads, idempotency_key=None):
+            return super().send_batch(payloads, idempotency_key)[:-1]
+
+    out = io.StringIO()
+    assert send_batches(ShortClient(), [{"subject": "a"}, {"subject": "b"}], out) == (1, 1)
+    records = [json.loads(l) for l in out.getvalue().splitlines()]
+    assert records[0] == {"row": 1, "id": "id-a"}
+    assert records[1]["row"] == 2 and "no id returned" in records[1]["error"]
+
+
+def test_send_batches_sends_attachment_rows_alone():
+    rows = [{"subject": "a"}, {"subject": "b", "attachments": ["x"]}, {"subject": "c"}]
+    client = FakeBatchClient()
+    out = io.StringIO()
+    assert send_batches(client, rows, out) == (3, 0)
+    results = {r["row"]: r["id"] for r in map(json.loads, out.getvalue().splitlines())}
+    assert results == {1: "id-a", 2: "single-b", 3: "id-c"}
+
+
+class FakeContactClient:
+    def __init__(self, fail_email=None):
+        self.created = []
+        self.fail_email = fail_email
+        self.lock = threading.Lock()
+
+    def create_contact(self, audience_id, email, **kwargs):
+        if email == self.fail_email:
+            raise ResendError(422, "invalid email")
+        with self.lock:
+            self.created.append((email, kwargs))
+        return {"id": f"id-{email}"}
+
+
+def test_import_contacts_dedupes_and_skips_existing():
+    rows = [{"email": "a@x.com", "first_name": "A", "unsubscribed": "true"}, {"email": "A@x.com"},
+            {"email": "b@x.com"}, {"email": ""}, {"email": "c@x.com"}]
+    client = FakeContactClient()
+    out = io.StringIO()
+    stats = import_contacts(client, "aud", rows, out, existing=["B@X.com"])
+    assert stats == {"created": 2, "skipped": 3, "failed": 0}
+    assert sorted(client.created) == [("a@x.com", {"first_name": "A", "unsubscribed": True}), ("c@x.com", {})]
+    assert sorted(json.loads(line)["row"] for line in out.getvalue().splitlines()) == [1, 5]
+
+
+def test_import_contacts_reports_failures():
+    out = io.StringIO()
+    stats = import_contacts(FakeContactClient(fail_email="bad@x.com"), "aud",
+                            [{"email": "bad@x.com"}, {"email": "ok@x.com"}], out)
+    assert stats["failed"] == 1
+    assert {"row": 1, "email": "bad@x.com", "error": "invalid email", "status_code": 422} in \
+        [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_import_contacts_resumes_from_checkpoint(tmp_path):
+    rows = [{"email": f"u{i}@x.com"} for i in range(10)]
+    path = tmp_path / "ckpt.json"
+
+    def interrupted():
+        for n, row in enumerate(rows):
+            if n == 6:
+                raise KeyboardInterrupt
+            yield row
+
+    first = FakeContactClient()
+    try:
+        import_contacts(first, "aud", interrupted(), io.StringIO(), checkpoint=Checkpoint(path), workers=1)
+    except KeyboardInterrupt:
+        pass
+    watermark = json.loads(path.read_text())["watermark"]
+    assert watermark >= 5
+
+    second = FakeContactClient()
+    stats = import_contacts(second, "aud", rows, io.StringIO(), checkpoint=Checkpoint(path))
+    assert sorted(e for e, _ in second.created) == [f"u{i}@x.com" for i in range(watermark, 10)]
+    assert stats["skipped"] == watermark
+
+
+def test_import_contacts_resume_retries_failed_rows(tmp_path):
+    path = tmp_path / "ckpt.json"
+    rows = [{"email": "bad@x.com"}, {"email": "ok@x.com"}]
+    import_contacts(FakeContactClient(fail_email="bad@x.com"), "aud", rows, io.StringIO(),
+                    checkpoint=Checkpoint(path))
+    retry = FakeContactClient()
+    stats = import_contacts(retry, "aud", rows, io.StringIO(), checkpoint=Checkpoint(path))
+    assert [e for e, _ in retry.created] == ["bad@x.com"]
+    assert stats == {"created": 1, "skipped": 1, "failed": 0}
+
+
+def test_checkpoint_watermark_out_of_order(tmp_path):
+    ckpt = Checkpoint(tmp_path / "c.json")
+    for n in (2, 3, 5):
+        ckpt.mark(n)
+    assert (ckpt.watermark, ckpt.above) == (0, {2, 3, 5})
+    ckpt.mark(1)
+    assert (ckpt.watermark, ckpt.above) == (3, {5})
+    ckpt.save()
+    assert Checkpoint(tmp_path / "c.json").done(5) and not Checkpoint(tmp_path / "c.json").done(4)
+
+
+def test_bounded_map_yields_finished_items_in_submission_order(monkeypatch):
+    import concurrent.futures
+    from resend_cli import bulk
+
+    # Every wait returns all pending futures at once, as when they finish together.
+    monkeypatch.setattr(bulk, "wait", lambda fs, return_when: concurrent.futures.wait(fs))
+    gen = bounded_map(lambda i: i, range(8), workers=8, max_pending=8)
+    assert [i for i, _ in gen] == list(range(8))
+
+
+def test_import_contacts_checkpoints_skipped_rows(tmp_path):
+    ckpt = Checkpoint(tmp_path / "c.json")
+    rows = [{"email": "a@x.com"}, {"email": "a@x.com"}, {"email": ""}, {"email": "old@x.com"}]
+    rows += [{"email": f"u{i}@x.com"} for i in range(2000)]
+    import_contacts(FakeContactClient(), "aud", rows, io.StringIO(), existing=["old@x.com"], checkpoint=ckpt)
+    assert (ckpt.watermark, ckpt.above, ckpt.failed) == (len(rows), set(), set())
+
+
+def test_import_contacts_keeps_failed_rows_apart(tmp_path):
+    ckpt = Checkpoint(tmp_path / "c.json")
+    rows = [{"email": "ok@x.com"}, {"email": "bad@x.com"}, {"email": "ok2@x.com"}]
+    import_contacts(FakeContactClient(fail_email="bad@x.com"), "aud", rows, io.StringIO(),
+                    checkpoint=ckpt, workers=1)
+    assert (ckpt.watermark, ckpt.failed) == (3, {2})
+    assert not Checkpoint(tmp_path / "c.json").done(2)
+
+
+def test_import_contacts_writes_created_contacts_to_mirror():
+    class Mirror:
+        def __init__(self):
+            self.added = []
+
+        def add_contact(self, audience_id, contact):
+            self.added.append((audience_id, contact))
+
+    mirror = Mirror()
+    import_contacts(FakeContactClient(fail_email="bad@x.com"), "aud",
+                    [{"email": "a@x.com", "first_name": "A"}, {"email": "bad@x.com"}], io.StringIO(), mirror=mirror)
+    assert mirror.added == [("aud", {"email": "a@x.com", "first_name": "A", "id": "id-a@x.com"})]
@@ -0,0 +1,87 @@
+"""Tests for the attachment cache."""
+
+import base64
+import os
+
+from resend_cli.attachments import FileAttachment
+from resend_cli.cache import AttachmentCache, CachedAttachment, attachment_loader
+
+
+def test_miss_then_hit(tmp_path):
+    f = tmp_path / "terms.pdf"
+    f.write_bytes(os.urandom(5000))
+    cache = AttachmentCache(tmp_path / "c")
+    first = cache.get(f)
+    assert isinstance(first, CachedAttachment)
+    assert first.filename == "terms.pdf"
+    assert b"".join(first.iter_base64()) == base64.b64encode(f.read_bytes())
+    second = cache.get(f)
+    assert second.path == first.path
+    assert second.encoded_size == FileAttachment(f).encoded_size
+
+
+def test_identical_content_shares_blob(tmp_path):
+    a, b = tmp_path / "a.png", tmp_path / "b.png"
+    a.write_bytes(b"logo")
+    b.write_bytes(b"logo")
+    cache = AttachmentCache(tmp_path / "c")
+    assert cache.get(a).path == cache.get(b).path
+    assert cache.get(b).filename == "b.png"
+
+
+def test_modified_file_reencoded(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_bytes(b"one")
+    cache = AttachmentCache(tmp_path / "c")
+    first = cache.get(f)
+    f.write_bytes(b"two!")
+    os.utime(f, ns=(f.stat().st_atime_ns, f.stat().st_mtime_ns + 10**9))
+    second = cache.get(f)
+    assert second.path != first.path
+    assert base64.b64decode(b"".join(second.iter_base64())) == b"two!"
+
+
+def test_lru_eviction(tmp_path):
+    cache = AttachmentCache(tmp_path / "c", max_bytes=3000)
+    files = []
+    for i in range(3):
+        f = tmp_path / f"f{i}.bin"
+        f.write_bytes(os.urandom(1500))  # 2000 bytes encoded
+        files.append(f)
+    old = cache.get(files[0])
+    os.utime(old.path, ns=(0, 0))
+    cache.get(files[1])
+    assert not old.path.exists()
+    assert len(list(cache.blobs.glob("*.b64"))) == 1
+    assert len(list(cache.index.iterdir())) == 1
+
+
+def test_recently_used_blobs_are_not_evicted(tmp_path):
+    cache = AttachmentCache(tmp_path / "c", max_bytes=3000)
+    files = []
+    for i in range(2):
+        f = tmp_path / f"f{i}.bin"
+        f.write_bytes(os.urandom(1500))
+        files.append(f)
+    first = cache.get(files[0])
+    cache.get(files[1])
+    assert first.path.exists()
+
+
+def test_evicted_blob_is_reencoded_from_source(tmp_path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(os.urandom(5000))
+    att = AttachmentCache(tmp_path / "c").get(f)
+    att.path.unlink()
+    assert b"".join(att.iter_base64()) == base64.b64encode(f.read_bytes())
+
+
+def test_oversized_blob_kept_for_current_send(tmp_path):
+    f = tmp_path / "big.bin"
+    f.write_bytes(os.urandom(3000))
+    att = AttachmentCache(tmp_path / "c", max_bytes=10).get(f)
+    assert att.path.exists()
+
+
+def test_loader_disabled(tmp_path):
+    assert attachment_loader(0) is FileAttachment
@@ -1,11 +1,15 @@
 """Tests for CLI commands."""
 
 import json
+import subprocess
+import sys
+
 import pytest
 from unittest.mock import patch, MagicMock
 from click.testing import CliRunner
 
 from resend_cli.cli import cli
+from resend_cli.errors import ResendError
 
 
 @pytest.fixture
@@ -92,6 +96,121 @@ class TestSendCommand:
         payload = mock_client.send_email.call_args[0][0]
         assert payload["from"] == "Other <other@x.com>"
 
+    def test_send_idempotency_key_is_http_header(self, runner, mock_client):
+        mock_client.send_email.return_value = {"id": "e9"}
+        result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--idempotency-key", "k1"])
+        assert result.exit_code == 0
+        assert mock_client.send_email.call_args[1]["idempotency_key"] == "k1"
+        assert "headers" not in mock_client.send_email.call_args[0][0]
+
+    def test_send_skips_journal_by_default(self, runner, mock_client, monkeypatch):
+        import resend_cli.cli as cli_module
+        monkeypatch.setattr(cli_module, "open_journal", lambda: pytest.fail("journal opened"))
+        mock_client.send_email.return_value = {"id": "e1"}
+        result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body"])
+        assert result.exit_code == 0
+        assert mock_client.send_email.call_args.kwargs["idempotency_key"] is None
+
+    def test_send_journal_then_resume(self, runner, mock_client):
+        mock_client.send_email.return_value = {"id": "e1"}
+        args = ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body"]
+        assert runner.invoke(cli, args + ["--journal"]).exit_code == 0
+        result = runner.invoke(cli, args + ["--resume"])
+        assert result.exit_code == 0
+        assert "Already sent" in result.output
+        assert mock_client.send_email.call_count == 1
+
+    def test_send_resume_skips_sent_email(self, runner, mock_client):
+        mock_client.send_email.return_value = {"id": "e1"}
+        args = ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--resume"]
+        assert runner.invoke(cli, args).exit_code == 0
+        key = mock_client.send_email.call_args.kwargs["idempotency_key"]
+        assert key.startswith("resend-cli-")
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0
+        assert "Already sent" in result.output
+        assert mock_client.send_email.call_count == 1
+
+    def test_send_retry_reuses_key(self, runner, mock_client):
+        from resend_cli.client import ResendError
+        mock_client.send_email.side_effect = [ResendError(500, "boom"), {"id": "e1"}]
+        args = ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--resume"]
+        assert runner.invoke(cli, args).exit_code == 1
+        assert runner.invoke(cli, args).exit_code == 0
+        first, second = [c.kwargs["idempotency_key"] for c in mock_client.send_email.call_args_list]
+        assert first == second
+
+    def test_send_priority_needs_queue(self, runner, mock_client):
+        result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body",
+                                     "--priority", "high"])
+        assert result.exit_code == 2
+        assert "--priority only applies with --queue" in result.output
+        mock_client.send_email.assert_not_called()
+
+    def test_send_queue_then_worker(self, runner, mock_client, tmp_path):
+        spool = tmp_path / "spool"
+        result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body",
+                                     "--queue", "--spool", str(spool)])
+        assert result.exit_code == 0
+        mock_client.send_email.assert_not_called()
+        mock_client.send_email.return_value = {"id": "e1"}
+        result = runner.invoke(cli, ["worker", "--once", "--spool", str(spool)])
+        assert result.exit_code == 0
+        assert mock_client.send_email.call_args[0][0]["subject"] == "Hi"
+        assert '"id": "e1"' in result.output
+        assert list((spool / "new").iterdir()) == []
+
+    def test_only_worker_refills_retry_budget(self, runner, tmp_path, monkeypatch):
+        monkeypatch.setenv("RESEND_API_KEY", "re_window_test")
+        monkeypatch.setenv("RESEND_NO_DAEMON", "1")
+        with patch("resend_cli.client.get_shared_client") as shared:
+            shared.return_value.list_domains.return_value = {"data": []}
+            runner.invoke(cli, ["domains", "list"])
+            assert shared.call_args.kwargs["retry_policy"] is None
+            runner.invoke(cli, ["worker", "--once", "--spool", str(tmp_path / "spool")])
+            assert shared.call_args.kwargs["retry_policy"].budget_window == 60.0
+
+    def test_send_batch_queue_priority(self, runner, mock_client, tmp_path):
+        f = tmp_path / "mails.csv"
+        f.write_text("to,subject,text\na@b.com,News,Body\n")
+        spool = tmp_path / "spool"
+        result = runner.invoke(cli, ["send-batch", str(f), "--queue", "--spool", str(spool)])
+        assert result.exit_code == 0
+        assert "Queued 1 in the bulk lane" in result.output
+        runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Reset", "--text", "x",
+                            "--queue", "--priority", "high", "--spool", str(spool)])
+        mock_client.send_email.return_value = {"id": "e1"}
+        result = runner.invoke(cli, ["worker", "--once", "--workers", "1", "--spool", str(spool)])
+        assert [c[0][0]["subject"] for c in mock_client.send_email.call_args_list] == ["Reset", "News"]
+        assert "high: 1 emails" in result.output
+        mock_client.send_batch.assert_not_called()
+
+    def test_send_attachment_streamed(self, runner, mock_client, tmp_path):
+        from resend_cli.attachments import FileAttachment
+        f = tmp_path / "report.csv"
+        f.write_text("a,b\n")
+        mock_client.send_email.return_value = {"id": "e10"}
+        result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--attach", str(f)])
+        assert result.exit_code == 0
+        att = mock_client.send_email.call_args[0][0]["attachments"][0]
+        assert isinstance(att, FileAttachment) and att.filename == "report.csv"
+
+    def test_send_attachment_uses_cache(self, runner, mock_client, tmp_path, isolated_cache_dir):
+        f = tmp_path / "terms.pdf"
+        f.write_bytes(b"%PDF-1.4")
+        mock_client.send_email.return_value = {"id": "e11"}
+        for _ in range(2):
+            result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--attach", str(f)])
+            assert result.exit_code == 0
+        assert len(list((isolated_cache_dir / "attachments" / "blobs").glob("*.b64"))) == 1
+
+    def test_send_attachment_dry_run(self, runner, mock_client, tmp_path):
+        f = tmp_path / "report.csv"
+        f.write_text("a,b\n")
+        result = runner.invoke(cli, ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--attach", str(f), "--dry-run"])
+        assert result.exit_code == 0
+        assert "YSxiCg==" in result.output
+
     def test_send_error(self, runner, mock_client):
         from resend_cli.client import ResendError
         mock_client.send_email.side_effect = ResendError(422, "Invalid")
@@ -99,23 +218,107 @@ class TestSendCommand:
         assert result.exit_code != 0
 
 
+class TestProfileOption:
+    def test_profile_selects_sender(self, runner, tmp_path):
+        creds = tmp_path / "resend.env"
+        creds.write_text("RESEND_FROM=Default <d@x.com>\n[prod]\nRESEND_FROM=Prod <p@x.com>\n")
+        with patch("resend_cli.config.CREDENTIALS_PATH", creds), patch.dict("os.environ", {}, clear=True):
+            result = runner.invoke(cli, ["--profile", "prod", "send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--dry-run"])
+        assert result.exit_code == 0
+        assert "Prod <p@x.com>" in result.output
+
+    def test_unknown_profile(self, runner, tmp_path):
+        creds = tmp_path / "resend.env"
+        creds.write_text("RESEND_FROM=Default <d@x.com>\n")
+        with patch("resend_cli.config.CREDENTIALS_PATH", creds):
+            result = runner.invoke(cli, ["--profile", "nope", "send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body"])
+        assert result.exit_code == 1
+        assert "Profile 'nope' not found" in result.output
+
+
+class TestOutputOption:
+    def test_contacts_jsonl(self, runner, mock_client):
+        mock_client.iter_contacts.return_value = iter([{"id": "c1", "email": "x@y.com"}, {"id": "c2", "email": "z@y.com"}])
+        result = runner.invoke(cli, ["--output", "jsonl", "contacts", "list", "--audience", "aud1"])
+        assert result.exit_code == 0
+        assert [json.loads(l)["id"] for l in result.output.splitlines()] == ["c1", "c2"]
+
+    def test_domains_csv(self, runner, mock_client):
+        mock_client.iter_domains.return_value = iter([{"id": "d1", "name": "auri.email", "status": "verified"}])
+        result = runner.invoke(cli, ["-o", "csv", "domains", "list"])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[0] == "id,name,status,region,created_at"
+        assert result.output.splitlines()[1].startswith("d1,auri.email,verified")
+
+    def test_status_json(self, runner, mock_client):
+        mock_client.get_email.return_value = {"id": "e1", "last_event": "delivered"}
+        result = runner.invoke(cli, ["--output", "json", "status", "e1"])
+        assert json.loads(result.output) == {"id": "e1", "last_event": "delivered"}
+
+    def test_dry_run_json(self, runner, mock_client):
+        result = runner.invoke(cli, ["-o", "json", "send", "--to", "a@b.com", "--subject", "Hi", "--text", "Body", "--dry-run"])
+        assert json.loads(result.output)["subject"] == "Hi"
+
+
+class TestSendBatchCommand:
+    def test_send_batch_csv(self, runner, mock_client, tmp_path):
+        f = tmp_path / "mails.csv"
+        f.write_text("to,subject,text\na@b.com;c@d.com,Hi,Body\ne@f.com,Yo,Text\n")
+        mock_client.send_batch.return_value = [{"id": "e1"}, {"id": "e2"}]
+        result = runner.invoke(cli, ["send-batch", str(f), "--from", "Me <me@x.com>"])
+        assert result.exit_code == 0
+        payloads = mock_client.send_batch.call_args[0][0]
+        assert payloads[0]["to"] == ["a@b.com", "c@d.com"]
+        assert payloads[1]["from"] == "Me <me@x.com>"
+        lines = [json.loads(l) for l in result.stdout.splitlines() if l.startswith("{")]
+        assert {(l["row"], l["id"]) for l in lines} == {(1, "e1"), (2, "e2")}
+
+    def test_send_batch_error_exit(self, runner, mock_client, tmp_path):
+        from resend_cli.client import ResendError
+        f = tmp_path / "mails.jsonl"
+        f.write_text('{"to": ["a@b.com"], "subject": "Hi", "text": "x"}\n')
+        mock_client.send_batch.side_effect = ResendError(422, "Invalid")
+        result = runner.invoke(cli, ["send-batch", str(f)])
+        assert result.exit_code == 1
+        assert '"status_code": 422' in result.stdout
+
+    def test_send_batch_resume(self, runner, mock_client, tmp_path):
+        f = tmp_path / "mails.csv"
+        f.write_text("to,subject,text\na@b.com,Hi,Body\n")
+        mock_client.send_batch.return_value = [{"id": "e1"}]
+        assert runner.invoke(cli, ["send-batch", str(f)]).exit_code == 0
+        result = runner.invoke(cli, ["send-batch", str(f), "--resume"])
+        assert result.exit_code == 0
+        assert "skipped 1 already sent" in result.output
+        assert mock_client.send_batch.call_count == 1
+
+
 class TestInboxCommand:
+    def test_inbox_streams_in_pages(self, runner, mock_client):
+        items = [{"id": f"in{i}", "from": "", "subject": "", "created_at": ""} for i in range(150)]
+        mock_client.iter_inbound.return_value = iter(items)
+        result = runner.invoke(cli, ["inbox"])
+        assert result.exit_code == 0
+        assert result.output.count("Inbound Emails") == 1
+        assert "in149" in result.output
+
     def test_inbox_list(self, runner, mock_client):
-        mock_client.list_inbound.return_value = [{"id": "in1", "from": "x@y.com", "subject": "Test", "created_at": "2026-01-01"}]
+        mock_client.iter_inbound.return_value = [{"id": "in1", "from": "x@y.com", "subject": "Test", "created_at": "2026-01-01"}]
         result = runner.invoke(cli, ["inbox"])
         assert result.exit_code == 0
         assert "in1" in result.output
 
     def test_inbox_list_empty(self, runner, mock_client):
-        mock_client.list_inbound.return_value = []
+        mock_client.iter_inbound.return_value = []
         result = runner.invoke(cli, ["inbox"])
         assert result.exit_code == 0
         assert "No inbound" in result.output
 
     def test_inbox_limit(self, runner, mock_client):
-        mock_client.list_inbound.return_value = [{"id": f"in{i}", "from": "", "subject": "", "created_at": ""} for i in range(10)]
+        mock_client.iter_inbound.return_value = [{"id": f"in{i}", "from": "", "subject": "", "created_at": ""} for i in range(10)]
         result = runner.invoke(cli, ["inbox", "--limit", "3"])
         assert result.exit_code == 0
+        assert mock_client.iter_inbound.call_args[1]["limit"] == 3
 
     def test_inbox_read(self, runner, mock_client):
         mock_client.get_inbound.return_value = {"id": "in1", "from": "x@y.com", "to": ["a@b.com"], "subject": "Hi", "created_at": "2026-01-01", "text": "Hello", "html": ""}
@@ -131,10 +334,22 @@ class TestStatusCommand:
         assert result.exit_code == 0
         assert "delivered" in result.output
 
+    def test_status_watch_from_file(self, runner, mock_client, tmp_path):
+        f = tmp_path / "ids.txt"
+        f.write_text("e1\ne2\n")
+        mock_client.get_email.side_effect = lambda email_id: {"id": email_id, "last_event": "delivered"}
+        result = runner.invoke(cli, ["-o", "jsonl", "status", "--watch", "--file", str(f), "--budget", "0"])
+        assert result.exit_code == 0
+        assert sorted(json.loads(line)["id"] for line in result.output.splitlines()) == ["e1", "e2"]
+
+    def test_status_requires_id(self, runner, mock_client):
+        result = runner.invoke(cli, ["status"])
+        assert result.exit_code == 2
+
 
 class TestDomainsCommand:
     def test_domains_list(self, runner, mock_client):
-        mock_client.list_domains.return_value = [{"id": "d1", "name": "auri.email", "status": "verified"}]
+        mock_client.iter_domains.return_value = [{"id": "d1", "name": "auri.email", "status": "verified"}]
         result = runner.invoke(cli, ["domains", "list"])
         assert result.exit_code == 0
         assert "auri.email" in result.output
@@ -147,7 +362,7 @@ class TestDomainsCommand:
 
 class TestAudiencesCommand:
     def test_audiences_list(self, runner, mock_client):
-        mock_client.list_audiences.return_value = [{"id": "aud1", "name": "News"}]
+        mock_client.iter_audiences.return_value = [{"id": "aud1", "name": "News"}]
         result = runner.invoke(cli, ["audiences", "list"])
         assert result.exit_code == 0
         assert "News" in result.output
@@ -166,7 +381,7 @@ class TestAudiencesCommand:
 
 class TestContactsCommand:
     def test_contacts_list(self, runner, mock_client):
-        mock_client.list_contacts.return_value = [{"id": "c1", "email": "x@y.com", "first_name": "X", "last_name": "Y"}]
+        mock_client.iter_contacts.return_value = [{"id": "c1", "email": "x@y.com", "first_name": "X", "last_name": "Y"}]
         result = runner.invoke(cli, ["contacts", "list", "--audience", "aud1"])
         assert result.exit_code == 0
         assert "x@y.com" in result.output
@@ -181,3 +396,227 @@ class TestContactsCommand:
         mock_client.delete_contact.return_value = {"deleted": True}
         result = runner.invoke(cli, ["contacts", "remove", "--audience", "aud1", "--email", "c1"])
         assert result.exit_code == 0
+
+
+class TestContactsImport:
+    def test_import_skips_existing_and_removes_checkpoint(self, runner, mock_client, tmp_path):
+        f = tmp_path / "contacts.csv"
+        f.write_text("email,first_name\nold@x.com,Old\nnew@x.com,New\n")
+        ckpt = tmp_path / "ckpt.json"
+        mock_client.iter_contacts.return_value = iter([{"id": "c1", "email": "old@x.com"}])
+        mock_client.create_contact.return_value = {"id": "c2"}
+        result = runner.invoke(cli, ["contacts", "import", str(f), "--audience", "aud1",
+                                     "--checkpoint", str(ckpt)])
+        assert result.exit_code == 0
+        mock_client.create_contact.assert_called_once_with("aud1", "new@x.com", first_name="New")
+        assert "Created 1, skipped 1, failed 0" in result.output
+        assert not ckpt.exists()
+
+    def test_import_keeps_checkpoint_when_rows_fail(self, runner, mock_client, tmp_path):
+        f = tmp_path / "contacts.csv"
+        f.write_text("email\nbad@x.com\n")
+        ckpt = tmp_path / "ckpt.json"
+        mock_client.iter_contacts.return_value = iter([])
+        mock_client.create_contact.side_effect = ResendError(422, "invalid email")
+        result = runner.invoke(cli, ["contacts", "import", str(f), "--audience", "aud1",
+                                     "--checkpoint", str(ckpt)])
+        assert result.exit_code == 1
+        assert json.loads(ckpt.read_text())["failed"] == [1]
+
+
+class TestContactsReconcile:
+    def test_reconcile_dry_run(self, runner, mock_client, tmp_path):
+        f = tmp_path / "crm.csv"
+        f.write_text("email\nkeep@x.com\nnew@x.com\n")
+        mock_client.iter_contacts.return_value = iter([{"id": "c1", "email": "keep@x.com"},
+                                                       {"id": "c2", "email": "gone@x.com"}])
+        result = runner.invoke(cli, ["-o", "json", "contacts", "reconcile", str(f), "--audience", "aud1", "--dry-run"])
+        assert result.exit_code == 0
+        assert json.loads(result.output) == {"add": 1, "update": 0, "remove": 1, "unchanged": 1}
+        mock_client.create_contact.assert_not_called()
+        mock_client.delete_contact.assert_not_called()
+
+    def test_reconcile_dry_run_table(self, runner, mock_client, tmp_path):
+        f = tmp_path / "crm.csv"
+        f.write_text("email\nkeep@x.com\n")
+        mock_client.iter_contacts.return_value = iter([{"id": "c1", "email": "keep@x.com"}])
+        result = runner.invoke(cli, ["contacts", "reconcile", str(f), "--audience", "aud1", "--dry-run"])
+        assert result.exit_code == 0
+        assert "DRY RUN" in result.output and "Unchanged: 1" in result.output
+
+    def test_reconcile_rejects_source_without_email_column(self, runner, mock_client, tmp_path):
+        f = tmp_path / "crm.csv"
+        f.write_text("Email\nkeep@x.com\n")
+        mock_client.iter_contacts.return_value = iter([{"id": "c1", "email": "keep@x.com"}])
+        result = runner.invoke(cli, ["contacts", "reconcile", str(f), "--audience", "aud1"])
+        assert result.exit_code == 1
+        assert "no 'email' column" in result.output
+        mock_client.delete_contact.assert_not_called()
+
+    def test_reconcile_refuses_mass_remove(self, runner, mock_client, tmp_path):
+        f = tmp_path / "crm.csv"
+        f.write_text("email\nu0@x.com\n")
+        remote = [{"id": f"c{i}", "email": f"u{i}@x.com"} for i in range(20)]
+        mock_client.iter_contacts.side_effect = lambda audience: iter(remote)
+        result = runner.invoke(cli, ["contacts", "reconcile", str(f), "--audience", "aud1"])
+        assert result.exit_code == 1
+        assert "--allow-mass-remove" in result.output
+        mock_client.delete_contact.assert_not_called()
+        result = runner.invoke(cli, ["contacts", "reconcile", str(f), "--audience", "aud1", "--allow-mass-remove"])
+        assert result.exit_code == 0
+        assert mock_client.delete_contact.call_count == 19
+
+
+class TestExecCommand:
+    def test_exec_applies_send_defaults(self, runner, mock_client):
+        mock_client.send_email.return_value = {"id": "e1"}
+        mock_client.get_email.return_value = {"id": "e1", "last_event": "sent"}
+        ops = ('{"id": "s", "op": "send_email", "args": [{"to": "a@b.com;c@d.com", "subject": "Hi", "text": "x"}]}\n'
+               '{"id": "q", "op": "get_email", "args": ["e1"]}\n')
+        result = runner.invoke(cli, ["exec", "-"], input=ops)
+        assert result.exit_code == 0
+        payload = mock_client.send_email.call_args[0][0]
+        assert payload["to"] == ["a@b.com", "c@d.com"] and payload["from"]
+        ids = {json.loads(line)["id"] for line in result.stdout.splitlines()}
+        assert ids == {"s", "q"}
+
+
+class TestMirrorCommands:
+    def _sync(self, runner, mock_client):
+        mock_client.iter_audiences.return_value = iter([{"id": "aud1", "name": "News"}])
+        mock_client.iter_contacts.return_value = iter([{"id": "c1", "email": "x@y.com", "first_name": "X"}])
+        return runner.invoke(cli, ["sync"])
+
+    def test_sync(self, runner, mock_client):
+        result = self._sync(runner, mock_client)
+        assert result.exit_code == 0
+        assert "Contacts: 1" in result.output
+
+    def test_list_cached(self, runner, mock_client):
+        self._sync(runner, mock_client)
+        mock_client.iter_contacts.reset_mock()
+        result = runner.invoke(cli, ["-o", "jsonl", "contacts", "list", "--audience", "aud1", "--cached"])
+        assert result.exit_code == 0
+        assert json.loads(result.output)["email"] == "x@y.com"
+        mock_client.iter_contacts.assert_not_called()
+
+    def test_list_cached_requires_sync(self, runner, mock_client):
+        result = runner.invoke(cli, ["contacts", "list", "--audience", "aud1", "--cached"])
+        assert result.exit_code == 1
+        assert "resend-cli sync" in result.output
+
+    def test_remove_by_email_resolves_id(self, runner, mock_client):
+        self._sync(runner, mock_client)
+        mock_client.delete_contact.return_value = {"deleted": True}
+        result = runner.invoke(cli, ["contacts", "remove", "--audience", "aud1", "--email", "X@y.com"])
+        assert result.exit_code == 0
+        mock_client.delete_contact.assert_called_once_with("aud1", "c1")
+        result = runner.invoke(cli, ["contacts", "get", "--audience", "aud1", "--email", "x@y.com", "--cached"])
+        assert result.exit_code == 1
+
+    def test_get_cached(self, runner, mock_client):
+        self._sync(runner, mock_client)
+        result = runner.invoke(cli, ["contacts", "get", "--audience", "aud1", "--email", "x@y.com"])
+        assert result.exit_code == 0
+        assert "c1" in result.output
+        mock_client.get_contact.assert_not_called()
+
+
+class TestStats:
+    def test_stats_and_metrics_file(self, runner, mock_session, mock_response, tmp_path, monkeypatch):
+        monkeypatch.setenv("RESEND_API_KEY", "re_stats_test")
+        monkeypatch.setenv("RESEND_RATE_LIMIT", "0")
+        mock_session.request.return_value = mock_response(200, {"id": "e1", "last_event": "delivered"})
+        prom = tmp_path / "resend.prom"
+        result = runner.invoke(cli, ["--stats", "--metrics-file", str(prom), "status", "e1"])
+        assert result.exit_code == 0, result.output
+        assert "/emails/{id}" in result.stderr
+        assert 'resend_cli_requests_total{endpoint="/emails/{id}",method="GET",status="200"} 1' in prom.read_text()
+
+    def test_stats_written_on_failure(self, runner, mock_client):
+        mock_client.get_email.side_effect = ResendError(404, "not found")
+        result = runner.invoke(cli, ["--stats", "status", "e1"])
+        assert result.exit_code == 1
+        assert "No API requests made." in result.stderr
+
+
+class TestApiBase:
+    def test_commands_use_resend_api_base(self, runner, monkeypatch):
+        from resend_cli.stub_server import StubServer
+
+        with StubServer() as stub:
+            stub.add_domain("mail.example.com")
+            monkeypatch.setenv("RESEND_API_KEY", "re_stub_test")
+            monkeypatch.setenv("RESEND_API_BASE", stub.url + "/")
+            monkeypatch.setenv("RESEND_RATE_LIMIT", "0")
+            result = runner.invoke(cli, ["-o", "json", "domains", "list"])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output)[0]["name"] == "mail.example.com"
+
+
+class TestShards:
+    def test_send_batch_spreads_over_profiles(self, runner, tmp_path, monkeypatch):
+        from resend_cli.stub_server import StubServer
+
+        with StubServer() as one, StubServer() as two:
+            creds = tmp_path / "resend.env"
+            creds.write_text(f"RESEND_RATE_LIMIT=0\n[one]\nRESEND_API_KEY=re_one\nRESEND_API_BASE={one.url}\n"
+                             f"[two]\nRESEND_API_KEY=re_two\nRESEND_API_BASE={two.url}\n")
+            rows = tmp_path / "mails.jsonl"
+            rows.write_text("".join(f'{{"to": ["u{i}@x.com"], "subject": "S{i}", "text": "x"}}\n'
+                                    for i in range(40)))
+            monkeypatch.setattr("resend_cli.config.CREDENTIALS_PATH", creds)
+            monkeypatch.delenv("RESEND_API_KEY", raising=False)
+            result = runner.invoke(cli, ["send-batch", str(rows), "--shards", "one,two", "--shard-by", "round-robin",
+                                         "--batch-size", "5"])
+        assert result.exit_code == 0, result.output
+        assert len(one.emails) + len(two.emails) == 40
+        assert one.emails and two.emails
+        assert "Shard one:" in result.stderr and "Shard two:" in result.stderr
+
+
+class TestTimings:
+    def test_timings_summary(self, runner, mock_client):
+        mock_client.send_email.return_value = {"id": "e1"}
+        result = runner.invoke(cli, ["--timings", "send", "--to", "a@b.com", "--subject", "Hi", "--text", "x"])
+        assert result.exit_code == 0, result.output
+        assert "build" in result.stderr and "render" in result.stderr
+
+    def test_timings_out_pstats(self, runner, tmp_path):
+        import pstats
+
+        out = tmp_path / "send.pstats"
+        result = runner.invoke(cli, ["--timings-out", str(out), "send", "--to", "a@b.com", "--subject", "Hi",
+                                     "--text", "x", "--dry-run"])
+        assert result.exit_code == 0, result.output
+        assert pstats.Stats(str(out)).total_calls > 0
+
+    def test_timings_out_chrome_trace(self, runner, tmp_path):
+        out = tmp_path / "send.json"
+        result = runner.invoke(cli, ["--timings-out", str(out), "send", "--to", "a@b.com", "--subject", "Hi",
+                                     "--text", "x", "--dry-run"])
+        assert result.exit_code == 0, result.output
+        names = {e["name"] for e in json.loads(out.read_text())["traceEvents"]}
+        assert {"build", "render"} <= names
+
+
+class TestStartup:
+    @pytest.mark.parametrize("args", [["--help"], ["send", "--help"],
+                                      ["send", "--to", "a@b.com", "--subject", "Hi", "--text", "x", "--dry-run"]])
+    def test_requests_not_imported(self, args, tmp_path):
+        code = (
+            "import sys\n"
+            "from resend_cli.cli import cli\n"
+            f"cli({args!r}, standalone_mode=False)\n"
+            "print('requests' in sys.modules)\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                              env={"HOME": str(tmp_path), "PATH": ""})
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().endswith("False")
+
+    def test_help_does_not_import_rich(self, tmp_path):
+        code = "import sys\nfrom resend_cli.cli import cli\ncli(['--help'], standalone_mode=False)\nprint('rich' in sys.modules)\n"
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                              env={"HOME": str(tmp_path), "PATH": ""})
+        assert proc.stdout.strip().endswith("False")
@@ -1,10 +1,12 @@
 """Tests for the ResendClient."""
 
 import base64
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-from resend_cli.client import ResendClient, ResendError
+from resend_cli.client import ResendClient, ResendError, get_shared_client
+from resend_cli.retry import RetryPolicy
 
 
 class TestResendClient:
@@ -16,6 +18,14 @@ class TestResendClient:
         args = mock_session.request.call_args
         assert args[0] == ("POST", "https://api.resend.com/emails")
 
+    def test_send_batch(self, client, mock_session, mock_response):
+        mock_session.request.return_value = mock_response(200, {"data": [{"id": "e1"}, {"id": "e2"}]})
+        result = client.send_batch([{"to": ["a@b.com"]}, {"to": ["c@d.com"]}])
+        assert [r["id"] for r in result] == ["e1", "e2"]
+        args = mock_session.request.call_args
+        assert args[0] == ("POST", "https://api.resend.com/emails/batch")
+        assert len(json.loads(args[1]["data"])) == 2
+
     def test_get_email(self, client, mock_session, mock_response):
         mock_session.request.return_value = mock_response(200, {"id": "e1", "last_event": "delivered"})
         result = client.get_email("e1")
@@ -32,6 +42,33 @@ class TestResendClient:
         result = client.list_inbound()
         assert result == [{"id": "in1"}]
 
+    def test_iter_contacts_follows_cursor(self, client, mock_session, mock_response):
+        mock_session.request.side_effect = [
+            mock_response(200, {"has_more": True, "data": [{"id": "c1"}, {"id": "c2"}]}),
+            mock_response(200, {"has_more": False, "data": [{"id": "c3"}]}),
+        ]
+        assert [c["id"] for c in client.iter_contacts("aud1")] == ["c1", "c2", "c3"]
+        first, second = mock_session.request.call_args_list
+        assert first[1]["params"] == {"limit": 100}
+        assert second[1]["params"] == {"limit": 100, "after": "c2"}
+
+    def test_iter_limit_pushed_into_page_size(self, client, mock_session, mock_response):
+        mock_session.request.side_effect = [
+            mock_response(200, {"has_more": True, "data": [{"id": f"c{i}"} for i in range(100)]}),
+            mock_response(200, {"has_more": True, "data": [{"id": f"d{i}"} for i in range(30)]}),
+        ]
+        items = list(client.iter_contacts("aud1", limit=130))
+        assert len(items) == 130
+        assert mock_session.request.call_args_list[1][1]["params"]["limit"] == 30
+        assert mock_session.request.call_count == 2
+
+    def test_iter_is_lazy(self, client, mock_session, mock_response):
+        mock_session.request.return_value = mock_response(200, {"has_more": True, "data": [{"id": "x"}]})
+        it = client.iter_audiences()
+        assert mock_session.request.call_count == 0
+        next(it)
+        assert mock_session.request.call_count == 1
+
     def test_get_inbound(self, client, mock_session, mock_response):
         mock_session.request.return_value = mock_response(200, {"id": "in1", "subject": "Test"})
         result = client.get_inbound("in1")
@@ -108,9 +145,82 @@ class TestResendClient:
         assert result["id"] == "ok"
         assert mock_session.request.call_count == 2
 
+    def test_server_error_retried_for_get(self, client, mock_session, mock_response):
+        mock_session.request.side_effect = [mock_response(503), mock_response(200, {"id": "e1"})]
+        assert client.get_email("e1")["id"] == "e1"
+        assert mock_session.request.call_count == 2
+
+    def test_server_error_not_retried_for_plain_post(self, client, mock_session, mock_response):
+        mock_session.request.return_value = mock_response(503)
+        with pytest.raises(ResendError):
+            client.send_email({"to": ["a@b.com"]})
+        assert mock_session.request.call_count == 1
+
+    def test_server_error_retried_for_post_with_idempotency_key(self, client, mock_session, mock_response):
+        mock_session.request.side_effect = [mock_response(502), mock_response(200, {"id": "ok"})]
+        result = client.send_email({"to": ["a@b.com"]}, idempotency_key="k1")
+        assert result["id"] == "ok"
+        assert mock_session.request.call_args[1]["headers"] == {"Idempotency-Key": "k1"}
+
+    def test_connection_error_retried_then_raised(self, client, mock_session):
+        import requests
+        mock_session.request.side_effect = requests.ConnectionError("reset")
+        with pytest.raises(requests.ConnectionError):
+            client.get_email("e1")
+        assert mock_session.request.call_count == client.retry_policy.max_attempts
+
+    def test_send_email_streams_file_attachments(self, client, mock_session, mock_response, tmp_path):
+        from resend_cli.attachments import FileAttachment, StreamingBody
+        f = tmp_path / "a.pdf"
+        f.write_bytes(b"%PDF")
+        mock_session.request.return_value = mock_response(200, {"id": "e1"})
+        client.send_email({"to": ["a@b.com"], "attachments": [FileAttachment(f)]})
+        kwargs = mock_session.request.call_args[1]
+        assert "json" not in kwargs
+        assert isinstance(kwargs["data"], StreamingBody)
+
+    def test_send_email_rejects_oversized_attachments(self, client, mock_session, tmp_path):
+        from resend_cli.attachments import FileAttachment
+        f = tmp_path / "huge.bin"
+        f.write_bytes(b"x")
+        att = FileAttachment(f)
+        att.size = 31 * 1024 * 1024
+        with pytest.raises(ResendError) as exc:
+            client.send_email({"to": ["a@b.com"], "attachments": [att]})
+        assert exc.value.status_code == 413
+        mock_session.request.assert_not_called()
+
     def test_encode_attachment(self, tmp_path):
         f = tmp_path / "test.txt"
         f.write_bytes(b"hello world")
         att = ResendClient.encode_attachment(str(f))
         assert att["filename"] == "test.txt"
         assert base64.b64decode(att["content"]) == b"hello world"
+
+    def test_rate_limiter_acquired_per_request(self, mock_session, mock_response):
+        limiter = MagicMock()
+        client = ResendClient("test_api_key", rate_limiter=limiter,
+                              retry_policy=RetryPolicy(sleep=lambda s: None))
+        mock_session.request.side_effect = [mock_response(429, headers={"Retry-After": "0"}),
+                                            mock_response(200, {"id": "ok"})]
+        client.send_email({"to": ["a@b.com"]})
+        assert limiter.acquire.call_count == 2
+
+
+class TestConnectionPool:
+    def test_adapter_mounted_with_pool_options(self, mock_session):
+        ResendClient("k", pool_connections=3, pool_maxsize=16, pool_block=True)
+        mounted = {call[0][0]: call[0][1] for call in mock_session.mount.call_args_list}
+        assert set(mounted) == {"https://", "http://"}
+        adapter = mounted["https://"]
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 16
+        assert adapter._pool_block is True
+        assert adapter.max_retries.total == 0
+
+    def test_shared_client_reused(self, mock_session):
+        a = get_shared_client("shared_key", base_url="https://example.test/")
+        b = get_shared_client("shared_key", base_url="https://example.test")
+        c = get_shared_client("other_key", base_url="https://example.test")
+        assert a is b
+        assert a is not c
@@ -4,11 +4,15 @@ import os
 import pytest
 from unittest.mock import patch
 
+from resend_cli import config
 from resend_cli.config import (
+    get_config,
     load_api_key,
     get_default_from,
     get_default_reply_to,
     get_default_signature,
+    get_pool_options,
+    get_rate_limit,
 )
 
 
@@ -91,3 +95,87 @@ def test_get_default_reply_to_env():
 def test_get_default_signature_env():
     with patch.dict(os.environ, {"RESEND_SIGNATURE": "-- Test Agent"}):
         assert get_default_signature() == "-- Test Agent"
+
+
+def test_get_rate_limit_env():
+    with patch.dict(os.environ, {"RESEND_RATE_LIMIT": "5"}):
+        assert get_rate_limit() == 5.0
+
+
+def test_get_rate_limit_default():
+    with patch.dict(os.environ, {}, clear=True):
+        with patch("resend_cli.config.CREDENTIALS_PATH") as mock_path:
+            mock_path.exists.return_value = False
+            assert get_rate_limit() == 2.0
+
+
+def test_get_rate_limit_invalid():
+    with patch.dict(os.environ, {"RESEND_RATE_LIMIT": "fast"}):
+        with pytest.raises(RuntimeError, match="RESEND_RATE_LIMIT"):
+            get_rate_limit()
+
+
+def test_get_pool_options_env():
+    env = {"RESEND_POOL_MAXSIZE": "32", "RESEND_POOL_CONNECTIONS": "4", "RESEND_POOL_BLOCK": "true"}
+    with patch.dict(os.environ, env):
+        assert get_pool_options() == {"pool_connections": 4, "pool_maxsize": 32, "pool_block": True}
+
+
+def test_get_pool_options_default():
+    with patch.dict(os.environ, {}, clear=True):
+        with patch("resend_cli.config.CREDENTIALS_PATH") as mock_path:
+            mock_path.exists.return_value = False
+            assert get_pool_options() == {"pool_connections": 10, "pool_maxsize": 10, "pool_block": False}
+
+
+PROFILES = """RESEND_API_KEY=re_default
+RESEND_FROM=Default <d@x.com>
+[prod]
+RESEND_API_KEY=re_prod
+RESEND_FROM="Prod <p@x.com>"
+"""
+
+
+def _write_creds(tmp_path, text):
+    path = tmp_path / "resend.env"
+    path.write_text(text)
+    return path
+
+
+def test_credentials_parsed_once_while_unchanged(tmp_path):
+    path = _write_creds(tmp_path, PROFILES)
+    with patch.dict(os.environ, {}, clear=True), patch("resend_cli.config.CREDENTIALS_PATH", path):
+        with patch("resend_cli.config._parse_credentials", wraps=config._parse_credentials) as parse:
+            load_api_key()
+            get_default_from()
+            get_default_reply_to()
+            get_default_signature()
+            assert parse.call_count == 1
+            path.write_text("RESEND_API_KEY=re_rotated\n")
+            os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+            assert load_api_key() == "re_rotated"
+            assert parse.call_count == 2
+
+
+def test_named_profile_overrides(tmp_path):
+    path = _write_creds(tmp_path, PROFILES)
+    with patch.dict(os.environ, {"RESEND_API_KEY": "re_env"}, clear=True), \
+            patch("resend_cli.config.CREDENTIALS_PATH", path):
+        assert get_config().api_key == "re_env"
+        prod = get_config("prod")
+        assert prod.api_key == "re_prod"
+        assert prod.default_from == "Prod <p@x.com>"
+        assert prod.profile == "prod"
+
+
+def test_profile_inherits_top_level(tmp_path):
+    path = _write_creds(tmp_path, "RESEND_SIGNATURE=-- Sig\n[bulk]\nRESEND_API_KEY=re_bulk\n")
+    with patch.dict(os.environ, {}, clear=True), patch("resend_cli.config.CREDENTIALS_PATH", path):
+        assert get_config("bulk").signature == "-- Sig"
+
+
+def test_unknown_profile_raises(tmp_path):
+    path = _write_creds(tmp_path, PROFILES)
+    with patch("resend_cli.config.CREDENTIALS_PATH", path):
+        with pytest.raises(RuntimeError, match="Profile 'staging' not found"):
+            get_config("staging")
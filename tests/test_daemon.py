@@ -0,0 +1,117 @@
+"""Tests for the daemon and the proxy client."""
+
+import socket
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from resend_cli.attachments import FileAttachment
+from resend_cli.cache import AttachmentCache, CachedAttachment
+from resend_cli.cli import cli
+from resend_cli.client import ResendError
+from resend_cli.daemon import DaemonServer, connect, daemon_path
+
+
+class FakeClient:
+    def __init__(self):
+        self.payloads = []
+
+    def get_email(self, email_id):
+        if email_id == "missing":
+            raise ResendError(404, "Email not found")
+        return {"id": email_id, "last_event": "delivered"}
+
+    def iter_contacts(self, audience_id, limit=None, after=None):
+        yield from ({"id": f"c{i}", "email": f"u{i}@x.com"} for i in range(limit or 3))
+
+    def send_email(self, payload, idempotency_key=None):
+        self.payloads.append((payload, idempotency_key))
+        return {"id": "sent-1"}
+
+    def get_inbound(self, email_id):
+        raise ValueError("boom")
+
+
+@pytest.fixture
+def daemon(isolated_cache_dir):
+    client = FakeClient()
+    server = DaemonServer(daemon_path(), client, "re_key")
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_proxy_calls(daemon):
+    proxy = connect(daemon.path, "re_key")
+    assert proxy.get_email("e1") == {"id": "e1", "last_event": "delivered"}
+    assert [c["id"] for c in proxy.iter_contacts("aud", limit=2)] == ["c0", "c1"]
+
+
+def test_errors_cross_the_socket(daemon):
+    proxy = connect(daemon.path, "re_key")
+    with pytest.raises(ResendError) as exc:
+        proxy.get_email("missing")
+    assert exc.value.status_code == 404
+    with pytest.raises(RuntimeError, match="boom"):
+        proxy.get_inbound("x")
+    with pytest.raises(AttributeError):
+        proxy.session
+
+
+def test_attachments_sent_as_paths(daemon, tmp_path):
+    f = tmp_path / "report.pdf"
+    f.write_bytes(b"%PDF")
+    proxy = connect(daemon.path, "re_key")
+    proxy.send_email({"to": ["a@b.com"], "attachments": [FileAttachment(f)]}, idempotency_key="k")
+    payload, key = daemon.client.payloads[0]
+    assert isinstance(payload["attachments"][0], FileAttachment)
+    assert payload["attachments"][0].path == f and key == "k"
+
+
+def test_cached_attachment_subclass_travels_as_blob(daemon, tmp_path):
+    class Tracked(CachedAttachment):
+        pass
+
+    f = tmp_path / "report.pdf"
+    f.write_bytes(b"%PDF")
+    blob = AttachmentCache(tmp_path / "c").get(f)
+    proxy = connect(daemon.path, "re_key")
+    proxy.send_email({"to": ["a@b.com"], "attachments": [Tracked(blob.path, "report.pdf", f)]})
+    sent = daemon.client.payloads[0][0]["attachments"][0]
+    assert isinstance(sent, CachedAttachment)
+    assert (sent.path, sent.source) == (blob.path, f)
+
+
+def test_other_api_key_not_served(daemon):
+    assert connect(daemon.path, "re_other") is None
+
+
+def test_no_daemon(isolated_cache_dir):
+    assert connect(daemon_path(), "re_key") is None
+
+
+def test_second_daemon_refused(daemon):
+    with pytest.raises(RuntimeError, match="already listening"):
+        DaemonServer(daemon.path, FakeClient(), "re_other")
+
+
+def test_stale_socket_replaced(isolated_cache_dir):
+    path = daemon_path()
+    path.parent.mkdir(parents=True)
+    dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    dead.bind(str(path))
+    dead.close()
+    server = DaemonServer(path, FakeClient(), "re_key")
+    assert oct(path.stat().st_mode & 0o777) == oct(0o600)
+    server.server_close()
+    assert not path.exists()
+
+
+def test_cli_forwards_to_daemon(daemon, monkeypatch):
+    monkeypatch.setenv("RESEND_API_KEY", "re_key")
+    result = CliRunner().invoke(cli, ["-o", "json", "status", "e1"])
+    assert result.exit_code == 0
+    assert '"last_event": "delivered"' in result.output
@@ -0,0 +1,104 @@
+"""Tests for the send journal."""
+
+import io
+import os
+
+import pytest
+
+from resend_cli.attachments import FileAttachment
+from resend_cli.cache import AttachmentCache, CachedAttachment
+from resend_cli.bulk import send_batches
+from resend_cli.journal import SENT, Journal, payload_hash
+
+from .test_bulk import FakeBatchClient
+
+ROWS = [{"to": [f"u{i}@x.com"], "subject": str(i)} for i in range(1, 5)]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    j = Journal(tmp_path / "journal.sqlite3")
+    yield j
+    j.close()
+
+
+def test_payload_hash_canonical(tmp_path):
+    assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+    f = tmp_path / "a.txt"
+    f.write_text("one")
+    first = payload_hash({"attachments": [FileAttachment(f)]})
+    assert payload_hash({"attachments": [FileAttachment(f)]}) == first
+    f.write_text("two")
+    os.utime(f, ns=(f.stat().st_atime_ns, f.stat().st_mtime_ns + 10**9))
+    assert payload_hash({"attachments": [FileAttachment(f)]}) != first
+
+
+def test_payload_hash_does_not_read_attachments(tmp_path, monkeypatch):
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"x" * 3000)
+    cached = AttachmentCache(tmp_path / "c").get(f)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("attachment content was read")
+
+    monkeypatch.setattr(FileAttachment, "iter_base64", fail)
+    monkeypatch.setattr(CachedAttachment, "iter_base64", fail)
+    first = payload_hash({"attachments": [cached]})
+    assert payload_hash({"attachments": [AttachmentCache(tmp_path / "c").get(f)]}) == first
+    assert payload_hash({"attachments": [FileAttachment(f)]}) != first
+
+
+def test_records_sends_and_resume_skips_them(journal):
+    run = journal.start("batch")
+    client = FakeBatchClient()
+    assert send_batches(client, ROWS, io.StringIO(), batch_size=2, journal=run) == (4, 0)
+    assert all(key and key.startswith("resend-cli-") for key in client.keys)
+    assert run.entry(3)["status"] == SENT and run.entry(3)["email_id"] == "id-3"
+
+    resumed = journal.start("batch", resume=True)
+    again = FakeBatchClient()
+    assert send_batches(again, ROWS, io.StringIO(), batch_size=2, journal=resumed) == (0, 0)
+    assert again.calls == [] and resumed.skipped == 4
+
+
+def test_resume_replays_in_flight_group_with_same_key(journal):
+    run = journal.start("batch")
+    rows = [(n, payload_hash(ROWS[n - 1])) for n in (1, 2)]
+    key = run.key_for(rows)
+    run.plan(rows, key)  # crashed with this request in flight
+    run.plan([(3, payload_hash(ROWS[2]))], "k3")
+    run.sent([3], ["id-3"])
+
+    client = FakeBatchClient()
+    resumed = journal.start("batch", resume=True)
+    send_batches(client, ROWS, io.StringIO(), batch_size=2, journal=resumed)
+    assert [[p["subject"] for p in call] for call in client.calls] == [["1", "2"], ["4"]]
+    assert client.keys[0] == key and client.keys[1] != key
+    assert resumed.skipped == 1
+
+
+def test_resume_rejects_changed_input(journal):
+    run = journal.start("batch")
+    send_batches(FakeBatchClient(fail_on="2"), ROWS[:2], io.StringIO(), journal=run)
+    changed = [ROWS[0], {**ROWS[1], "subject": "edited"}]
+    with pytest.raises(ValueError, match="row 2"):
+        send_batches(FakeBatchClient(), changed, io.StringIO(), journal=journal.start("batch", resume=True))
+
+
+def test_new_run_gets_new_keys(journal):
+    first, second = journal.start("batch"), journal.start("batch")
+    rows = [(1, "abc")]
+    assert first.key_for(rows) != second.key_for(rows)
+
+
+def test_prune_drops_old_finished_runs(journal):
+    old, open_run, recent = journal.start("a"), journal.start("b"), journal.start("c")
+    for run in (old, open_run, recent):
+        run.plan([(1, "abc")], "k")
+    old.finish()
+    recent.finish()
+    journal.db.execute("UPDATE runs SET finished_at = 0 WHERE id = ?", (old.id,))
+    journal.db.execute("UPDATE runs SET started_at = 0 WHERE id = ?", (open_run.id,))
+    assert journal.prune(max_age=3600) == 1
+    assert old.entry(1) is None
+    assert open_run.entry(1) is not None and recent.entry(1) is not None
@@ -0,0 +1,64 @@
+"""Tests for the priority lane scheduler."""
+
+import pytest
+
+from resend_cli.lanes import LaneScheduler
+
+
+def drain(sched, n=None):
+    out = []
+    while (n is None or len(out) < n) and (item := sched.pop()) is not None:
+        out.append(item[0])
+    return out
+
+
+def test_high_goes_first():
+    sched = LaneScheduler()
+    sched.push("bulk", 1)
+    sched.push("normal", 2)
+    sched.push("high", 3)
+    assert drain(sched) == ["high", "normal", "bulk"]
+
+
+def test_bulk_not_starved():
+    sched = LaneScheduler()
+    for i in range(200):
+        sched.push("high", i)
+        sched.push("normal", i)
+    sched.push("bulk", 0)
+    order = drain(sched, 26)
+    assert "bulk" in order
+    assert order.count("high") >= 19
+
+
+def test_shares_follow_weights():
+    sched = LaneScheduler({"high": 3, "bulk": 1})
+    for i in range(100):
+        sched.push("high", i)
+        sched.push("bulk", i)
+    order = drain(sched, 40)
+    assert order.count("high") == 30 and order.count("bulk") == 10
+
+
+def test_idle_lane_does_not_bank_credit():
+    sched = LaneScheduler({"high": 1, "bulk": 1})
+    for i in range(10):
+        sched.push("bulk", i)
+    drain(sched, 10)
+    for i in range(10):
+        sched.push("bulk", i)
+        sched.push("high", i)
+    # Had high banked its idle time it would now take ten in a row.
+    assert drain(sched, 4) == ["high", "bulk", "high", "bulk"]
+
+
+def test_wait_stats():
+    sched = LaneScheduler()
+    sched.record_wait("high", 1.0)
+    sched.record_wait("high", 3.0)
+    assert sched.stats() == {"high": {"count": 2, "avg_wait": 2.0, "max_wait": 3.0}}
+
+
+def test_unknown_lane():
+    with pytest.raises(ValueError):
+        LaneScheduler().push("urgent", 1)
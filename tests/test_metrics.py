@@ -0,0 +1,70 @@
+"""Tests for request metrics."""
+
+import requests
+
+from resend_cli.client import ResendClient
+from resend_cli.metrics import Metrics, endpoint
+from resend_cli.retry import RetryPolicy
+
+
+def test_endpoint_collapses_ids():
+    assert endpoint("/emails") == "/emails"
+    assert endpoint("/emails/batch") == "/emails/batch"
+    assert endpoint("/emails/4ef9a417") == "/emails/{id}"
+    assert endpoint("/audiences/aud1/contacts/c@d.com") == "/audiences/{id}/contacts/{id}"
+    assert endpoint("/domains/d1/verify?x=1") == "/domains/{id}/verify"
+
+
+def test_client_records_attempts_and_retries(mock_session, mock_response):
+    metrics = Metrics()
+    client = ResendClient("k", retry_policy=RetryPolicy(sleep=lambda s: None), metrics=metrics)
+    mock_session.request.side_effect = [mock_response(429, headers={"Retry-After": "2"}),
+                                        mock_response(200, {"id": "e1"})]
+    client.get_email("e1")
+    assert metrics.requests == {("/emails/{id}", "GET", "429"): 1, ("/emails/{id}", "GET", "200"): 1}
+    assert metrics.latency[("/emails/{id}", "GET")].count == 2
+    assert metrics.retries == {("/emails/{id}", "GET"): 1}
+    assert metrics.retry_sleep[("/emails/{id}", "GET")] >= 2.0  # Retry-After, plus jitter
+
+
+def test_client_records_connection_errors(mock_session):
+    metrics = Metrics()
+    client = ResendClient("k", retry_policy=RetryPolicy(max_attempts=1, sleep=lambda s: None), metrics=metrics)
+    mock_session.request.side_effect = requests.ConnectionError("down")
+    try:
+        client.list_domains()
+    except requests.ConnectionError:
+        pass
+    assert metrics.requests == {("/domains", "GET", "error"): 1}
+
+
+def test_summary_and_prometheus():
+    metrics = Metrics()
+    metrics.observe("/emails", "post", 200, 0.07)
+    metrics.observe("/emails", "post", 429, 0.02)
+    metrics.retry("/emails", "post", 1.5)
+    metrics.rate_limited(0.25)
+    summary = metrics.summary()
+    assert "/emails" in summary and "200: 1, 429: 1" in summary
+    assert "429 responses: 1, retries: 1 (slept 1.50s), rate limiter waits: 0.25s" in summary
+
+    text = metrics.prometheus()
+    assert 'resend_cli_requests_total{endpoint="/emails",method="POST",status="429"} 1' in text
+    assert 'resend_cli_request_duration_seconds_bucket{endpoint="/emails",method="POST",le="0.05"} 1' in text
+    assert 'resend_cli_request_duration_seconds_bucket{endpoint="/emails",method="POST",le="0.1"} 2' in text
+    assert 'resend_cli_request_duration_seconds_count{endpoint="/emails",method="POST"} 2' in text
+    assert "resend_cli_ratelimit_wait_seconds_total 0.25" in text
+    assert "# TYPE resend_cli_request_duration_seconds histogram" in text
+
+
+def test_write_textfile(tmp_path):
+    metrics = Metrics()
+    metrics.observe("/emails", "POST", 200, 0.1)
+    target = tmp_path / "textfile" / "resend.prom"
+    metrics.write_textfile(target)
+    assert target.read_text() == metrics.prometheus()
+    assert [p.name for p in target.parent.iterdir()] == ["resend.prom"]
+
+
+def test_empty_summary():
+    assert Metrics().summary() == "No API requests made."
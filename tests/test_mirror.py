@@ -0,0 +1,88 @@
+"""Tests for the local SQLite mirror."""
+
+import pytest
+
+from resend_cli.mirror import Mirror
+
+
+class FakeClient:
+    def __init__(self, audiences, contacts, fail_after=None):
+        self.audiences = audiences
+        self.contacts = contacts
+        self.fail_after = fail_after
+        self.afters = []
+
+    def iter_audiences(self):
+        return iter(self.audiences)
+
+    def iter_contacts(self, audience_id, limit=None, after=None):
+        self.afters.append(after)
+        items = self.contacts[audience_id]
+        start = next(i for i, c in enumerate(items) if c["id"] == after) + 1 if after else 0
+        for n, c in enumerate(items[start:]):
+            if self.fail_after is not None and n == self.fail_after:
+                raise ConnectionError("dropped")
+            yield c
+
+
+def _contacts(n, prefix="c"):
+    return [{"id": f"{prefix}{i}", "email": f"user{i}@x.com", "first_name": f"U{i}",
+             "unsubscribed": i % 2 == 0, "created_at": f"2026-01-{i % 28 + 1:02d}"} for i in range(n)]
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    m = Mirror(tmp_path / "mirror.sqlite3")
+    yield m
+    m.close()
+
+
+def test_sync_all(mirror):
+    client = FakeClient([{"id": "a1", "name": "News"}], {"a1": _contacts(250)})
+    stats = mirror.sync(client)
+    assert stats == {"audiences": 1, "contacts": 250, "removed": 0}
+    assert len(list(mirror.contacts("a1"))) == 250
+    assert mirror.synced_at("a1") is not None
+
+
+def test_find_by_email_case_insensitive(mirror):
+    mirror.sync(FakeClient([{"id": "a1"}], {"a1": _contacts(3)}))
+    found = mirror.find_contact("a1", "USER2@x.com")
+    assert found["id"] == "c2"
+    assert found["unsubscribed"] is True
+    assert mirror.find_contact("a1", "nobody@x.com") is None
+
+
+def test_resync_drops_deleted_contacts(mirror):
+    mirror.sync(FakeClient([{"id": "a1"}], {"a1": _contacts(5)}))
+    stats = mirror.sync(FakeClient([{"id": "a1"}], {"a1": _contacts(5)[:3]}))
+    assert stats["removed"] == 2
+    assert [c["id"] for c in mirror.contacts("a1")] == ["c0", "c1", "c2"]
+
+
+def test_removed_audience_dropped(mirror):
+    mirror.sync(FakeClient([{"id": "a1"}, {"id": "a2"}], {"a1": _contacts(2), "a2": _contacts(2, "d")}))
+    mirror.sync(FakeClient([{"id": "a1"}], {"a1": _contacts(2)}))
+    assert list(mirror.contacts("a2")) == []
+
+
+def test_interrupted_sync_resumes_from_cursor(mirror):
+    contacts = _contacts(250)
+    with pytest.raises(ConnectionError):
+        mirror.sync_audience(FakeClient([], {"a1": contacts}, fail_after=210), "a1")
+    assert mirror.synced_at("a1") is None
+    client = FakeClient([], {"a1": contacts})
+    seen, removed = mirror.sync_audience(client, "a1")
+    assert client.afters == ["c199"]
+    assert (seen, removed) == (50, 0)
+    assert len(list(mirror.contacts("a1"))) == 250
+
+
+def test_write_through(mirror):
+    mirror.sync(FakeClient([{"id": "a1"}], {"a1": _contacts(1)}))
+    mirror.add_contact("a1", {"id": "new", "email": "new@x.com"})
+    assert mirror.find_contact("a1", "new@x.com")["id"] == "new"
+    mirror.remove_contact("a1", "new@x.com")
+    assert mirror.find_contact("a1", "new@x.com") is None
+    mirror.add_contact("unsynced", {"id": "z", "email": "z@x.com"})
+    assert mirror.find_contact("unsynced", "z@x.com") is None
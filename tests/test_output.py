@@ -0,0 +1,75 @@
+"""Tests for machine-readable output modes."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from resend_cli.output import write
+
+
+def _records():
+    yield {"id": "c1", "email": "a@b.com", "tags": ["x", "y"]}
+    yield {"id": "c2", "email": "c@d.com", "extra": {"k": 1}}
+
+
+def test_json_stream_is_valid_array():
+    out = io.StringIO()
+    write(_records(), "json", out=out)
+    assert [r["id"] for r in json.loads(out.getvalue())] == ["c1", "c2"]
+
+
+def test_json_empty_stream():
+    out = io.StringIO()
+    write(iter([]), "json", out=out)
+    assert json.loads(out.getvalue()) == []
+
+
+def test_json_single_record():
+    out = io.StringIO()
+    write({"id": "e1"}, "json", out=out)
+    assert json.loads(out.getvalue()) == {"id": "e1"}
+
+
+def test_jsonl_keeps_full_records():
+    out = io.StringIO()
+    write(_records(), "jsonl", out=out)
+    lines = [json.loads(l) for l in out.getvalue().splitlines()]
+    assert lines[1]["extra"] == {"k": 1}
+
+
+def test_csv_uses_fields_and_flattens():
+    out = io.StringIO()
+    write(_records(), "csv", fields=("id", "tags"), out=out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert rows == [{"id": "c1", "tags": "x;y"}, {"id": "c2", "tags": ""}]
+
+
+def test_csv_empty_stream_writes_header():
+    out = io.StringIO()
+    write(iter([]), "csv", fields=("id", "email"), out=out)
+    assert out.getvalue().strip() == "id,email"
+
+
+def test_stream_consumed_lazily():
+    seen = []
+
+    def gen():
+        for i in range(3):
+            seen.append(i)
+            yield {"id": i}
+
+    class Probe(io.StringIO):
+        def write(self, s):
+            # By the time the first row is written, later rows are not fetched yet.
+            if '"id": 0' in s:
+                assert seen == [0]
+            return super().write(s)
+
+    write(gen(), "jsonl", out=Probe())
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        write(iter([{"id": 1}]), "xml")
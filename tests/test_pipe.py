@@ -0,0 +1,86 @@
+"""Tests for the JSONL operation pipe."""
+
+import io
+import json
+import threading
+
+from resend_cli.client import ResendError
+from resend_cli.pipe import parse_ops, run_ops
+
+
+class FakeClient:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def get_email(self, email_id):
+        if email_id == "missing":
+            raise ResendError(404, "Email not found")
+        return {"id": email_id, "last_event": "delivered"}
+
+    def create_contact(self, audience_id, email, **kwargs):
+        with self.lock:
+            self.calls.append((audience_id, email, kwargs))
+        return {"id": "c1"}
+
+    def iter_domains(self, limit=None):
+        yield from ({"id": f"d{i}"} for i in range(2))
+
+
+def results(out):
+    return {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+
+
+def test_parse_ops():
+    records = list(parse_ops(['{"id": "a", "op": "get_email"}', "", '{"op": "x"}', "not json", "[1]"]))
+    assert [r["id"] for r in records] == ["a", 3, 4, 5]
+    assert "error" in records[2] and "error" in records[3]
+
+
+def test_run_ops():
+    lines = [
+        '{"id": "s1", "op": "get_email", "args": ["e1"]}',
+        '{"id": "s2", "op": "get_email", "args": ["missing"]}',
+        '{"id": "c1", "op": "create_contact", "args": ["aud"], "kwargs": {"email": "a@b.com", "first_name": "A"}}',
+        '{"id": "d1", "op": "iter_domains"}',
+        '{"id": "x1", "op": "session"}',
+        "{broken",
+    ]
+    client = FakeClient()
+    out = io.StringIO()
+    assert run_ops(client, parse_ops(lines), out) == (3, 3)
+    got = results(out)
+    assert got["s1"]["result"]["last_event"] == "delivered"
+    assert got["s2"] == {"id": "s2", "ok": False, "error": "Email not found", "status_code": 404}
+    assert client.calls == [("aud", "a@b.com", {"first_name": "A"})]
+    assert got["d1"]["result"] == [{"id": "d0"}, {"id": "d1"}]
+    assert "unknown operation" in got["x1"]["error"]
+    assert got[6]["ok"] is False
+
+
+def test_results_stream_before_input_ends():
+    client = FakeClient()
+    out = io.StringIO()
+    answered = threading.Event()
+
+    def lines():
+        yield '{"id": 1, "op": "get_email", "args": ["e1"]}'
+        # A coprocess caller waits for the first answer before sending more.
+        assert answered.wait(2)
+        yield '{"id": 2, "op": "get_email", "args": ["e2"]}'
+
+    original = out.write
+
+    def write(text):
+        original(text)
+        answered.set()
+
+    out.write = write
+    assert run_ops(client, parse_ops(lines()), out) == (2, 0)
+
+
+def test_prepare_rewrites_records():
+    out = io.StringIO()
+    run_ops(FakeClient(), [{"id": 1, "op": "get_email", "args": ["placeholder"]}], out,
+            prepare=lambda r: {**r, "args": ["e9"]})
+    assert results(out)[1]["result"]["id"] == "e9"
@@ -0,0 +1,35 @@
+"""Tests for the profiling spans."""
+
+import json
+
+from resend_cli import profiling
+
+
+def test_span_is_a_no_op_when_off():
+    assert profiling.span("http") is profiling.span("encode")
+    with profiling.span("http"):
+        pass
+
+
+def test_spans_are_recorded_and_traced(tmp_path):
+    profiler = profiling.start(trace=True)
+    try:
+        with profiling.span("build"):
+            with profiling.span("encode"):
+                pass
+        with profiling.span("http"):
+            pass
+    finally:
+        profiling.stop()
+    assert profiler.totals["build"][0] == 1
+    assert profiler.totals["http"][0] == 1
+    assert profiler.totals["build"][1] >= profiler.totals["encode"][1]
+    summary = profiler.summary()
+    assert "build" in summary and "wall" in summary
+
+    trace = tmp_path / "trace.json"
+    profiler.write_trace(trace)
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert [e["name"] for e in events] == ["encode", "build", "http"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert profiling.span("build") is profiling._NULL
@@ -0,0 +1,66 @@
+"""Tests for the client-side token bucket."""
+
+import multiprocessing
+import time
+from unittest.mock import patch
+
+import pytest
+
+from resend_cli.ratelimit import TokenBucket, bucket_for_key
+
+
+def _drain(path, n, rate):
+    bucket = TokenBucket(rate, burst=1, state_path=path)
+    for _ in range(n):
+        bucket.acquire()
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_burst_is_free_then_waits():
+    bucket = TokenBucket(10, burst=3)
+    with patch("resend_cli.ratelimit.time.sleep") as sleep:
+        waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+    assert sleep.call_count == 2
+
+
+def test_shared_state_file(tmp_path):
+    path = tmp_path / "bucket.state"
+    a = TokenBucket(10, burst=2, state_path=path)
+    b = TokenBucket(10, burst=2, state_path=path)
+    with patch("resend_cli.ratelimit.time.sleep"):
+        assert a.acquire() == 0
+        assert b.acquire() == 0
+        assert a.acquire() > 0
+    assert path.stat().st_size == 16
+
+
+def test_shared_across_processes(tmp_path):
+    path = tmp_path / "bucket.state"
+    rate, per_proc = 50, 10
+    start = time.monotonic()
+    procs = [multiprocessing.Process(target=_drain, args=(path, per_proc, rate)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.monotonic() - start
+    # 30 tokens at 50/s with a burst of 1 cannot finish much faster than 0.58s.
+    assert elapsed >= 0.5
+
+
+def test_bucket_for_key_disabled():
+    assert bucket_for_key("re_x", 0) is None
+
+
+def test_bucket_for_key_path_per_key():
+    a = bucket_for_key("re_a", 2)
+    b = bucket_for_key("re_b", 2)
+    assert a.state_path != b.state_path
+    assert "re_a" not in str(a.state_path)
@@ -0,0 +1,101 @@
+"""Tests for audience reconciliation."""
+
+import io
+import json
+import threading
+
+import pytest
+
+from resend_cli.client import ResendError
+from resend_cli.reconcile import Reconciliation, apply
+
+REMOTE = [
+    {"id": "c1", "email": "keep@x.com", "first_name": "Keep", "unsubscribed": False},
+    {"id": "c2", "email": "Rename@x.com", "first_name": "Old", "unsubscribed": False},
+    {"id": "c3", "email": "gone@x.com", "first_name": None, "unsubscribed": False},
+    {"id": "c4", "email": "unsub@x.com", "first_name": None, "unsubscribed": True},
+]
+SOURCE = [
+    {"email": "keep@x.com", "first_name": "Keep"},
+    {"email": "rename@x.com", "first_name": "New"},
+    {"email": "unsub@x.com"},
+    {"email": "new@x.com", "last_name": "Person", "unsubscribed": "false"},
+    {"email": "NEW@x.com", "first_name": "Dup"},
+]
+
+
+class FakeClient:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def _call(self, *args, **kwargs):
+        with self.lock:
+            self.calls.append((*args, kwargs))
+        if self.fail_on in args:
+            raise ResendError(500, "boom")
+        return {"id": "created"}
+
+    def create_contact(self, audience_id, email, **kwargs):
+        return self._call("create", email, **kwargs)
+
+    def update_contact(self, audience_id, contact_id, **kwargs):
+        return self._call("update", contact_id, **kwargs)
+
+    def delete_contact(self, audience_id, contact_id):
+        return self._call("delete", contact_id)
+
+
+def test_summary():
+    plan = Reconciliation(lambda: SOURCE, REMOTE)
+    assert plan.summary() == {"add": 1, "update": 1, "remove": 1, "unchanged": 2}
+
+
+def test_blank_fields_are_left_alone():
+    plan = Reconciliation(lambda: [{"email": "unsub@x.com", "first_name": ""}], REMOTE[3:])
+    assert plan.summary()["unchanged"] == 1
+
+
+def test_actions():
+    plan = Reconciliation(lambda: SOURCE, REMOTE)
+    assert list(plan.actions()) == [
+        ("remove", "c3", {"id": "c3", "email": "gone@x.com"}),
+        ("update", "c2", {"email": "rename@x.com", "first_name": "New"}),
+        ("add", None, {"email": "new@x.com", "last_name": "Person", "unsubscribed": False}),
+    ]
+
+
+def test_apply():
+    client = FakeClient(fail_on="c3")
+    out = io.StringIO()
+    stats = apply(client, "aud", Reconciliation(lambda: SOURCE, REMOTE), out)
+    assert stats == {"add": 1, "update": 1, "remove": 0, "failed": 1}
+    assert ("update", "c2", {"first_name": "New"}) in client.calls
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert {"action": "remove", "email": "gone@x.com", "error": "boom", "status_code": 500} in results
+    assert {"action": "add", "email": "new@x.com", "id": "created"} in results
+
+
+def test_source_without_email_column_is_rejected():
+    with pytest.raises(ValueError, match="no 'email' column"):
+        Reconciliation(lambda: [{"Email": "keep@x.com"}], REMOTE)
+
+
+def test_source_without_emails_is_rejected():
+    with pytest.raises(ValueError, match="no emails"):
+        Reconciliation(lambda: [], REMOTE)
+    with pytest.raises(ValueError, match="no emails"):
+        Reconciliation(lambda: [{"email": ""}], REMOTE)
+
+
+def test_mass_remove_needs_permission():
+    remote = [{"id": f"c{i}", "email": f"u{i}@x.com"} for i in range(20)]
+    plan = Reconciliation(lambda: [{"email": "u0@x.com"}], remote)
+    assert plan.mass_remove
+    client = FakeClient()
+    with pytest.raises(ValueError, match="refusing to remove 19 of 20"):
+        apply(client, "aud", plan, io.StringIO())
+    assert client.calls == []
+    stats = apply(client, "aud", plan, io.StringIO(), allow_mass_remove=True)
+    assert stats["remove"] == 19
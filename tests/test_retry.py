@@ -0,0 +1,80 @@
+"""Tests for the retry policy."""
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from resend_cli.retry import RetryPolicy, parse_retry_after
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("1.5") == 1.5
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(when, usegmt=True)) == pytest.approx(30, abs=2)
+
+
+def test_parse_retry_after_garbage():
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_max_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(1, "GET", status=503)
+    assert policy.should_retry(2, "GET", status=503)
+    assert not policy.should_retry(3, "GET", status=503)
+
+
+def test_non_retryable_status():
+    assert not RetryPolicy().should_retry(1, "GET", status=422)
+
+
+def test_post_needs_idempotency_key():
+    policy = RetryPolicy()
+    assert not policy.should_retry(1, "POST", status=500)
+    assert not policy.should_retry(1, "POST")
+    assert policy.should_retry(1, "POST", {"Idempotency-Key": "k"}, status=500)
+    assert policy.should_retry(1, "POST", status=429)
+
+
+def test_budget_is_shared():
+    policy = RetryPolicy(budget=2)
+    assert policy.should_retry(1, "GET", status=503)
+    assert policy.should_retry(1, "GET", status=503)
+    assert not policy.should_retry(1, "GET", status=503)
+    assert policy.retries_used == 2
+
+
+def test_delay_is_capped_and_jittered():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+    delays = [policy.delay(10) for _ in range(200)]
+    assert all(0 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_after_takes_precedence():
+    policy = RetryPolicy(base_delay=0.5, max_delay=30)
+    assert 7 <= policy.delay(1, retry_after=7) <= 7.5
+    assert policy.delay(1, retry_after=120) == 30
+
+
+def test_wait_uses_injected_sleep():
+    slept = []
+    RetryPolicy(sleep=slept.append).wait(1, retry_after=2)
+    assert slept and slept[0] >= 2
+
+
+def test_budget_refills_after_window():
+    now = [0.0]
+    policy = RetryPolicy(budget=1, budget_window=60, clock=lambda: now[0])
+    assert policy.should_retry(1, "GET", status=503)
+    assert not policy.should_retry(1, "GET", status=503)
+    now[0] = 59
+    assert not policy.should_retry(1, "GET", status=503)
+    now[0] = 61
+    assert policy.should_retry(1, "GET", status=503)
@@ -0,0 +1,42 @@
+"""Tests for request body serialization."""
+
+import json
+import math
+
+import pytest
+
+from resend_cli import serialization
+from resend_cli.serialization import dumps
+
+PAYLOAD = {"from": "Zoë <z@example.com>", "to": ["a@b.com"], "subject": "Grüße", "html": "<p>€</p>",
+           "tags": [{"name": "n", "value": "1"}], "attachments": [{"filename": "a.txt", "content": "aGk="}]}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_dumps_is_compact_json(backend):
+    raw = dumps(PAYLOAD)
+    assert isinstance(raw, bytes)
+    assert json.loads(raw) == PAYLOAD
+    assert b", " not in raw and b": " not in raw
+
+
+def test_stdlib_fallback_rejects_nan(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    with pytest.raises(ValueError):
+        dumps({"x": math.nan})
+
+
+def test_client_sends_encoded_bytes(client, mock_session, mock_response):
+    mock_session.request.return_value = mock_response(200, {"id": "e1"})
+    client.send_email(PAYLOAD)
+    kwargs = mock_session.request.call_args[1]
+    assert "json" not in kwargs
+    assert json.loads(kwargs["data"]) == PAYLOAD
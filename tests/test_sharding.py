@@ -0,0 +1,108 @@
+"""Tests for sending through several accounts."""
+
+import io
+import json
+
+import pytest
+
+from resend_cli.bulk import send_batches
+from resend_cli.errors import ResendError
+from resend_cli.sharding import Shard, ShardedClient, sender_domain
+
+from .test_bulk import FakeBatchClient
+
+
+def mail(subject, sender="News <news@a.example>"):
+    return {"from": sender, "to": ["x@y.com"], "subject": subject}
+
+
+def test_sender_domain():
+    assert sender_domain({"from": "News <News@A.Example>"}) == "a.example"
+    assert sender_domain({"from": "ops@b.example"}) == "b.example"
+    assert sender_domain({}) == ""
+
+
+def test_round_robin_without_keys():
+    a, b = FakeBatchClient(), FakeBatchClient()
+    client = ShardedClient([Shard("a", a), Shard("b", b)], strategy="round-robin")
+    for i in range(4):
+        client.send_email(mail(str(i)))
+    assert len(a.calls) == len(b.calls) == 2
+    assert [s["sent"] for s in client.report()] == [2, 2]
+
+
+def test_keyed_sends_stick_to_one_shard():
+    shards = [Shard(name, FakeBatchClient()) for name in "abc"]
+    client = ShardedClient(shards, strategy="round-robin")
+    first = client.shard_for(mail("x"), "key-1")
+    assert all(client.shard_for(mail("x"), "key-1") is first for _ in range(5))
+    placed = {client.shard_for(mail("x"), f"key-{i}").name for i in range(50)}
+    assert placed == {"a", "b", "c"}
+
+
+def test_domain_routing_splits_batches():
+    a, b, anyone = FakeBatchClient(), FakeBatchClient(), FakeBatchClient()
+    client = ShardedClient([Shard("a", a, frozenset({"a.example"})), Shard("b", b, frozenset({"b.example"})),
+                            Shard("any", anyone)])
+    batch = [mail("1"), mail("2", "ops@b.example"), mail("3"), mail("4", "me@c.example")]
+    ids = client.send_batch(batch, idempotency_key="k")
+    assert [r["id"] for r in ids] == ["id-1", "id-2", "id-3", "id-4"]
+    assert [[p["subject"] for p in c] for c in a.calls] == [["1", "3"]]
+    assert [[p["subject"] for p in c] for c in b.calls] == [["2"]]
+    assert [[p["subject"] for p in c] for c in anyone.calls] == [["4"]]
+    assert a.keys == b.keys == anyone.keys == ["k"]
+
+
+def test_unowned_domain_is_rejected():
+    client = ShardedClient([Shard("a", FakeBatchClient(), frozenset({"a.example"}))])
+    with pytest.raises(ValueError, match="no shard sends from c.example"):
+        client.send_email(mail("1", "me@c.example"))
+
+
+def test_failures_are_counted_per_shard():
+    client = ShardedClient([Shard("a", FakeBatchClient(fail_on="bad"))])
+    with pytest.raises(ResendError):
+        client.send_batch([mail("ok"), mail("bad")], idempotency_key="k")
+    report = client.report()[0]
+    assert (report["sent"], report["failed"], report["requests"]) == (0, 2, 1)
+
+
+def test_failed_group_is_reported_per_row():
+    client = ShardedClient([Shard("a", FakeBatchClient(), frozenset({"a.example"})),
+                            Shard("b", FakeBatchClient(fail_on="2"), frozenset({"b.example"}))])
+    results = client.send_batch([mail("1"), mail("2", "ops@b.example"), mail("3")], idempotency_key="k")
+    assert results == [{"id": "id-1"}, {"error": "bad batch", "status_code": 422}, {"id": "id-3"}]
+    assert [(r["sent"], r["failed"]) for r in client.report()] == [(2, 0), (0, 1)]
+
+
+def test_short_reply_counts_only_returned_ids():
+    class Short(FakeBatchClient):
+        def send_batch(self, payloads, idempotency_key=None):
+            return super().send_batch(payloads, idempotency_key)[:1]
+
+    client = ShardedClient([Shard("a", Short())])
+    results = client.send_batch([mail("1"), mail("2")], idempotency_key="k")
+    assert results[0] == {"id": "id-1"} and "no id returned" in results[1]["error"]
+    assert (client.report()[0]["sent"], client.report()[0]["failed"]) == (1, 1)
+
+
+def test_send_batches_through_partly_failed_shards():
+    client = ShardedClient([Shard("a", FakeBatchClient(), frozenset({"a.example"})),
+                            Shard("b", FakeBatchClient(fail_on="2"), frozenset({"b.example"}))])
+    out = io.StringIO()
+    assert send_batches(client, [mail("1"), mail("2", "ops@b.example")], out) == (1, 1)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        {"row": 1, "id": "id-1"}, {"row": 2, "error": "bad batch", "status_code": 422}]
+
+
+def test_get_email_asks_each_shard():
+    class Missing(FakeBatchClient):
+        def get_email(self, email_id):
+            raise ResendError(404, "not found")
+
+    class Found(FakeBatchClient):
+        def get_email(self, email_id):
+            return {"id": email_id}
+
+    client = ShardedClient([Shard("a", Missing()), Shard("b", Found())])
+    assert client.get_email("e1") == {"id": "e1"}
@@ -0,0 +1,133 @@
+"""Tests for the send spool and its worker loop."""
+
+import io
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from resend_cli.client import ResendError
+from resend_cli.lanes import LaneScheduler
+from resend_cli.spool import Spool, drain
+
+
+class FakeClient:
+    def __init__(self, errors=None):
+        self.errors = list(errors or [])
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_email(self, payload, idempotency_key=None):
+        with self.lock:
+            if self.errors:
+                raise self.errors.pop(0)
+            self.sent.append((payload["subject"], idempotency_key))
+        return {"id": f"id-{payload['subject']}"}
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return Spool(tmp_path / "spool")
+
+
+def test_put_is_atomic_and_fifo(spool):
+    names = [spool.put({"subject": str(i)}) for i in range(3)]
+    assert os.listdir(spool.root / "tmp") == []
+    assert [p.name for p in spool.due()] == names
+    item = spool.load(spool.due()[0])
+    assert item["payload"] == {"subject": "0"} and item["idempotency_key"].startswith("resend-cli-")
+
+
+def test_claim_is_exclusive(spool):
+    spool.put({"subject": "a"})
+    path = spool.due()[0]
+    assert spool.claim(path) is not None
+    assert spool.claim(path) is None
+
+
+def test_drain_sends_and_removes(spool):
+    spool.put({"subject": "a"}, idempotency_key="k1")
+    spool.put({"subject": "b"})
+    client = FakeClient()
+    out = io.StringIO()
+    assert drain(spool, client, out) == {"sent": 2, "retried": 0, "dead": 0}
+    assert ("a", "k1") in client.sent
+    assert spool.counts() == {"new": 0, "cur": 0, "dead": 0}
+    assert len(out.getvalue().splitlines()) == 2
+
+
+def test_retryable_failure_requeued_with_same_key(spool):
+    spool.put({"subject": "a"}, idempotency_key="k1")
+    client = FakeClient(errors=[ResendError(503, "unavailable")])
+    assert drain(spool, client, io.StringIO(), retry_delay=0.01)["retried"] == 1
+    assert spool.due() == []  # not due yet
+    time.sleep(0.02)
+    assert drain(spool, client, io.StringIO())["sent"] == 1
+    assert client.sent == [("a", "k1")]
+
+
+def test_permanent_failure_goes_to_dead(spool):
+    spool.put({"subject": "a"})
+    out = io.StringIO()
+    assert drain(spool, FakeClient(errors=[ResendError(422, "bad from")]), out)["dead"] == 1
+    dead = list((spool.root / "dead").iterdir())
+    assert json.loads(dead[0].read_text())["error"] == "bad from"
+    assert json.loads(out.getvalue())["dead"] is True
+
+
+def test_out_of_attempts_goes_to_dead(spool):
+    spool.put({"subject": "a"})
+    client = FakeClient(errors=[ResendError(500, "boom")] * 2)
+    drain(spool, client, io.StringIO(), max_attempts=2, retry_delay=0)
+    drain(spool, client, io.StringIO(), max_attempts=2, retry_delay=0)
+    assert spool.counts()["dead"] == 1
+
+
+def test_recover_stale_claims(spool):
+    spool.put({"subject": "a"})
+    claimed = spool.claim(spool.due()[0])
+    os.utime(claimed, (time.time() - 1000, time.time() - 1000))
+    assert spool.recover(stale_after=600) == 1
+    assert len(spool.due()) == 1
+
+
+def test_drain_serves_high_lane_first(spool):
+    for i in range(5):
+        spool.put({"subject": f"bulk{i}"}, lane="bulk")
+    spool.put({"subject": "reset"}, lane="high")
+    client = FakeClient()
+    sched = LaneScheduler()
+    out = io.StringIO()
+    drain(spool, client, out, workers=1, scheduler=sched)
+    assert client.sent[0][0] == "reset"
+    assert json.loads(out.getvalue().splitlines()[0])["lane"] == "high"
+    assert sched.stats()["bulk"]["count"] == 5
+
+
+def test_retry_keeps_lane(spool):
+    spool.put({"subject": "a"}, lane="high")
+    drain(spool, FakeClient(errors=[ResendError(503, "x")]), io.StringIO(), retry_delay=0)
+    assert spool.lane_of(spool.due()[0].name) == "high"
+
+
+def test_due_ignores_stray_files(spool):
+    (spool.root / "new" / ".DS_Store").write_text("")
+    (spool.root / "new" / "notes.txt").write_text("")
+    name = spool.put({"subject": "a"})
+    assert [p.name for p in spool.due()] == [name]
+    assert drain(spool, FakeClient(), io.StringIO())["sent"] == 1
+
+
+def test_unreadable_item_goes_to_dead(spool):
+    spool.put({"subject": "a"})
+    broken = spool.due()[0]
+    broken.write_text("{not json")
+    spool.put({"subject": "b"})
+    out = io.StringIO()
+    client = FakeClient()
+    assert drain(spool, client, out) == {"sent": 1, "retried": 0, "dead": 1}
+    assert [s for s, _ in client.sent] == ["b"]
+    assert (spool.root / "dead" / broken.name).read_text() == "{not json"
+    assert "unreadable item" in json.loads(out.getvalue().splitlines()[0])["error"]
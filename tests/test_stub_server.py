@@ -0,0 +1,124 @@
+"""Tests for the local Resend API stand-in, driven through the real HTTP client."""
+
+import random
+
+import pytest
+import requests
+
+from resend_cli.client import ResendClient, ResendError
+from resend_cli.retry import RetryPolicy
+from resend_cli.stub_server import Latency, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(seed=1) as server:
+        yield server
+
+
+def make_client(stub, **policy):
+    return ResendClient("re_test", base_url=stub.url, retry_policy=RetryPolicy(sleep=lambda s: None, **policy))
+
+
+def test_send_and_get(stub):
+    client = make_client(stub)
+    sent = client.send_email({"from": "a@example.com", "to": ["b@example.com"], "subject": "Hi", "text": "x"})
+    assert client.get_email(sent["id"])["last_event"] == "delivered"
+    batch = client.send_batch([{"from": "a@example.com", "to": "c@example.com", "subject": "Hi"}] * 3)
+    assert len(batch) == 3 and len(stub.emails) == 4
+
+
+def test_validation_and_not_found(stub):
+    client = make_client(stub)
+    with pytest.raises(ResendError) as exc:
+        client.send_email({"to": ["b@example.com"], "subject": "Hi"})
+    assert exc.value.status_code == 422
+    with pytest.raises(ResendError) as exc:
+        client.get_email("missing")
+    assert exc.value.status_code == 404
+
+
+def test_malformed_body_gets_error_reply(stub):
+    session = requests.Session()
+    headers = {"Authorization": "Bearer re_test"}
+    email = {"from": "a@example.com", "to": ["b@example.com"], "subject": "Hi", "attachments": ["x"]}
+    reply = session.post(f"{stub.url}/emails", json=email, headers=headers)
+    assert reply.status_code == 400 and reply.json()["name"] == "validation_error"
+    # The connection is still usable afterwards.
+    assert session.get(f"{stub.url}/domains", headers=headers).status_code == 200
+
+
+def test_idempotency_key_replays(stub):
+    client = make_client(stub)
+    payload = {"from": "a@example.com", "to": ["b@example.com"], "subject": "Hi"}
+    first = client.send_email(payload, idempotency_key="k1")
+    assert client.send_email(payload, idempotency_key="k1") == first
+    assert len(stub.emails) == 1
+
+
+def test_pagination_and_contacts(stub):
+    stub.seed(audiences=1, contacts=250)
+    client = make_client(stub)
+    audience = client.list_audiences()[0]["id"]
+    assert len(list(client.iter_contacts(audience))) == 250
+    assert stub.stats["statuses"][200] == 1 + 3
+    client.update_contact(audience, "user7@example.com", unsubscribed=True)
+    assert client.get_contact(audience, "USER7@example.com")["unsubscribed"] is True
+    client.delete_contact(audience, "user7@example.com")
+    assert len(client.list_contacts(audience)) == 249
+
+
+def test_pagination_skips_deleted_contacts(stub):
+    stub.seed(audiences=1, contacts=300)
+    client = make_client(stub)
+    audience = client.list_audiences()[0]["id"]
+    for i in range(0, 300, 2):
+        client.delete_contact(audience, f"user{i}@example.com")
+    emails = [c["email"] for c in client.iter_contacts(audience)]
+    assert emails == [f"user{i}@example.com" for i in range(1, 300, 2)]
+    client.create_contact(audience, "user0@example.com")
+    assert client.get_contact(audience, "user0@example.com")["email"] == "user0@example.com"
+
+
+def test_scripted_429_is_retried(stub):
+    stub.fail_next(1, status=429, retry_after=0)
+    client = make_client(stub)
+    client.list_domains()
+    assert stub.stats["statuses"] == {429: 1, 200: 1}
+
+
+def test_rate_limit_returns_retry_after():
+    with StubServer(rate_limit=2, burst=1) as stub:
+        headers = {"Authorization": "Bearer re_test"}
+        assert requests.get(f"{stub.url}/domains", headers=headers).status_code == 200
+        resp = requests.get(f"{stub.url}/domains", headers=headers)
+        assert resp.status_code == 429
+        assert 0 < float(resp.headers["Retry-After"]) <= 0.5
+        other = requests.get(f"{stub.url}/domains", headers={"Authorization": "Bearer re_other"})
+        assert other.status_code == 200
+
+
+def test_error_injection():
+    with StubServer(error_rate=1.0) as stub:
+        with pytest.raises(ResendError) as exc:
+            make_client(stub, max_attempts=2).list_domains()
+        assert exc.value.status_code in (500, 502, 503)
+        assert sum(stub.stats["statuses"].values()) == 2
+
+
+def test_api_key_check():
+    with StubServer(api_key="re_right") as stub:
+        with pytest.raises(ResendError) as exc:
+            make_client(stub).list_domains()
+        assert exc.value.status_code == 401
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+    assert Latency("0.25").sample(rng) == 0.25
+    assert 0.1 <= Latency("uniform:0.1,0.2").sample(rng) <= 0.2
+    assert Latency("normal:0,0.001").sample(rng) >= 0
+    assert Latency("lognormal:0.05,0.5").sample(rng) > 0
+    for bad in ("gamma:1,2", "uniform:1", "fixed:x"):
+        with pytest.raises(ValueError):
+            Latency(bad)
@@ -0,0 +1,64 @@
+"""Tests for concurrent status polling."""
+
+import threading
+
+from resend_cli.client import ResendError
+from resend_cli.watch import Watcher
+
+
+class FakeClient:
+    """Returns each id's events in order, repeating the last one."""
+
+    def __init__(self, timelines):
+        self.timelines = timelines
+        self.polls = {email_id: 0 for email_id in timelines}
+        self.lock = threading.Lock()
+
+    def get_email(self, email_id):
+        if email_id not in self.timelines:
+            raise ResendError(404, "Email not found")
+        with self.lock:
+            n = self.polls[email_id]
+            self.polls[email_id] += 1
+        events = self.timelines[email_id]
+        event = events[min(n, len(events) - 1)]
+        if isinstance(event, Exception):
+            raise event
+        return {"id": email_id, "last_event": event}
+
+
+def test_streams_changes_until_terminal():
+    client = FakeClient({"e1": ["queued", "sent", "sent", "delivered"], "e2": ["bounced"]})
+    watcher = Watcher(client, ["e1", "e2", "e1"], interval=0.001, max_interval=0.004)
+    changes = [(c["id"], c["last_event"]) for c in watcher.run(timeout=5)]
+    assert [e for i, e in changes if i == "e1"] == ["queued", "sent", "delivered"]
+    assert ("e2", "bounced") in changes
+    assert client.polls == {"e1": 4, "e2": 1}
+    assert watcher.unfinished == []
+
+
+def test_unknown_id_reported_once():
+    client = FakeClient({})
+    changes = list(Watcher(client, ["nope"], interval=0.001).run(timeout=5))
+    assert changes == [{"id": "nope", "error": "Email not found", "status_code": 404}]
+
+
+def test_transient_error_retried():
+    client = FakeClient({"e1": [ResendError(503, "unavailable"), "delivered"]})
+    changes = list(Watcher(client, ["e1"], interval=0.001).run(timeout=5))
+    assert changes == [{"id": "e1", "last_event": "delivered"}]
+
+
+def test_settled_id_backs_off():
+    client = FakeClient({"e1": ["sent"]})
+    watcher = Watcher(client, ["e1"], interval=0.01, max_interval=1.0)
+    list(watcher.run(timeout=0.2))
+    # 0.01 + 0.02 + 0.04 + 0.08 > 0.1: without backoff there would be ~20 polls.
+    assert client.polls["e1"] <= 6
+    assert watcher.unfinished == ["e1"]
+
+
+def test_budget_caps_request_rate():
+    client = FakeClient({f"e{i}": ["sent"] for i in range(50)})
+    list(Watcher(client, list(client.timelines), budget=20, interval=0.001).run(timeout=0.5))
+    assert sum(client.polls.values()) <= 20 + 0.5 * 20 + 4